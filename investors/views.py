@@ -20,6 +20,7 @@ from .models import (
     InversorTemporal,
     FavoriteInvestorsTemporal
     )
+from startups.access import StartupAccessMixin
 from startups.models import Startup, StartupCategory, StartupBusinessTraction, StartupLocation
 from users.permissions import IsRegistered
 
@@ -38,14 +39,14 @@ from .filters import InversorTemporalFilter
 
 logger = logging.getLogger(__name__)
 
-class InvestmentRoundView(generics.GenericAPIView):
+class InvestmentRoundView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = CreateInvestmentRoundSerializer
     permission_classes = [IsRegistered]
 
     def get(self, request, startupId):
         try:
             user = self.request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             investors = InvestmentRound.objects.filter(startup=startup, is_active=True)
@@ -60,7 +61,7 @@ class InvestmentRoundView(generics.GenericAPIView):
     def post(self, request, startupId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.get_serializer(data=request.data)
@@ -123,7 +124,7 @@ class InvestmentRoundView(generics.GenericAPIView):
     def put(self, request, startupId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.get_serializer(data=request.data)
@@ -218,7 +219,7 @@ class InvestmentRoundConfirmView(generics.GenericAPIView):
             
         
     
-class InvestmentChangeAmountView(generics.GenericAPIView):
+class InvestmentChangeAmountView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = InvestmentRoundChangeAmountSerializer
     permission_classes = [IsRegistered]
 
@@ -226,7 +227,7 @@ class InvestmentChangeAmountView(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 serializer = self.get_serializer(data=request.data)
@@ -249,7 +250,7 @@ class InvestmentChangeAmountView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)  
 
-class InvestmentChangeRaisedAmountView(generics.GenericAPIView):
+class InvestmentChangeRaisedAmountView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = InvestmentRoundChangeRaisedAmountSerializer
     permission_classes = [IsRegistered]
 
@@ -257,7 +258,7 @@ class InvestmentChangeRaisedAmountView(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 serializer = self.get_serializer(data=request.data)
@@ -280,14 +281,14 @@ class InvestmentChangeRaisedAmountView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)  
 
-class DeleteInvestmentRound(generics.GenericAPIView):
+class DeleteInvestmentRound(StartupAccessMixin, generics.GenericAPIView):
     serializer_class= None
     permission_classes = [IsRegistered]
 
     def delete(self, request, startupId, roundId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             round = InvestmentRound.objects.get(
@@ -306,14 +307,14 @@ class DeleteInvestmentRound(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class EditInvestorinParticularRound(generics.GenericAPIView):
+class EditInvestorinParticularRound(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = CreateInvestorUserSerializer
     permission_classes = [IsRegistered]
 
     def put(self, request, startupId, investmentId, investorId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             round = InvestmentRound.objects.get(
@@ -347,14 +348,14 @@ class EditInvestorinParticularRound(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class AddInvestorinParticularRound(generics.GenericAPIView):
+class AddInvestorinParticularRound(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = CreateInvestorUserSerializer
     permission_classes = [IsRegistered]
 
     def post(self, request, startupId, investmentId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             round = InvestmentRound.objects.get(
@@ -408,14 +409,14 @@ class AddInvestorinParticularRound(generics.GenericAPIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 
-class DeleteInvestorinParticularRound(generics.GenericAPIView):
+class DeleteInvestorinParticularRound(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = None
     permission_classes = [IsRegistered]
 
     def delete(self, request, startupId, investmentId, investorId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             round = InvestmentRound.objects.get(
@@ -441,7 +442,7 @@ class DeleteInvestorinParticularRound(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class EditParticularInvestmentRound(generics.GenericAPIView):
+class EditParticularInvestmentRound(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditInvestorinParticularRoundSerializer
     permission_classes = [IsRegistered]
 
@@ -449,7 +450,7 @@ class EditParticularInvestmentRound(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 serializer = self.get_serializer(data=request.data)
@@ -518,14 +519,14 @@ class InversorTemporalListView(generics.ListAPIView):
         context['favorite_investor_ids'] = favorite_investor_ids
         return context
     
-class FavoriteInvestorsListViews(generics.GenericAPIView):
+class FavoriteInvestorsListViews(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
 
     def get(self, request, startupId):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 favorites = FavoriteInvestorsTemporal.objects.filter(startup=startup)
@@ -537,14 +538,14 @@ class FavoriteInvestorsListViews(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-class  FavoriteInvestorsViews(generics.GenericAPIView):
+class  FavoriteInvestorsViews(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
     
     def post(self, request, startupId, investorId):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 
@@ -566,7 +567,7 @@ class  FavoriteInvestorsViews(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 
@@ -584,14 +585,14 @@ class  FavoriteInvestorsViews(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class GetEmailInvestorViews(generics.GenericAPIView):
+class GetEmailInvestorViews(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
 
     def get(self, request, startupId, investorId):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 
@@ -606,7 +607,7 @@ class GetEmailInvestorViews(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-class InvestmentBanksView(generics.GenericAPIView):
+class InvestmentBanksView(StartupAccessMixin, generics.GenericAPIView):
     
     permission_classes = [IsRegistered]
 
@@ -615,7 +616,7 @@ class InvestmentBanksView(generics.GenericAPIView):
             date_180_days_ago = timezone.now().date() - timedelta(days=180)
             date_365_days_ago = timezone.now().date() - timedelta(days=365)
             user = self.request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import OutboundEmail, OutboundSMS
+
+
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'subject', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ['to_email', 'subject']
+
+
+class OutboundSMSAdmin(admin.ModelAdmin):
+    list_display = ('to_number', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ['to_number']
+
+
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
+admin.site.register(OutboundSMS, OutboundSMSAdmin)
@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from sendgrid import SendGridAPIClient
+from sendgrid.helpers.mail import Mail, Email, To
+from twilio.rest import Client
+
+
+class SendGridEmailBackend:
+    """Delivers outbox emails through SendGrid, reusing a single client."""
+
+    def __init__(self):
+        self.client = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
+
+    def send(self, email):
+        mail = Mail(
+            from_email=Email(settings.SENDGRID_EMAIL),
+            to_emails=To(email.to_email),
+            subject=email.subject
+        )
+        if email.template_id and email.template_vars:
+            mail.template_id = email.template_id
+            mail.dynamic_template_data = email.template_vars
+        else:
+            mail.plain_text_content = email.content
+        response = self.client.send(mail)
+        if response.status_code >= 400:
+            raise Exception(f"SendGrid responded {response.status_code}: {response.body}")
+
+
+class SMTPEmailBackend:
+    """
+    Delivers outbox emails through Django's EMAIL_BACKEND, which is the
+    in-memory backend under tests. Template emails are sent with their
+    variables as the body.
+    """
+
+    def send(self, email):
+        body = email.content
+        if email.template_id and email.template_vars:
+            body = json.dumps({"templateId": email.template_id, "templateVars": email.template_vars})
+        EmailMessage(
+            subject=email.subject,
+            body=body or "",
+            from_email=settings.SENDGRID_EMAIL,
+            to=[email.to_email]
+        ).send()
+
+
+class FileEmailBackend:
+    """Appends outbox emails as JSON lines to a file, for local development."""
+
+    def __init__(self):
+        self.path = Path(settings.EMAIL_OUTBOX_FILE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def send(self, email):
+        record = {
+            "id": email.id,
+            "to": email.to_email,
+            "subject": email.subject,
+            "content": email.content,
+            "templateId": email.template_id,
+            "templateVars": email.template_vars,
+            "sentAt": timezone.now().isoformat(),
+        }
+        with self.path.open("a") as outbox_file:
+            outbox_file.write(json.dumps(record) + "\n")
+
+
+class TwilioSMSBackend:
+    """
+    Delivers outbox SMS through Twilio. The client, and the HTTP connection
+    pool behind it, is shared by every message the worker sends.
+    """
+
+    def __init__(self):
+        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+
+    def send(self, sms):
+        self.client.messages.create(
+            body=sms.body,
+            from_=settings.TWILIO_PHONE_NUMBER,
+            to=str(sms.to_number)
+        )
+
+
+sent_sms = []
+
+
+class LocmemSMSBackend:
+    """Keeps outbox SMS in notifications.backends.sent_sms, for tests."""
+
+    def send(self, sms):
+        sent_sms.append({"to": str(sms.to_number), "body": sms.body})
+
+
+class FileSMSBackend:
+    """Appends outbox SMS as JSON lines to a file, for local development."""
+
+    def __init__(self):
+        self.path = Path(settings.SMS_OUTBOX_FILE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def send(self, sms):
+        record = {
+            "id": sms.id,
+            "to": str(sms.to_number),
+            "body": sms.body,
+            "sentAt": timezone.now().isoformat(),
+        }
+        with self.path.open("a") as outbox_file:
+            outbox_file.write(json.dumps(record) + "\n")
+
+
+def get_email_backend():
+    return import_string(settings.EMAIL_OUTBOX_BACKEND)()
+
+
+def get_sms_backend():
+    return import_string(settings.SMS_OUTBOX_BACKEND)()
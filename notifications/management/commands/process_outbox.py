@@ -0,0 +1,20 @@
+from notifications.backends import get_email_backend, get_sms_backend
+from notifications.outbox import process_email_outbox, process_sms_outbox
+from pjbackend.workers import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Send the pending emails and SMS of the outbox'
+    interval = 2
+    loop_help = 'Keep polling the outbox'
+
+    def handle(self, *args, **options):
+        self.email_backend = get_email_backend()
+        self.sms_backend = get_sms_backend()
+        super().handle(*args, **options)
+
+    def process_batch(self, batch_size):
+        sent_sms = process_sms_outbox(batch_size=batch_size, backend=self.sms_backend)
+        sent_emails = process_email_outbox(batch_size=batch_size, backend=self.email_backend)
+        if sent_sms or sent_emails:
+            return f'{sent_sms} SMS and {sent_emails} emails sent'
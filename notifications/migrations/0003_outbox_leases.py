@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+def drop_replaced_sms(apps, schema_editor):
+    """Keeps only the latest pending SMS of each number, as enqueue_sms would have."""
+    OutboundSMS = apps.get_model('notifications', 'OutboundSMS')
+    latest = {}
+    for sms in OutboundSMS.objects.filter(status='pending').order_by('id'):
+        if sms.to_number in latest:
+            OutboundSMS.objects.filter(id=latest[sms.to_number]).update(status='failed', last_error='Replaced by a newer message')
+        latest[sms.to_number] = sms.id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_outboundsms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboundemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'pending'), ('sending', 'sending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='outboundsms',
+            name='status',
+            field=models.CharField(choices=[('pending', 'pending'), ('sending', 'sending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=20),
+        ),
+        migrations.RunPython(drop_replaced_sms, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='outboundsms',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('to_number',), name='notifications_one_pending_sms_per_number'),
+        ),
+    ]
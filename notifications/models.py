@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from phonenumber_field.modelfields import PhoneNumberField
+
+from pjbackend.workers import retry_at
+
+
+class OutboxMessage(models.Model):
+    """
+    Message waiting to be delivered by the outbox worker. Rows are written
+    in the same transaction as the change that triggers them.
+    """
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'pending'),
+        (SENDING, 'sending'),
+        (SENT, 'sent'),
+        (FAILED, 'failed'),
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+    def mark_sent(self):
+        self.status = self.SENT
+        self.sent_at = timezone.now()
+        self.attempts += 1
+        self.last_error = None
+        self.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+
+    def mark_failed(self, error):
+        """Schedules a retry with exponential backoff, or gives up."""
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            self.status = self.PENDING
+            self.next_attempt_at = retry_at(self.attempts, settings.OUTBOX_RETRY_DELAY)
+        self.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
+
+
+class OutboundEmail(OutboxMessage):
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    content = models.TextField(blank=True, null=True)
+    template_id = models.CharField(max_length=100, blank=True, null=True)
+    template_vars = models.JSONField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+
+class OutboundSMS(OutboxMessage):
+    to_number = PhoneNumberField()
+    body = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+            models.Index(fields=['to_number', 'status']),
+        ]
+        constraints = [
+            # enqueue_sms replaces the pending message of a number without locking it
+            models.UniqueConstraint(
+                fields=['to_number'],
+                condition=models.Q(status='pending'),
+                name='notifications_one_pending_sms_per_number'
+            ),
+        ]
+
+    def __str__(self):
+        return f"SMS -> {self.to_number} ({self.status})"
@@ -0,0 +1,89 @@
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from pjbackend.workers import lease_due
+from .backends import get_email_backend, get_sms_backend
+from .models import OutboundEmail, OutboundSMS
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, to_email, content=None, template_id=None, template_vars=None):
+    """Adds an email to the outbox; it is sent by the worker once committed."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        to_email=to_email,
+        content=content,
+        template_id=template_id,
+        template_vars=template_vars
+    )
+
+
+def enqueue_sms(to_number, body):
+    """
+    Adds an SMS to the outbox. A message still pending for the same number
+    is replaced instead, so rapid resends deliver only the latest code.
+    No lock is taken: at most one message per number can be pending, and
+    one the worker already claimed is left to be sent.
+    """
+    while True:
+        pending = OutboundSMS.objects.filter(to_number=to_number, status=OutboundSMS.PENDING)
+        if pending.update(body=body, next_attempt_at=timezone.now()):
+            return pending.first()
+        try:
+            with transaction.atomic():
+                return OutboundSMS.objects.create(to_number=to_number, body=body)
+        except IntegrityError:
+            # Another request queued one for the number meanwhile
+            continue
+
+
+def _claim(model, batch_size):
+    """
+    Leases a batch of due messages to this worker. A message whose lease
+    ran out, because its worker died, is due again.
+    """
+    return lease_due(
+        model.objects.filter(status__in=(model.PENDING, model.SENDING)).order_by('next_attempt_at', 'id'),
+        'next_attempt_at',
+        batch_size or settings.OUTBOX_BATCH_SIZE,
+        settings.OUTBOX_LEASE_TIMEOUT,
+        status=model.SENDING
+    )
+
+
+def _process_outbox(model, backend, batch_size):
+    sent = 0
+    for message in _claim(model, batch_size):
+        try:
+            backend.send(message)
+        except Exception as e:
+            logger.error('Error sending %s %s: %s', model.__name__, message.id, e)
+            try:
+                with transaction.atomic():
+                    message.mark_failed(e)
+            except IntegrityError:
+                # A newer message to the same recipient is pending and replaces this one
+                model.objects.filter(id=message.id).update(status=model.FAILED, last_error=str(e))
+            continue
+        message.mark_sent()
+        sent += 1
+    return sent
+
+
+def process_email_outbox(batch_size=None, backend=None):
+    """
+    Sends one batch of due emails and returns how many were sent.
+    Rows are leased with SKIP LOCKED so several workers can run at once,
+    and sent outside the transaction that claimed them; failures are
+    retried with exponential backoff.
+    """
+    return _process_outbox(OutboundEmail, backend or get_email_backend(), batch_size)
+
+
+def process_sms_outbox(batch_size=None, backend=None):
+    """Sends one batch of due SMS and returns how many were sent."""
+    return _process_outbox(OutboundSMS, backend or get_sms_backend(), batch_size)
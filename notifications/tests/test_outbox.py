@@ -0,0 +1,100 @@
+import json
+import pytest
+
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from pjbackend import utils
+from notifications.backends import FileEmailBackend
+from notifications.models import OutboundEmail
+from notifications.outbox import process_email_outbox
+
+
+class FlakyBackend:
+    def __init__(self, failures):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, email):
+        if self.failures:
+            self.failures -= 1
+            raise Exception("SendGrid unavailable")
+        self.sent.append(email.to_email)
+
+
+@pytest.mark.django_db
+def test_send_email_is_queued():
+    utils.send_welcome_email("founder@example.com", "Founder")
+
+    email = OutboundEmail.objects.get()
+    assert email.status == OutboundEmail.PENDING
+    assert email.to_email == "founder@example.com"
+    assert email.template_vars == {"firstName": "Founder"}
+
+
+@pytest.mark.django_db
+def test_process_outbox_sends_pending_emails(settings):
+    settings.EMAIL_OUTBOX_BACKEND = "notifications.backends.SMTPEmailBackend"
+    utils.send_email(subject="startup created", to_email="founder@example.com", content="startup created")
+    utils.send_welcome_email("founder@example.com", "Founder")
+
+    assert process_email_outbox() == 2
+
+    assert OutboundEmail.objects.filter(status=OutboundEmail.SENT).count() == 2
+    assert [message.subject for message in mail.outbox] == ["startup created", "Welcome to PomJuice"]
+    assert json.loads(mail.outbox[1].body)["templateVars"] == {"firstName": "Founder"}
+    assert process_email_outbox() == 0
+
+
+@pytest.mark.django_db
+def test_process_outbox_in_batches():
+    for i in range(5):
+        utils.send_email(subject="hello", to_email=f"user{i}@example.com", content="hello")
+    backend = FlakyBackend(failures=0)
+
+    assert process_email_outbox(batch_size=2, backend=backend) == 2
+    assert backend.sent == ["user0@example.com", "user1@example.com"]
+
+
+@pytest.mark.django_db
+def test_failed_email_retried_with_backoff(settings):
+    settings.OUTBOX_MAX_ATTEMPTS = 2
+    utils.send_email(subject="hello", to_email="user@example.com", content="hello")
+    backend = FlakyBackend(failures=2)
+
+    assert process_email_outbox(backend=backend) == 0
+    email = OutboundEmail.objects.get()
+    assert email.status == OutboundEmail.PENDING
+    assert email.attempts == 1
+    assert email.next_attempt_at > timezone.now()
+    assert process_email_outbox(backend=backend) == 0
+
+    OutboundEmail.objects.update(next_attempt_at=timezone.now())
+    assert process_email_outbox(backend=backend) == 0
+    email.refresh_from_db()
+    assert email.status == OutboundEmail.FAILED
+    assert email.last_error == "SendGrid unavailable"
+
+
+@pytest.mark.django_db
+def test_file_backend_writes_json_lines(settings, tmp_path):
+    settings.EMAIL_OUTBOX_FILE_PATH = str(tmp_path / "outbox" / "emails.jsonl")
+    utils.send_email(subject="hello", to_email="user@example.com", content="hello")
+
+    assert process_email_outbox(backend=FileEmailBackend()) == 1
+
+    lines = (tmp_path / "outbox" / "emails.jsonl").read_text().splitlines()
+    assert json.loads(lines[0])["to"] == "user@example.com"
+
+
+@pytest.mark.django_db
+def test_process_outbox_command_sends_one_batch(settings, tmp_path, capsys):
+    settings.EMAIL_OUTBOX_BACKEND = "notifications.backends.FileEmailBackend"
+    settings.EMAIL_OUTBOX_FILE_PATH = str(tmp_path / "emails.jsonl")
+    utils.send_welcome_email("founder@example.com", "Founder")
+
+    call_command("process_outbox")
+
+    assert "0 SMS and 1 emails sent" in capsys.readouterr().out
+    assert OutboundEmail.objects.get().status == OutboundEmail.SENT
@@ -0,0 +1,109 @@
+import pytest
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.urls import reverse
+from django.utils import timezone
+
+from pjbackend import utils
+from notifications import backends
+from notifications.backends import LocmemSMSBackend
+from notifications.models import OutboundSMS
+from notifications.outbox import process_sms_outbox
+
+PHONE_NUMBER = "+543416207112"
+
+
+@pytest.fixture(autouse=True)
+def clear_sent_sms():
+    backends.sent_sms.clear()
+    yield
+    backends.sent_sms.clear()
+
+
+@pytest.mark.django_db
+def test_send_sms_is_queued():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 123456")
+
+    sms = OutboundSMS.objects.get()
+    assert sms.status == OutboundSMS.PENDING
+    assert str(sms.to_number) == PHONE_NUMBER
+
+
+@pytest.mark.django_db
+def test_rapid_resends_are_deduplicated():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 111111")
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 222222")
+    utils.send_sms("+543416207113", "Your PomJuice verification code is 333333")
+
+    assert process_sms_outbox(backend=LocmemSMSBackend()) == 2
+    assert backends.sent_sms == [
+        {"to": PHONE_NUMBER, "body": "Your PomJuice verification code is 222222"},
+        {"to": "+543416207113", "body": "Your PomJuice verification code is 333333"},
+    ]
+
+
+@pytest.mark.django_db
+def test_sms_after_delivery_is_sent_again():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 111111")
+    process_sms_outbox(backend=LocmemSMSBackend())
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 222222")
+
+    assert process_sms_outbox(backend=LocmemSMSBackend()) == 1
+    assert OutboundSMS.objects.filter(status=OutboundSMS.SENT).count() == 2
+
+
+@pytest.mark.django_db
+def test_signup_does_not_call_twilio(mocker):
+    twilio_client = mocker.patch("notifications.backends.Client")
+    payload = {
+        "email": "newfounder@example.com",
+        "password": "password123",
+        "phoneNumber": PHONE_NUMBER,
+        "isTermsAcepted": True,
+    }
+
+    response = APIClient().post(reverse("signup"), payload)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not twilio_client.called
+    assert OutboundSMS.objects.filter(to_number=PHONE_NUMBER).exists()
+
+
+@pytest.mark.django_db
+def test_resend_while_sending_is_queued_again():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 111111")
+
+    class ResendingBackend(LocmemSMSBackend):
+        def send(self, sms):
+            if not backends.sent_sms:
+                utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 222222")
+            super().send(sms)
+
+    assert process_sms_outbox(backend=ResendingBackend()) == 1
+    assert OutboundSMS.objects.get(status=OutboundSMS.PENDING).body.endswith("222222")
+    assert process_sms_outbox(backend=LocmemSMSBackend()) == 1
+
+
+@pytest.mark.django_db
+def test_expired_lease_is_claimed_again():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 111111")
+    OutboundSMS.objects.update(status=OutboundSMS.SENDING, next_attempt_at=timezone.now())
+
+    assert process_sms_outbox(backend=LocmemSMSBackend()) == 1
+    assert OutboundSMS.objects.get().status == OutboundSMS.SENT
+
+
+@pytest.mark.django_db
+def test_failed_sms_replaced_by_resend():
+    utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 111111")
+
+    class FailingBackend:
+        def send(self, sms):
+            utils.send_sms(PHONE_NUMBER, "Your PomJuice verification code is 222222")
+            raise Exception("Twilio unavailable")
+
+    assert process_sms_outbox(backend=FailingBackend()) == 0
+    assert OutboundSMS.objects.get(status=OutboundSMS.FAILED).body.endswith("111111")
+    assert OutboundSMS.objects.get(status=OutboundSMS.PENDING).body.endswith("222222")
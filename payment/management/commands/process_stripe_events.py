@@ -0,0 +1,13 @@
+from payment.webhooks import process_stripe_events
+from pjbackend.workers import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Process the Stripe webhook events stored by the webhook endpoint'
+    interval = 2
+    loop_help = 'Keep polling for pending events'
+
+    def process_batch(self, batch_size):
+        processed = process_stripe_events(batch_size=batch_size)
+        if processed:
+            return f'{processed} events processed'
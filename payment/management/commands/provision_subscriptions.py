@@ -0,0 +1,17 @@
+from payment.provisioning import process_pending_subscriptions
+from payment.stripe_client import get_stripe_client
+from pjbackend.workers import WorkerCommand
+
+
+class Command(WorkerCommand):
+    help = 'Create the Stripe customer and trial subscription of new startups'
+    loop_help = 'Keep polling for pending subscriptions'
+
+    def handle(self, *args, **options):
+        self.client = get_stripe_client()
+        super().handle(*args, **options)
+
+    def process_batch(self, batch_size):
+        processed = process_pending_subscriptions(batch_size=batch_size, client=self.client)
+        if processed:
+            return f'{processed} subscriptions processed'
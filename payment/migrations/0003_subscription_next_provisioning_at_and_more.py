@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:46
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_alter_subscription_stripe_subscription_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='next_provisioning_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='provisioning_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='provisioning_error',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='subscription',
+            name='provisioning_status',
+            field=models.CharField(choices=[('pending', 'pending'), ('provisioned', 'provisioned'), ('failed', 'failed')], default='provisioned', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['provisioning_status', 'next_provisioning_at'], name='payment_sub_provisi_9e5340_idx'),
+        ),
+    ]
@@ -1,4 +1,8 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from pjbackend.workers import retry_at
 
 # Create your models here.
 class Subscription(models.Model):
@@ -10,11 +14,126 @@ class Subscription(models.Model):
         ( BASIC, 'basic'),
         ( PRO , 'pro')
     )
+    PROVISIONING_PENDING = 'pending'
+    PROVISIONING_DONE = 'provisioned'
+    PROVISIONING_FAILED = 'failed'
+    PROVISIONING_CHOICES = (
+        (PROVISIONING_PENDING, 'pending'),
+        (PROVISIONING_DONE, 'provisioned'),
+        (PROVISIONING_FAILED, 'failed')
+    )
     startup = models.ForeignKey('startups.Startup', on_delete=models.PROTECT)
     stripe_customer_id = models.CharField(max_length=100, blank=True, null=True)
     stripe_subscription_id = models.CharField(max_length=100, blank=True, null=True)
     stripe_subscription_status = models.CharField(max_length=100, choices=SUBSCRIPTION_CHOICES, default=TRIAL)
     stripe_trial_end_date = models.DateTimeField()
+    provisioning_status = models.CharField(max_length=20, choices=PROVISIONING_CHOICES, default=PROVISIONING_DONE)
+    provisioning_attempts = models.PositiveIntegerField(default=0)
+    provisioning_error = models.TextField(blank=True, null=True)
+    next_provisioning_at = models.DateTimeField(default=timezone.now)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['provisioning_status', 'next_provisioning_at']),
+        ]
+
     def __str__(self):
-        return self.startup.name
\ No newline at end of file
+        return self.startup.name
+
+    def mark_provisioned(self):
+        self.provisioning_status = self.PROVISIONING_DONE
+        self.provisioning_attempts += 1
+        self.provisioning_error = None
+        self.save(update_fields=[
+            'stripe_customer_id',
+            'stripe_subscription_id',
+            'stripe_trial_end_date',
+            'provisioning_status',
+            'provisioning_attempts',
+            'provisioning_error'
+        ])
+
+    def mark_provisioning_failed(self, error):
+        """Schedules a retry with exponential backoff, or gives up."""
+        self.provisioning_attempts += 1
+        self.provisioning_error = str(error)
+        if self.provisioning_attempts >= settings.STRIPE_PROVISIONING_MAX_ATTEMPTS:
+            self.provisioning_status = self.PROVISIONING_FAILED
+        else:
+            self.next_provisioning_at = retry_at(self.provisioning_attempts, settings.STRIPE_PROVISIONING_RETRY_DELAY)
+        self.save(update_fields=[
+            'provisioning_status',
+            'provisioning_attempts',
+            'provisioning_error',
+            'next_provisioning_at'
+        ])
+
+
+class StripeEvent(models.Model):
+    """
+    Stripe webhook event, stored on receipt and processed by the
+    process_stripe_events worker. The Stripe event id makes redeliveries
+    no-ops.
+    """
+    PENDING = 'pending'
+    PROCESSED = 'processed'
+    IGNORED = 'ignored'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'pending'),
+        (PROCESSED, 'processed'),
+        (IGNORED, 'ignored'),
+        (FAILED, 'failed')
+    )
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    stripe_subscription_id = models.CharField(max_length=100, blank=True, null=True)
+    stripe_created = models.PositiveBigIntegerField()
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    received_at = models.DateTimeField(default=timezone.now)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'stripe_created']),
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.event_id} ({self.status})"
+
+    @classmethod
+    def store(cls, event):
+        """Saves a verified event, ignoring ones already received."""
+        data = event['data']['object']
+        if data.get('object') == 'subscription':
+            subscription_id = data.get('id')
+        else:
+            subscription_id = data.get('subscription')
+        cls.objects.bulk_create([cls(
+            event_id=event['id'],
+            type=event['type'],
+            stripe_subscription_id=subscription_id,
+            stripe_created=event['created'],
+            payload=event
+        )], ignore_conflicts=True)
+
+    def mark_done(self, status):
+        self.status = status
+        self.attempts += 1
+        self.last_error = None
+        self.processed_at = timezone.now()
+        self.save(update_fields=['status', 'attempts', 'last_error', 'processed_at'])
+
+    def mark_failed(self, error):
+        """Schedules a retry with exponential backoff, or gives up."""
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= settings.STRIPE_EVENT_MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            self.next_attempt_at = retry_at(self.attempts, settings.STRIPE_EVENT_RETRY_DELAY)
+        self.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
@@ -0,0 +1,75 @@
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+
+from pjbackend.workers import lease_due
+from .models import Subscription
+from .stripe_client import get_stripe_client
+
+logger = logging.getLogger(__name__)
+
+TRIAL_PERIOD_DAYS = 14
+
+
+def provision_subscription(subscription, client):
+    """
+    Creates, or reconciles, the Stripe customer and trial subscription of a
+    pending Subscription. Each step uses an idempotency key derived from
+    the startup, so a retry never creates duplicate Stripe objects.
+    """
+    startup = subscription.startup
+    metadata = {'startup_id': str(startup.id), 'user_id': str(startup.main_founder_id)}
+    try:
+        if not subscription.stripe_customer_id:
+            customer = client.create_customer(
+                email=startup.main_founder.email,
+                name=startup.name,
+                metadata=metadata,
+                idempotency_key=f'startup-{startup.id}-customer'
+            )
+            subscription.stripe_customer_id = customer['id']
+            subscription.save(update_fields=['stripe_customer_id'])
+
+        if subscription.stripe_subscription_id:
+            stripe_subscription = client.retrieve_subscription(subscription.stripe_subscription_id)
+        else:
+            stripe_subscription = client.create_subscription(
+                customer_id=subscription.stripe_customer_id,
+                price_id=settings.PRO_ANNUAL_ID,
+                trial_period_days=TRIAL_PERIOD_DAYS,
+                metadata=metadata,
+                idempotency_key=f'startup-{startup.id}-trial-subscription'
+            )
+            subscription.stripe_subscription_id = stripe_subscription['id']
+            # Committed right away, so its webhooks find the subscription
+            subscription.save(update_fields=['stripe_subscription_id'])
+
+        trial_end = stripe_subscription.get('trial_end')
+        if trial_end:
+            subscription.stripe_trial_end_date = datetime.fromtimestamp(trial_end, tz=dt_timezone.utc)
+        subscription.mark_provisioned()
+    except Exception as e:
+        logger.error('Error provisioning subscription %s: %s', subscription.id, e)
+        subscription.mark_provisioning_failed(e)
+
+
+def process_pending_subscriptions(batch_size=None, client=None):
+    """
+    Provisions one batch of due pending subscriptions and returns its size.
+    The batch is leased in a short transaction and each subscription is
+    provisioned outside it, so the Stripe ids it gets are committed as
+    soon as they are created.
+    """
+    client = client or get_stripe_client()
+    subscriptions = lease_due(
+        Subscription.objects.filter(
+            provisioning_status=Subscription.PROVISIONING_PENDING
+        ).select_related('startup__main_founder').order_by('next_provisioning_at', 'id'),
+        'next_provisioning_at',
+        batch_size or settings.STRIPE_PROVISIONING_BATCH_SIZE,
+        settings.STRIPE_PROVISIONING_LEASE_TIMEOUT
+    )
+    for subscription in subscriptions:
+        provision_subscription(subscription, client)
+    return len(subscriptions)
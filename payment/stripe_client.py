@@ -0,0 +1,69 @@
+import time
+import uuid
+
+import stripe
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class StripeClient:
+    """The Stripe calls made while provisioning subscriptions."""
+
+    def __init__(self):
+        stripe.api_key = settings.STRIPE_SECRET_KEY
+
+    def create_customer(self, email, name, metadata, idempotency_key):
+        return stripe.Customer.create(
+            email=email,
+            name=name,
+            metadata=metadata,
+            idempotency_key=idempotency_key
+        )
+
+    def create_subscription(self, customer_id, price_id, trial_period_days, metadata, idempotency_key):
+        return stripe.Subscription.create(
+            customer=customer_id,
+            items=[{'price': price_id}],
+            trial_period_days=trial_period_days,
+            metadata=metadata,
+            idempotency_key=idempotency_key
+        )
+
+    def retrieve_subscription(self, subscription_id):
+        return stripe.Subscription.retrieve(subscription_id)
+
+
+class LocalStripeClient:
+    """
+    In-memory stand-in for StripeClient, for tests and local development.
+    Like Stripe, a repeated idempotency key returns the original object.
+    """
+    objects = {}
+
+    def _create(self, prefix, idempotency_key, **fields):
+        if idempotency_key not in self.objects:
+            self.objects[idempotency_key] = {'id': f'{prefix}_{uuid.uuid4().hex[:14]}', **fields}
+        return self.objects[idempotency_key]
+
+    def create_customer(self, email, name, metadata, idempotency_key):
+        return self._create('cus', idempotency_key, email=email, name=name, metadata=metadata)
+
+    def create_subscription(self, customer_id, price_id, trial_period_days, metadata, idempotency_key):
+        return self._create(
+            'sub',
+            idempotency_key,
+            customer=customer_id,
+            status='trialing',
+            trial_end=int(time.time()) + trial_period_days * 86400,
+            metadata=metadata
+        )
+
+    def retrieve_subscription(self, subscription_id):
+        for obj in self.objects.values():
+            if obj['id'] == subscription_id:
+                return obj
+        raise stripe.error.InvalidRequestError(f'No such subscription: {subscription_id}', 'id')
+
+
+def get_stripe_client():
+    return import_string(settings.STRIPE_PROVISIONING_CLIENT)()
@@ -0,0 +1,98 @@
+import pytest
+
+from payment.models import Subscription
+from payment.provisioning import process_pending_subscriptions
+from payment.stripe_client import LocalStripeClient
+from startups.models import Startup
+from startups.tests.fixtures import common_startup
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+class FailingStripeClient(LocalStripeClient):
+    def create_subscription(self, *args, **kwargs):
+        raise Exception("Stripe unavailable")
+
+
+@pytest.fixture
+def pending_subscription(main_startup):
+    LocalStripeClient.objects.clear()
+    return Subscription.objects.create(
+        startup=main_startup,
+        stripe_trial_end_date="2030-01-01T00:00:00Z",
+        provisioning_status=Subscription.PROVISIONING_PENDING
+    )
+
+
+@pytest.mark.django_db
+def test_create_startup_leaves_subscription_pending(main_user_token, mocker):
+    stripe_create = mocker.patch("stripe.Customer.create")
+    user = main_user_token.get("secondary_user")
+    startup = Startup.create_startup(name="Pending Billing", main_founder=user, employee_count=Startup.ONE_TO_TEN)
+
+    subscription = Subscription.objects.get(startup=startup)
+    assert subscription.provisioning_status == Subscription.PROVISIONING_PENDING
+    assert subscription.stripe_customer_id is None
+    assert not stripe_create.called
+
+
+@pytest.mark.django_db
+def test_pending_subscription_provisioned(pending_subscription):
+    assert process_pending_subscriptions(client=LocalStripeClient()) == 1
+
+    pending_subscription.refresh_from_db()
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_DONE
+    assert pending_subscription.stripe_customer_id.startswith("cus_")
+    assert pending_subscription.stripe_subscription_id.startswith("sub_")
+    assert pending_subscription.stripe_trial_end_date.year < 2030
+    assert process_pending_subscriptions(client=LocalStripeClient()) == 0
+
+
+@pytest.mark.django_db
+def test_failed_provisioning_retried_without_duplicates(pending_subscription):
+    process_pending_subscriptions(client=FailingStripeClient())
+
+    pending_subscription.refresh_from_db()
+    customer_id = pending_subscription.stripe_customer_id
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_PENDING
+    assert pending_subscription.provisioning_error == "Stripe unavailable"
+    assert customer_id is not None
+
+    Subscription.objects.update(next_provisioning_at="2000-01-01T00:00:00Z")
+    process_pending_subscriptions(client=LocalStripeClient())
+
+    pending_subscription.refresh_from_db()
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_DONE
+    assert pending_subscription.stripe_customer_id == customer_id
+    assert len([obj for obj in LocalStripeClient.objects.values() if obj["id"].startswith("cus_")]) == 1
+
+
+@pytest.mark.django_db
+def test_provisioning_gives_up_after_max_attempts(pending_subscription, settings):
+    settings.STRIPE_PROVISIONING_MAX_ATTEMPTS = 1
+    process_pending_subscriptions(client=FailingStripeClient())
+
+    pending_subscription.refresh_from_db()
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_FAILED
+
+
+@pytest.mark.django_db
+def test_subscription_id_kept_when_provisioning_fails_after_creation(pending_subscription, mocker):
+    mocker.patch.object(Subscription, "mark_provisioned", side_effect=Exception("Database unavailable"))
+    process_pending_subscriptions(client=LocalStripeClient())
+
+    pending_subscription.refresh_from_db()
+    subscription_id = pending_subscription.stripe_subscription_id
+    assert subscription_id.startswith("sub_")
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_PENDING
+
+    mocker.stopall()
+    Subscription.objects.update(next_provisioning_at="2000-01-01T00:00:00Z")
+    process_pending_subscriptions(client=LocalStripeClient())
+
+    pending_subscription.refresh_from_db()
+    assert pending_subscription.provisioning_status == Subscription.PROVISIONING_DONE
+    assert pending_subscription.stripe_subscription_id == subscription_id
+    assert len([obj for obj in LocalStripeClient.objects.values() if obj["id"].startswith("sub_")]) == 1
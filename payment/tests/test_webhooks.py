@@ -0,0 +1,193 @@
+import pytest
+import stripe
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from notifications.models import OutboundEmail
+from payment.models import StripeEvent, Subscription
+from payment.webhooks import process_stripe_events
+from startups.tests.fixtures import common_startup
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+def _event(event_id, event_type, created, data):
+    return stripe.Event.construct_from({
+        "id": event_id,
+        "object": "event",
+        "type": event_type,
+        "created": created,
+        "data": {"object": data}
+    }, "sk_test")
+
+
+def _subscription_object(status_value, **extra):
+    return {"object": "subscription", "id": "sub_webhook", "customer": "cus_webhook", "status": status_value, **extra}
+
+
+def _post(mocker, event):
+    mocker.patch("stripe.Webhook.construct_event", return_value=event)
+    return APIClient().post(
+        reverse("stripe-webhook"),
+        data="{}",
+        content_type="application/json",
+        HTTP_STRIPE_SIGNATURE="t=1,v1=signature"
+    )
+
+
+@pytest.fixture
+def subscription(main_startup):
+    return Subscription.objects.create(
+        startup=main_startup,
+        stripe_customer_id="cus_webhook",
+        stripe_subscription_id="sub_webhook",
+        stripe_trial_end_date="2030-01-01T00:00:00Z"
+    )
+
+
+@pytest.mark.django_db
+def test_webhook_stores_event_once(mocker, django_assert_max_num_queries):
+    event = _event("evt_1", "customer.subscription.updated", 100, _subscription_object("active"))
+
+    with django_assert_max_num_queries(1):
+        response = _post(mocker, event)
+    assert response.status_code == status.HTTP_200_OK
+    assert _post(mocker, event).status_code == status.HTTP_200_OK
+
+    stored = StripeEvent.objects.get()
+    assert stored.event_id == "evt_1"
+    assert stored.stripe_subscription_id == "sub_webhook"
+    assert stored.status == StripeEvent.PENDING
+
+
+@pytest.mark.django_db
+def test_webhook_rejects_invalid_signature(mocker):
+    mocker.patch(
+        "stripe.Webhook.construct_event",
+        side_effect=stripe.error.SignatureVerificationError("Invalid", "t=1,v1=signature")
+    )
+    response = APIClient().post(
+        reverse("stripe-webhook"),
+        data="{}",
+        content_type="application/json",
+        HTTP_STRIPE_SIGNATURE="t=1,v1=signature"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not StripeEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_events_processed_in_created_order(mocker, subscription):
+    _post(mocker, _event("evt_deleted", "customer.subscription.deleted", 200, _subscription_object("canceled")))
+    _post(mocker, _event("evt_active", "customer.subscription.updated", 100, _subscription_object("active")))
+
+    assert process_stripe_events() == 2
+
+    subscription.refresh_from_db()
+    assert subscription.stripe_subscription_status == Subscription.BASIC
+    assert set(StripeEvent.objects.values_list("status", flat=True)) == {StripeEvent.PROCESSED}
+
+
+@pytest.mark.django_db
+def test_late_event_does_not_override_newer_state(mocker, subscription):
+    _post(mocker, _event("evt_deleted", "customer.subscription.deleted", 200, _subscription_object("canceled")))
+    process_stripe_events()
+    _post(mocker, _event("evt_active", "customer.subscription.updated", 100, _subscription_object("active")))
+    process_stripe_events()
+
+    subscription.refresh_from_db()
+    assert subscription.stripe_subscription_status == Subscription.BASIC
+    assert StripeEvent.objects.get(event_id="evt_active").status == StripeEvent.IGNORED
+
+
+@pytest.mark.django_db
+def test_failed_event_holds_back_its_subscription(mocker, subscription):
+    _post(mocker, _event("evt_active", "customer.subscription.updated", 100, _subscription_object("active")))
+    _post(mocker, _event("evt_deleted", "customer.subscription.deleted", 200, _subscription_object("canceled")))
+    mocker.patch.dict(
+        "payment.webhooks.EVENT_HANDLERS",
+        {"customer.subscription.updated": mocker.Mock(side_effect=Exception("Database unavailable"))}
+    )
+
+    assert process_stripe_events() == 0
+
+    failed = StripeEvent.objects.get(event_id="evt_active")
+    assert failed.status == StripeEvent.PENDING
+    assert failed.attempts == 1
+    assert failed.last_error == "Database unavailable"
+    assert StripeEvent.objects.get(event_id="evt_deleted").attempts == 0
+
+
+@pytest.mark.django_db
+def test_invoice_paid_upgrades_to_pro(mocker, subscription):
+    invoice = {"object": "invoice", "id": "in_1", "customer": "cus_webhook", "subscription": "sub_webhook", "amount_paid": 1000}
+    _post(mocker, _event("evt_invoice", "invoice.paid", 100, invoice))
+
+    process_stripe_events()
+
+    subscription.refresh_from_db()
+    assert subscription.stripe_subscription_status == Subscription.PRO
+
+
+@pytest.mark.django_db
+def test_trial_will_end_emails_main_founder(mocker, subscription, main_startup):
+    data = _subscription_object("trialing", trial_end=1900000000)
+    _post(mocker, _event("evt_trial", "customer.subscription.trial_will_end", 100, data))
+
+    process_stripe_events()
+
+    subscription.refresh_from_db()
+    assert int(subscription.stripe_trial_end_date.timestamp()) == 1900000000
+    assert OutboundEmail.objects.filter(to_email=main_startup.main_founder.email).exists()
+
+
+@pytest.mark.django_db
+def test_unknown_event_type_ignored(mocker, subscription):
+    _post(mocker, _event("evt_charge", "charge.succeeded", 100, {"object": "charge", "id": "ch_1"}))
+
+    assert process_stripe_events() == 1
+    assert StripeEvent.objects.get().status == StripeEvent.IGNORED
+
+
+@pytest.mark.django_db
+def test_event_before_its_subscription_is_retried(mocker, main_startup):
+    _post(mocker, _event("evt_active", "customer.subscription.updated", 100, _subscription_object("active")))
+    _post(mocker, _event("evt_deleted", "customer.subscription.deleted", 200, _subscription_object("canceled")))
+
+    assert process_stripe_events() == 0
+    early = StripeEvent.objects.get(event_id="evt_active")
+    assert (early.status, early.attempts) == (StripeEvent.PENDING, 1)
+    assert StripeEvent.objects.get(event_id="evt_deleted").attempts == 0
+    assert process_stripe_events() == 0
+
+    subscription = Subscription.objects.create(
+        startup=main_startup,
+        stripe_customer_id="cus_webhook",
+        stripe_subscription_id="sub_webhook",
+        stripe_trial_end_date="2030-01-01T00:00:00Z"
+    )
+    StripeEvent.objects.filter(event_id="evt_active").update(next_attempt_at="2000-01-01T00:00:00Z")
+
+    assert process_stripe_events() == 2
+    subscription.refresh_from_db()
+    assert subscription.stripe_subscription_status == Subscription.BASIC
+
+
+@pytest.mark.django_db
+def test_unknown_subscription_ignored_after_last_attempt(mocker, subscription, settings):
+    settings.STRIPE_EVENT_MAX_ATTEMPTS = 2
+    _post(mocker, _event("evt_other", "customer.subscription.updated", 100, dict(_subscription_object("active"), id="sub_other")))
+
+    assert process_stripe_events() == 0
+    StripeEvent.objects.update(next_attempt_at="2000-01-01T00:00:00Z")
+    assert process_stripe_events() == 1
+
+    assert StripeEvent.objects.get().status == StripeEvent.IGNORED
+    subscription.refresh_from_db()
+    assert subscription.stripe_subscription_status == Subscription.TRIAL
@@ -1,6 +1,5 @@
 import stripe
 import logging
-from django.utils import timezone
 from django.conf import settings
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -9,7 +8,7 @@ from users.permissions import IsRegistered
 from startups.models import Startup
 from rest_framework.response import Response
 from rest_framework import generics, status
-from .models import Subscription
+from .models import StripeEvent, Subscription
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +78,8 @@ class CreateStartupBillingPortalSessionView(generics.GenericAPIView):
             startup = Startup.objects.get(id=startupId,main_founder_id=user.id,is_active=True)
             
             subscription = Subscription.objects.get(startup=startup, stripe_subscription_status__in=[Subscription.TRIAL, Subscription.BASIC])
+            if not subscription.stripe_customer_id:
+                return Response({"error": "Billing is still being set up"}, status=status.HTTP_409_CONFLICT)
             stripe.api_key = settings.STRIPE_SECRET_KEY
             session = stripe.billing_portal.Session.create(
                 customer=subscription.stripe_customer_id,
@@ -124,57 +125,6 @@ class StripeWebhookView(generics.GenericAPIView):
             logger.error(f"Invalid signature: {e}")
             return HttpResponse("Invalid signature", status=status.HTTP_400_BAD_REQUEST)
 
-        # Handle only the event `customer.subscription.updated`
-        if event['type'] == 'customer.subscription.updated':
-            session = event['data']['object']
-            customer_id = session.get('customer')
-            subscription_id = session.get('id')
-            subscription_status = session.get('status')
-            metadata = session.get('metadata', {})
-
-            try:
-                startup_id = metadata.get('startup_id')
-                if not startup_id:
-                    logger.error(f"Startup ID missing in session metadata for customer {customer_id}")
-                    return HttpResponse("Missing startup ID in metadata", status=status.HTTP_400_BAD_REQUEST)
-
-                startup = Startup.objects.get(id=startup_id)
-
-                subscription = Subscription.objects.get(
-                    startup=startup,
-                    stripe_customer_id=customer_id,
-                    stripe_subscription_id=subscription_id
-                )
-                
-                if subscription_status == 'active':
-                    subscription.stripe_subscription_status = Subscription.PRO
-                elif subscription_status == 'canceled':
-                    current_period_end = session.get('current_period_end')
-                    current_period_end_datetime = timezone.make_aware(
-                        timezone.datetime.fromtimestamp(current_period_end)
-                    )
-
-                    if current_period_end_datetime > timezone.now():
-                        subscription.stripe_subscription_status = Subscription.PRO
-                    else:
-                        subscription.stripe_subscription_status = Subscription.BASIC
-
-                subscription.save()
-
-            except Startup.DoesNotExist:
-                logger.error(f"Startup with ID {startup_id} does not exist")
-                return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
-            except Subscription.DoesNotExist:
-                logger.error(f"Subscription for customer {customer_id} does not exist")
-                return Response({"error": "Subscription does not exist"}, status=status.HTTP_404_NOT_FOUND)
-            except Exception as e:
-                logger.error(f"Error handling subscription for customer {customer_id}: {e}")
-                return HttpResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        else:
-            # Log unhandled events
-            logger.info(f"Unhandled event type: {event['type']}")
-            # Simply return 200 OK for events that are not explicitly handled
-            return HttpResponse(status=status.HTTP_200_OK)
-
-        return HttpResponse(status=status.HTTP_200_OK)
\ No newline at end of file
+        # Stored for the process_stripe_events worker; redeliveries are ignored
+        StripeEvent.store(event)
+        return HttpResponse(status=status.HTTP_200_OK)
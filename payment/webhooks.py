@@ -0,0 +1,182 @@
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from pjbackend.utils import send_trial_ending_email
+from pjbackend.workers import lease_due
+from .models import StripeEvent, Subscription
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_STATE_EVENTS = (
+    'customer.subscription.updated',
+    'customer.subscription.deleted',
+)
+
+
+class SubscriptionNotFound(Exception):
+    """The event arrived before its subscription was committed, or is for another account."""
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+def _get_subscription(data, subscription_id):
+    """Returns the local subscription of a Stripe object, or None."""
+    if not subscription_id:
+        return None
+    filters = {'stripe_subscription_id': subscription_id}
+    if data.get('customer'):
+        filters['stripe_customer_id'] = data['customer']
+    startup_id = (data.get('metadata') or {}).get('startup_id')
+    if startup_id:
+        filters['startup_id'] = startup_id
+    return Subscription.objects.select_related('startup__main_founder').filter(**filters).first()
+
+
+def handle_subscription_updated(event, subscription):
+    data = event.payload['data']['object']
+    subscription_status = data.get('status')
+    if subscription_status == 'active':
+        subscription.stripe_subscription_status = Subscription.PRO
+    elif subscription_status == 'canceled':
+        current_period_end = data.get('current_period_end')
+        if current_period_end and _timestamp(current_period_end) > timezone.now():
+            subscription.stripe_subscription_status = Subscription.PRO
+        else:
+            subscription.stripe_subscription_status = Subscription.BASIC
+    else:
+        return
+    subscription.save(update_fields=['stripe_subscription_status'])
+
+
+def handle_subscription_deleted(event, subscription):
+    subscription.stripe_subscription_status = Subscription.BASIC
+    subscription.save(update_fields=['stripe_subscription_status'])
+
+
+def handle_invoice_paid(event, subscription):
+    if event.payload['data']['object'].get('amount_paid', 0) > 0:
+        subscription.stripe_subscription_status = Subscription.PRO
+        subscription.save(update_fields=['stripe_subscription_status'])
+
+
+def handle_trial_will_end(event, subscription):
+    data = event.payload['data']['object']
+    trial_end = _timestamp(data['trial_end']) if data.get('trial_end') else subscription.stripe_trial_end_date
+    if subscription.stripe_trial_end_date != trial_end:
+        subscription.stripe_trial_end_date = trial_end
+        subscription.save(update_fields=['stripe_trial_end_date'])
+    startup = subscription.startup
+    send_trial_ending_email(
+        to_email=startup.main_founder.email,
+        name=startup.main_founder.first_name,
+        company_name=startup.name,
+        trial_end=trial_end
+    )
+
+
+EVENT_HANDLERS = {
+    'customer.subscription.updated': handle_subscription_updated,
+    'customer.subscription.deleted': handle_subscription_deleted,
+    'customer.subscription.trial_will_end': handle_trial_will_end,
+    'invoice.paid': handle_invoice_paid,
+}
+
+
+def _is_superseded(event):
+    """
+    True for subscription state events older than one already applied,
+    since Stripe may deliver them out of order.
+    """
+    return event.type in SUBSCRIPTION_STATE_EVENTS and StripeEvent.objects.filter(
+        stripe_subscription_id=event.stripe_subscription_id,
+        type__in=SUBSCRIPTION_STATE_EVENTS,
+        status=StripeEvent.PROCESSED,
+        stripe_created__gt=event.stripe_created
+    ).exists()
+
+
+def process_stripe_event(event):
+    handler = EVENT_HANDLERS.get(event.type)
+    if handler is None:
+        logger.info('Unhandled event type: %s', event.type)
+        event.mark_done(StripeEvent.IGNORED)
+        return True
+
+    try:
+        with transaction.atomic():
+            data = event.payload['data']['object']
+            subscription = _get_subscription(data, event.stripe_subscription_id)
+            if subscription is None:
+                raise SubscriptionNotFound(f'Subscription {event.stripe_subscription_id} does not exist')
+            if _is_superseded(event):
+                event.mark_done(StripeEvent.IGNORED)
+            else:
+                handler(event, subscription)
+                event.mark_done(StripeEvent.PROCESSED)
+        return True
+    except SubscriptionNotFound as e:
+        # Retried like any failure, since provisioning may not have committed
+        # the subscription yet; only given up on at the last attempt
+        if event.attempts + 1 >= settings.STRIPE_EVENT_MAX_ATTEMPTS:
+            logger.error('%s for event %s, ignoring it', e, event.event_id)
+            event.mark_done(StripeEvent.IGNORED)
+            return True
+        event.mark_failed(e)
+        return False
+    except Exception as e:
+        logger.error('Error processing Stripe event %s: %s', event.event_id, e)
+        event.mark_failed(e)
+        return False
+
+
+def _claim_events(now, batch_size):
+    """
+    Leases a batch of due events in a short transaction. Events with an
+    earlier event of their subscription waiting for a retry, or leased by
+    another worker, are left for later so each subscription is still
+    processed in order.
+    """
+    waiting = StripeEvent.objects.filter(
+        Q(stripe_created__lt=OuterRef('stripe_created')) | Q(stripe_created=OuterRef('stripe_created'), id__lt=OuterRef('id')),
+        stripe_subscription_id=OuterRef('stripe_subscription_id'),
+        status=StripeEvent.PENDING,
+        next_attempt_at__gt=now
+    )
+    return lease_due(
+        StripeEvent.objects.filter(~Exists(waiting), status=StripeEvent.PENDING).order_by('stripe_created', 'id'),
+        'next_attempt_at',
+        batch_size or settings.STRIPE_EVENT_BATCH_SIZE,
+        settings.STRIPE_EVENT_LEASE_TIMEOUT,
+        now=now
+    )
+
+
+def process_stripe_events(batch_size=None):
+    """
+    Processes one batch of due events in the order Stripe created them
+    and returns how many were handled. Each event is handled in its own
+    transaction. An event that is waiting for a retry holds back the
+    later events of its subscription.
+    """
+    now = timezone.now()
+    handled = 0
+    blocked = set()
+    for event in _claim_events(now, batch_size):
+        key = event.stripe_subscription_id
+        if key and key in blocked:
+            # Released, and held back by the failed event until its retry
+            StripeEvent.objects.filter(id=event.id).update(next_attempt_at=now)
+            continue
+        if not process_stripe_event(event):
+            if key:
+                blocked.add(key)
+            continue
+        handled += 1
+    return handled
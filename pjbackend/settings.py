@@ -54,6 +54,8 @@ INSTALLED_APPS = [
     "storages",
     "tracks",
     "payment",
+    "notifications",
+    "uploads",
 ]
 
 MIDDLEWARE = [
@@ -90,7 +92,7 @@ WSGI_APPLICATION = "pjbackend.wsgi.application"
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'users.permissions.IsRegistered',
@@ -101,6 +103,8 @@ AUTH_USER_MODEL = "users.CustomUser"
 
 REGEX_STRING = r"^[ a-zA-ZÀ-ÿ\u00f1\u00d1\'-.]*$"
 SIGNUP_EXPIRATION_SECONDS = 86400
+STARTUP_PROFILE_CACHE_TIMEOUT = 86400
+TAXONOMY_CACHE_MAX_AGE = 86400
 
 MAX_LENGTH_CONFIG = {
     'names': 150,
@@ -238,6 +242,32 @@ else:
     MEDIA_URL = "/media/"
     MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+UPLOAD_STORAGE_BACKEND = env("UPLOAD_STORAGE_BACKEND", default="uploads.backends.S3UploadBackend")
+UPLOAD_LOCAL_ROOT = env("UPLOAD_LOCAL_ROOT", default=os.path.join(BASE_DIR, "media"))
+UPLOAD_URL_EXPIRES = 3600
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MIN_CHUNK_SIZE = 5 * 1024 * 1024
+IMAGE_DERIVATIVE_SIZES = {
+    "small": 96,
+    "medium": 320,
+    "large": 1024,
+}
+MEDIA_GC_GRACE_PERIOD = 24 * 60 * 60
+MEDIA_GC_BATCH_SIZE = 500
+PITCH_DECK_SLIDE_WIDTH = 1600
+PITCH_DECK_MAX_PAGES = 200
+IMAGE_DERIVATIVE_BATCH_SIZE = 10
+IMAGE_DERIVATIVE_MAX_ATTEMPTS = 5
+IMAGE_DERIVATIVE_RETRY_DELAY = 60
+# Long enough to rasterize a deck of PITCH_DECK_MAX_PAGES, after which another worker may take the job
+IMAGE_DERIVATIVE_LEASE_TIMEOUT = 1800
+UPLOAD_MAX_SIZES = {
+    "startup_image": 10 * 1024 * 1024,
+    "profile_picture": 10 * 1024 * 1024,
+    "pitch_deck": 100 * 1024 * 1024,
+    "startup_video": 1024 * 1024 * 1024,
+}
+
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -352,6 +382,8 @@ EMAIL_HOST_USER = "apikey"  # this is exactly the value 'apikey'
 EMAIL_HOST_PASSWORD = SENDGRID_API_KEY
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+EMAIL_OUTBOX_BACKEND = env("EMAIL_OUTBOX_BACKEND", default="notifications.backends.SendGridEmailBackend")
+EMAIL_OUTBOX_FILE_PATH = env("EMAIL_OUTBOX_FILE_PATH", default=str(BASE_DIR / "outbox" / "emails.jsonl"))
 
 if env.bool("USE_MIXPANEL"):
     MIXPANEL_API_TOKEN=env("MIXPANEL_API_TOKEN")
@@ -359,10 +391,44 @@ if env.bool("USE_MIXPANEL"):
 else:
     MIXPANEL_API_TOKEN = None
     MIXPANEL_API_SECRET = None
+# Where the tracking dashboard reads events from: "mixpanel" exports them on every build,
+# "local" reads tracks.TrackEvent, and "auto" reads it for startups whose Mixpanel
+# history has been synced into it and exports the others
+TRACK_DASHBOARD_SOURCE = env("TRACK_DASHBOARD_SOURCE", default="auto")
+TRACK_DASHBOARD_FRESH_FOR = 600
+TRACK_DASHBOARD_CACHE_TIMEOUT = 86400
+# Mixpanel consumer used by the tracking endpoint; tests keep events in memory
+MIXPANEL_CONSUMER = env(
+    "MIXPANEL_CONSUMER",
+    default="tracks.consumers.InMemoryConsumer" if env.bool("BUILD_PIPELINE") else "tracks.consumers.BackgroundConsumer"
+)
+MIXPANEL_FLUSH_INTERVAL = 5
+# Most messages a worker keeps for retry while Mixpanel is failing
+MIXPANEL_MAX_BUFFERED = 10000
+# Flushes a message is tried in before it is dropped, e.g. when Mixpanel rejects its batch
+MIXPANEL_MAX_ATTEMPTS = 5
+TRACK_EVENT_BATCH_LIMIT = 50
+MIXPANEL_SYNC_INTERVAL = 3600
+MIXPANEL_SYNC_RETRY_DELAY = 60
+MIXPANEL_SYNC_BATCH_SIZE = 10
+MIXPANEL_SYNC_HISTORY_DAYS = 365
+# Longer than a full history export, after which a sync whose worker died is due again
+MIXPANEL_SYNC_LEASE_TIMEOUT = 1800
+MIXPANEL_EXPORT_WORKERS = 4
+MIXPANEL_EXPORT_SHARD_ATTEMPTS = 3
+MIXPANEL_EXPORT_RETRY_DELAY = 2
     
 TWILIO_ACCOUNT_SID = env('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = env('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = env('TWILIO_PHONE_NUMBER')
+SMS_OUTBOX_BACKEND = env("SMS_OUTBOX_BACKEND", default="notifications.backends.TwilioSMSBackend")
+SMS_OUTBOX_FILE_PATH = env("SMS_OUTBOX_FILE_PATH", default=str(BASE_DIR / "outbox" / "sms.jsonl"))
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+# Seconds a claimed message stays with its worker before another may send it
+OUTBOX_LEASE_TIMEOUT = 300
 
 CITIES_LIGHT_TRANSLATION_LANGUAGES = ['en']
 CITIES_LIGHT_INCLUDE_COUNTRIES = ['US', 'CA', 'GB', 'MX']
@@ -373,4 +439,13 @@ STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY")
 STRIPE_LIVE_MODE = False
 MAIN_DOMAIN= env("MAIN_DOMAIN")
 PRO_MONTHLY_ID=env("PRO_MONTHLY_ID")
-PRO_ANNUAL_ID=env("PRO_ANNUAL_ID")
\ No newline at end of file
+PRO_ANNUAL_ID=env("PRO_ANNUAL_ID")
+STRIPE_PROVISIONING_CLIENT = env("STRIPE_PROVISIONING_CLIENT", default="payment.stripe_client.StripeClient")
+STRIPE_PROVISIONING_BATCH_SIZE = 50
+STRIPE_PROVISIONING_MAX_ATTEMPTS = 8
+STRIPE_PROVISIONING_RETRY_DELAY = 30
+STRIPE_PROVISIONING_LEASE_TIMEOUT = 300
+STRIPE_EVENT_MAX_ATTEMPTS = 8
+STRIPE_EVENT_BATCH_SIZE = 100
+STRIPE_EVENT_RETRY_DELAY = 30
+STRIPE_EVENT_LEASE_TIMEOUT = 300
\ No newline at end of file
@@ -39,6 +39,7 @@ urlpatterns = [
     path("", include("tracks.urls"), name="v1"),
     path("", include("investors.urls"), name="v1"),
     path("", include("payment.urls"), name="v1"),
+    path("", include("uploads.urls"), name="v1"),
 ]
 
 if settings.DEBUG:
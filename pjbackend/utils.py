@@ -2,12 +2,8 @@ import stripe
 import random
 import string
 
-from twilio.rest import Client
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To
 
 from django.conf import settings
-from django.core.files.storage import default_storage
 from django.contrib.auth.password_validation import validate_password, ValidationError as PasswordValidationError
 
 
@@ -28,36 +24,29 @@ def generate_verification_code(code_length: int) -> str:
     return "".join([str(random.randint(0, 9)) for x in range(code_length)])
 
 def upload_file_to_s3(file):
-    file_name = default_storage.get_available_name(file.name)
-    
-    file_path = default_storage.save(file_name, file)
-    
-    file_url = default_storage.url(file_path)
-    
-    return file_url
+    """
+    Stores the file under the hash of its content and returns its URL, so
+    re-uploading the same file reuses the stored object.
+    """
+    from uploads.media import store_file
+
+    return store_file(file)
 
 
 def send_email(subject, to_email, content=None, template_id=None, template_vars=None):
-    sg = SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
-    from_email = Email(settings.SENDGRID_EMAIL)
-    to_email = To(to_email)
-    
-    mail = Mail(from_email=from_email, to_emails=to_email, subject=subject)
-    
-    if template_id and template_vars:
-        mail.template_id = template_id
-        print(template_vars)
-        mail.dynamic_template_data = template_vars
-    else:
-        mail.plain_text_content = content
-    
-    try:
-        response = sg.send(mail)
-        print(response.status_code)
-        print(response.body)
-        print(response.headers)
-    except Exception as e:
-        print(e)
+    """
+    Queues the email in the outbox, inside the caller's transaction if any.
+    It is delivered by the process_outbox worker.
+    """
+    from notifications.outbox import enqueue_email
+
+    return enqueue_email(
+        subject=subject,
+        to_email=to_email,
+        content=content,
+        template_id=template_id,
+        template_vars=template_vars
+    )
 
 def send_welcome_email(to_email, name):
     subject="Welcome to PomJuice"
@@ -125,20 +114,24 @@ def startup_profile_shared_email(to_email, name, company_name, shared_by, compan
     }
     send_email(subject=subject, to_email=to_email, template_id=template_id, template_vars=template_vars)
 
+def send_trial_ending_email(to_email, name, company_name, trial_end):
+    subject="Your PomJuice trial is ending soon"
+    content = (
+        f"Hi {name}, the PomJuice trial of {company_name} ends on {trial_end:%B %d, %Y}. "
+        f"Upgrade to Pro at https://{settings.MAIN_DOMAIN} to keep every feature."
+    )
+    send_email(subject=subject, to_email=to_email, content=content)
+
 # Nedd Investor Investment Email ENdpoint
 # Need another email endpoint for the foundersd to get weekly anlaytics
 
 def send_sms(to, body):
-    try:
-        client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-        message = client.messages.create(
-            body=body,
-            from_=settings.TWILIO_PHONE_NUMBER,
-            to=to
-        )
-        return message.sid
-    except Exception as e:
-        print(e)
+    """
+    Queues the SMS in the outbox; it is delivered by the process_outbox worker.
+    """
+    from notifications.outbox import enqueue_sms
+
+    return enqueue_sms(to_number=to, body=body)
 
 
 def cancel_stripe_subscription(stripe_subscription_id):
@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+def lease_due(queryset, due_field, batch_size, lease_timeout, now=None, **changes):
+    """
+    Leases a batch of the rows of `queryset` that are due by `due_field`
+    to this worker in a short transaction, and returns them in the order
+    of the queryset. Rows locked by another worker are skipped, and the
+    leased ones are due again after `lease_timeout` seconds, in case
+    this worker dies before it is done with them. `changes` are saved to
+    the leased rows along with the lease.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(queryset.select_for_update(skip_locked=True, of=('self',)).filter(
+            **{f'{due_field}__lte': now}
+        )[:batch_size])
+        queryset.model.objects.filter(pk__in=[row.pk for row in rows]).update(
+            **{due_field: now + timedelta(seconds=lease_timeout)},
+            **changes
+        )
+    return rows
+
+
+def retry_at(attempts, retry_delay, max_delay=None):
+    """When to retry after `attempts` failures, doubling `retry_delay` each time."""
+    delay = retry_delay * 2 ** (attempts - 1)
+    if max_delay is not None:
+        delay = min(delay, max_delay)
+    return timezone.now() + timedelta(seconds=delay)
+
+
+class WorkerCommand(BaseCommand):
+    """
+    Runs one batch of a worker, or keeps polling for due work with
+    --loop, sleeping --interval seconds after a batch that found none.
+    Subclasses implement `process_batch`, which returns what to report
+    after a batch that processed anything, and something falsy otherwise.
+    """
+    interval = 5
+    loop_help = 'Keep polling for due work'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help=self.loop_help)
+        parser.add_argument('--interval', type=float, default=self.interval, help='Seconds between polls when idle')
+
+    def process_batch(self, batch_size):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        while True:
+            report = self.process_batch(options['batch_size'])
+            if report:
+                self.stdout.write(self.style.SUCCESS(report))
+            if not options['loop']:
+                break
+            if not report:
+                time.sleep(options['interval'])
@@ -7,20 +7,21 @@ from .models import Review
 
 from .serializers import ReviewListSerializer, CreateReviewSerializer
 
+from startups.access import StartupAccessMixin
 from startups.models import Startup
 
 from users.permissions import IsRegistered
 
 logger = logging.getLogger(__name__)
 
-class ReviewListView(generics.GenericAPIView):
+class ReviewListView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = ReviewListSerializer
     permission_classes = [IsRegistered]
 
     def get(self, request, startupId):
         try:
             user = self.request.user
-            startup = Startup.objects.get(id=startupId, main_founder=user,is_active=True)
+            startup = self.get_startup(startupId, main_founder=user, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             review_list = Review.objects.filter(startup=startup, is_active=True)
@@ -0,0 +1,37 @@
+from django.db.models import Exists, OuterRef
+
+from .models import Startup, Founder
+
+
+def startup_access_queryset(user):
+    """
+    Startups annotated with whether the user is one of their confirmed
+    founders, so user_has_access needs no further queries.
+    """
+    return Startup.objects.annotate(
+        is_confirmed_founder=Exists(
+            Founder.objects.filter(startup=OuterRef('pk'), user_id=user.id, is_confirmed=True)
+        ),
+    )
+
+
+class StartupAccessMixin:
+    """
+    Resolves the startup of a startup-scoped view together with the
+    membership of the request user in a single query.
+    """
+
+    def get_startup(self, startup_id, **filters):
+        """
+        Returns the startup matching the filters, memoized on the request.
+        Raises:
+            - Startup.DoesNotExist if no startup matches the filters
+        """
+        resolved = self.request.__dict__.setdefault('_resolved_startups', {})
+        key = (str(startup_id), tuple(sorted((name, str(value)) for name, value in filters.items())))
+        if key not in resolved:
+            user = self.request.user
+            startup = startup_access_queryset(user).get(id=startup_id, **filters)
+            startup.access_user_id = user.id
+            resolved[key] = startup
+        return resolved[key]
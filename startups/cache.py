@@ -0,0 +1,89 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+FOUNDER_PROFILE = 'founder'
+OUTSIDER_PROFILE = 'outsider'
+
+PROFILE_LOCK_TIMEOUT = 10
+PROFILE_LOCK_WAIT = 0.05
+PROFILE_LOCK_RETRIES = 40
+
+
+TAXONOMY = 'startup_taxonomy'
+
+
+def _version_key(name):
+    return f'{name}_version'
+
+
+def get_version(name):
+    """
+    Returns the current version of a cached resource.
+    A missing counter starts from the current timestamp, so an evicted
+    counter never points back to entries cached under an old version.
+    """
+    key = _version_key(name)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(name):
+    """Invalidates everything cached under the current version of a resource."""
+    key = _version_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_profile_version(startup_id):
+    return get_version(f'startup_profile_{startup_id}')
+
+
+def bump_profile_version(startup_id):
+    return bump_version(f'startup_profile_{startup_id}')
+
+
+def profile_etag(startup_id, kind):
+    return f'"{kind}-{startup_id}-{get_profile_version(startup_id)}"'
+
+
+def taxonomy_etag():
+    return f'"{TAXONOMY}-{get_version(TAXONOMY)}"'
+
+
+def get_cached_profile(startup_id, kind, build):
+    """
+    Returns the cached profile of a startup, calling build() on a miss.
+    Only one caller rebuilds a given version at a time; the others wait
+    for its result instead of hitting the database too.
+    """
+    key = f'startup_profile_{kind}_{startup_id}_v{get_profile_version(startup_id)}'
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    lock_key = f'{key}_lock'
+    has_lock = cache.add(lock_key, 1, timeout=PROFILE_LOCK_TIMEOUT)
+    if not has_lock:
+        for _ in range(PROFILE_LOCK_RETRIES):
+            time.sleep(PROFILE_LOCK_WAIT)
+            data = cache.get(key)
+            if data is not None:
+                return data
+
+    try:
+        data = build()
+        cache.set(key, data, timeout=settings.STARTUP_PROFILE_CACHE_TIMEOUT)
+    finally:
+        if has_lock:
+            cache.delete(lock_key)
+    return data
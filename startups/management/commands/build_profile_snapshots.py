@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from startups.models import Startup
+from startups.snapshots import build_profile_snapshot
+
+class Command(BaseCommand):
+    help = 'Build the outsider profile snapshot of every active startup'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Building startup profile snapshots.'))
+        startups = Startup.objects.filter(is_active=True).select_related(
+            'main_founder', 'industry_category', 'tech_sector'
+        )
+        for startup in startups.iterator():
+            build_profile_snapshot(startup)
+            self.stdout.write(self.style.SUCCESS(f'Snapshot for "{startup.name}" built successfully'))
+        self.stdout.write(self.style.SUCCESS('All startup profile snapshots have been built.'))
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:03
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0008_startuptechsector_alter_startup_tech_sector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupProfileSnapshot',
+            fields=[
+                ('startup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_snapshot', serialize=False, to='startups.startup')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0009_startupprofilesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startupimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0010_startupimage_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startupslidedeck',
+            name='manifest_url',
+            field=models.URLField(blank=True, max_length=1000, null=True),
+        ),
+        migrations.AddField(
+            model_name='startupslidedeck',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,8 +1,9 @@
+import re
 import uuid
-import stripe
 from datetime import timedelta
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -17,8 +18,6 @@ max_length_business_model = settings.MAX_LENGTH_CONFIG['business_model']
 max_length_industry = settings.MAX_LENGTH_CONFIG['industry']
 max_length_location = settings.MAX_LENGTH_CONFIG['location']
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 
 class StartupCategory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -127,10 +126,11 @@ class Startup(models.Model):
         return self.name
 
     def user_has_access(self, user):
-        founders = self.founders.filter(is_confirmed=True)
-        founder_ids = [founder.user_id for founder in founders]
-        founder_ids.append(self.main_founder.id)
-        return user.id in founder_ids
+        if self.main_founder_id == user.id:
+            return True
+        if getattr(self, 'access_user_id', None) == user.id:
+            return self.is_confirmed_founder
+        return self.founders.filter(user_id=user.id, is_confirmed=True).exists()
     
     @classmethod
     def create_startup(cls, **kwargs):
@@ -138,14 +138,7 @@ class Startup(models.Model):
         startup = cls.objects.create(**kwargs)
         
         if location:
-            city, state, country = location.split(", ")
-            StartupLocation.objects.create(
-                startup=startup,
-                full_name=location,
-                city_name=city.strip(),
-                state_name=state.strip(),
-                country_name=country.strip()
-            )
+            StartupLocation.objects.create(startup=startup, **StartupLocation.parse_location(location))
         
         Founder.objects.create(
             user=startup.main_founder,
@@ -158,27 +151,12 @@ class Startup(models.Model):
             is_main = True
         )
         
-        stripe_customer = stripe.Customer.create(
-            email=startup.main_founder.email,
-            name=startup.name
-        )
-
-        stripe_trial_subscription = stripe.Subscription.create(
-            customer=stripe_customer['id'],
-            items=[{'price': settings.PRO_ANNUAL_ID}], 
-            trial_period_days=14,
-            metadata={
-                'startup_id': startup.id,
-                'user_id': startup.main_founder.id  
-            }
-        )
-
+        # The Stripe customer and trial are created by the provisioning worker
         Subscription.objects.create(
             startup=startup,
-            stripe_customer_id=stripe_customer['id'],
-            stripe_subscription_id=stripe_trial_subscription['id'],
             stripe_subscription_status=Subscription.TRIAL,
-            stripe_trial_end_date=timezone.now() + timedelta(days=14)
+            stripe_trial_end_date=timezone.now() + timedelta(days=14),
+            provisioning_status=Subscription.PROVISIONING_PENDING
         )
         
         return startup
@@ -189,14 +167,7 @@ class Startup(models.Model):
         startup = cls.objects.create(**kwargs)
         
         if location:
-            city, state, country = location.split(", ")
-            StartupLocation.objects.create(
-                startup=startup,
-                full_name=location,
-                city_name=city.strip(),
-                state_name=state.strip(),
-                country_name=country.strip()
-            )
+            StartupLocation.objects.create(startup=startup, **StartupLocation.parse_location(location))
         
         Founder.objects.create(
             user=startup.main_founder,
@@ -218,6 +189,28 @@ class StartupLocation(models.Model):
     state_name = models.CharField(max_length=max_length_location, blank=True, null=True)
     country_name = models.CharField(max_length=max_length_location, blank=True, null=True)
 
+    # 'City, State, Country'; the groups are the three parts
+    LOCATION_PATTERN = re.compile(r'^([a-zA-ZÀ-ÿ\s-]+),\s([a-zA-ZÀ-ÿ\s-]+),\s([a-zA-Z\s]+)$')
+
+    @classmethod
+    def parse_location(cls, location):
+        """
+        Returns the columns of a location in the 'City, State, Country'
+        format.
+        Raises:
+            - ValueError if the location is not in that format
+        """
+        match = cls.LOCATION_PATTERN.match(location)
+        if not match:
+            raise ValueError("The location must be in the 'City, State, Country' format.")
+        city, state, country = (part.strip() for part in match.groups())
+        return {
+            'full_name': location,
+            'city_name': city,
+            'state_name': state,
+            'country_name': country,
+        }
+
 class StartupVideo(models.Model):
     startup = models.ForeignKey(Startup, on_delete=models.PROTECT, related_name="video")
     url = models.URLField()
@@ -227,6 +220,7 @@ class StartupImage(models.Model):
     startup = models.ForeignKey(Startup, on_delete=models.PROTECT, related_name="image")
     url = models.URLField()
     is_active = models.BooleanField(default=True)
+    variants = models.JSONField(default=dict, blank=True)
 
 class StartupSlidedeck(models.Model):
     startup = models.ForeignKey(
@@ -234,6 +228,8 @@ class StartupSlidedeck(models.Model):
     )
     url = models.URLField()
     is_active = models.BooleanField(default=True)
+    page_count = models.PositiveIntegerField(blank=True, null=True)
+    manifest_url = models.URLField(max_length=1000, blank=True, null=True)
 
 class StartupBusinessTraction(models.Model):
     PRODUCT_SALES = "product_sales"
@@ -352,4 +348,22 @@ class PrivateVisitor(models.Model):
     objects = PrivateVisitorManager()
     
     def __str__(self):
-        return f"Startup ->{self.startup.name}, Private Visitor -> {self.email}"    
\ No newline at end of file
+        return f"Startup ->{self.startup.name}, Private Visitor -> {self.email}"
+
+
+class StartupProfileSnapshot(models.Model):
+    """
+    Rendered outsider view of a startup, rebuilt whenever the data it is
+    made of changes so shared links are served with a single fetch.
+    """
+    startup = models.OneToOneField(
+        Startup,
+        related_name="profile_snapshot",
+        on_delete=models.CASCADE,
+        primary_key=True
+    )
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Startup ->{self.startup_id}, Snapshot -> {self.updated_at}"
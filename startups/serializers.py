@@ -1,7 +1,7 @@
-import re
 from rest_framework import serializers
 
 from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch
 
 from investors.serializers import InvestmentRoundSerializer
 
@@ -30,6 +30,23 @@ max_length_industry = settings.MAX_LENGTH_CONFIG['industry']
 max_length_location = settings.MAX_LENGTH_CONFIG['location']
 max_length_url = settings.MAX_LENGTH_CONFIG['url']
 
+def _prefetched(obj, attr, queryset):
+    """Returns the list prefetched into ``attr`` or falls back to ``queryset``."""
+    prefetched = getattr(obj, attr, None)
+    return queryset if prefetched is None else prefetched
+
+def _pitch_deck_manifest(pitch_deck):
+    """Page count and slide manifest URL of a rasterized deck, or None."""
+    if pitch_deck is None or not pitch_deck.manifest_url:
+        return None
+    return {'pageCount': pitch_deck.page_count, 'url': pitch_deck.manifest_url}
+
+def _business_traction(obj):
+    try:
+        return obj.business_tractions
+    except StartupBusinessTraction.DoesNotExist:
+        return None
+
 class StartupVideoSerializer(serializers.ModelSerializer):
     class Meta:
         model = StartupVideo
@@ -106,6 +123,7 @@ class FounderSerializer(serializers.ModelSerializer):
     firstName = serializers.SerializerMethodField(method_name="get_firstName")
     lastName = serializers.SerializerMethodField(method_name="get_lastName")
     pictureUrl = serializers.SerializerMethodField(method_name="get_pictureUrl")
+    pictureUrls = serializers.SerializerMethodField(method_name="get_pictureUrls")
     isConfirmed = serializers.BooleanField(source="is_confirmed")
     isMain = serializers.BooleanField(source="is_main")
     
@@ -117,6 +135,9 @@ class FounderSerializer(serializers.ModelSerializer):
     
     def get_pictureUrl(self, obj):
         return None if not obj.user else obj.user.picture_url
+
+    def get_pictureUrls(self, obj):
+        return {} if not obj.user else obj.user.picture_variants
     
     class Meta:
         model = Founder
@@ -125,6 +146,7 @@ class FounderSerializer(serializers.ModelSerializer):
             'firstName',
             'lastName',
             'pictureUrl',
+            'pictureUrls',
             'role',
             'email',
             'isConfirmed',
@@ -158,12 +180,14 @@ class StartupSerializer(serializers.ModelSerializer):
     mainFunder = serializers.SerializerMethodField(method_name="get_mainFunder")
     videoUrl = serializers.SerializerMethodField(method_name="get_videoUrl")
     imageUrl = serializers.SerializerMethodField(method_name="get_imageUrl")
+    imageUrls = serializers.SerializerMethodField(method_name="get_imageUrls")
     businessTractions = serializers.SerializerMethodField(method_name="get_businessTractions")
     founders = serializers.SerializerMethodField(method_name="get_founders")
     websiteUrl = serializers.URLField(source="website_url")
     employeeCount = serializers.URLField(source="employee_count")
     hasInvestors = serializers.SerializerMethodField(method_name="get_investors")
     pitchDeckUrl = serializers.SerializerMethodField(method_name="get_pitchDeckUrl")
+    pitchDeckManifest = serializers.SerializerMethodField(method_name="get_pitchDeckManifest")
     location = serializers.SerializerMethodField(method_name="get_location")
     foundationDate = serializers.DateField(source="foundation_date")
     isPublic = serializers.BooleanField(source="is_public")
@@ -171,9 +195,40 @@ class StartupSerializer(serializers.ModelSerializer):
     industry = serializers.SerializerMethodField(method_name="get_industry")
     techSector = serializers.SerializerMethodField(method_name="get_techSector")
     plan = serializers.SerializerMethodField(method_name="get_plan")
+    billingStatus = serializers.SerializerMethodField(method_name="get_billingStatus")
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Attach the joins and prefetches needed to render a full profile,
+        so serializing a startup costs a fixed number of queries.
+        """
+        return queryset.select_related(
+            'main_founder',
+            'industry_category',
+            'tech_sector',
+            'business_tractions',
+        ).prefetch_related(
+            'location',
+            'business_tractions__top_customers',
+            Prefetch(
+                'founders',
+                queryset=Founder.objects.select_related('user').order_by('created_at'),
+                to_attr='ordered_founders'
+            ),
+            Prefetch('video', queryset=StartupVideo.objects.filter(is_active=True), to_attr='active_videos'),
+            Prefetch('image', queryset=StartupImage.objects.filter(is_active=True), to_attr='active_images'),
+            Prefetch('slidedeck', queryset=StartupSlidedeck.objects.filter(is_active=True), to_attr='active_slidedecks'),
+            Prefetch('subscription_set', to_attr='subscriptions'),
+        ).annotate(
+            has_investors=Exists(InvestmentRound.objects.filter(startup=OuterRef('pk')))
+        )
 
     def get_founders(self,obj):
-        co_founders = Founder.objects.filter(startup_id=obj.id).order_by('created_at')
+        co_founders = _prefetched(
+            obj, 'ordered_founders',
+            Founder.objects.filter(startup_id=obj.id).select_related('user').order_by('created_at')
+        )
         list_founder = FounderSerializer(co_founders,many=True).data
         return list_founder
         
@@ -182,48 +237,58 @@ class StartupSerializer(serializers.ModelSerializer):
         return user_serializer.data
     
     def get_videoUrl(self, obj):
-        video = StartupVideo.objects.filter(startup = obj, is_active=True)
+        video = _prefetched(obj, 'active_videos', StartupVideo.objects.filter(startup=obj, is_active=True))
         if video:
             return video[0].url
         else:
             return None
         
     def get_imageUrl(self, obj):
-        image = StartupImage.objects.filter(startup=obj, is_active=True)
+        image = _prefetched(obj, 'active_images', StartupImage.objects.filter(startup=obj, is_active=True))
         if image:
             return image[0].url
         else:
             return None
+
+    def get_imageUrls(self, obj):
+        image = _prefetched(obj, 'active_images', StartupImage.objects.filter(startup=obj, is_active=True))
+        return image[0].variants if image else {}
     
     def get_location(self, obj):
-        location = StartupLocation.objects.get(startup=obj)
+        location = list(obj.location.all())
         if location:
-            return location.full_name
+            return location[0].full_name
     
     def get_businessTractions(self, obj):
-        business_traction = StartupBusinessTraction.objects.filter(startup=obj)
+        business_traction = _business_traction(obj)
         if business_traction:
-            business_tractions_serializer = StartupBusinessTractionSerializer(business_traction[0])
+            business_tractions_serializer = StartupBusinessTractionSerializer(business_traction)
             return business_tractions_serializer.data
         else:
             None
     
     def get_investors(self, obj):
-        return InvestmentRound.objects.filter(startup=obj).exists()
+        has_investors = getattr(obj, 'has_investors', None)
+        if has_investors is None:
+            has_investors = InvestmentRound.objects.filter(startup=obj).exists()
+        return has_investors
     
     def get_pitchDeckUrl(self, obj):
-        pitch_deck = StartupSlidedeck.objects.filter(startup=obj, is_active=True)
+        pitch_deck = _prefetched(obj, 'active_slidedecks', StartupSlidedeck.objects.filter(startup=obj, is_active=True))
         if pitch_deck:
             return pitch_deck[0].url
         else:
             return None
+
+    def get_pitchDeckManifest(self, obj):
+        pitch_deck = _prefetched(obj, 'active_slidedecks', StartupSlidedeck.objects.filter(startup=obj, is_active=True))
+        return _pitch_deck_manifest(pitch_deck[0] if pitch_deck else None)
     
     def get_isAbleToShare(self, obj):
-        investors = self.get_investors(obj)
-        business_tractions= self.get_businessTractions(obj)
+        business_traction = _business_traction(obj)
         pitch_deck_url = self.get_pitchDeckUrl(obj)
         is_able_share = False
-        if investors is not None and business_tractions is not None  and pitch_deck_url is not None and obj.description is not None :
+        if business_traction is not None and pitch_deck_url is not None and obj.description is not None:
             is_able_share = True
         return is_able_share
     
@@ -240,11 +305,17 @@ class StartupSerializer(serializers.ModelSerializer):
             return None
     
     def get_plan(self, obj):
-        subscription = Subscription.objects.filter(startup=obj).first()
-        if subscription:
-            return subscription.stripe_subscription_status
+        subscriptions = _prefetched(obj, 'subscriptions', Subscription.objects.filter(startup=obj)[:1])
+        if subscriptions:
+            return subscriptions[0].stripe_subscription_status
 
         return Subscription.BASIC
+
+    def get_billingStatus(self, obj):
+        subscriptions = _prefetched(obj, 'subscriptions', Subscription.objects.filter(startup=obj)[:1])
+        if subscriptions:
+            return subscriptions[0].provisioning_status
+        return None
         
     class Meta:
         model = Startup
@@ -264,11 +335,14 @@ class StartupSerializer(serializers.ModelSerializer):
             'websiteUrl',
             'videoUrl',
             'imageUrl',
+            'imageUrls',
             'hasInvestors',
             'pitchDeckUrl',
+            'pitchDeckManifest',
             'isPublic',
             'isAbleToShare',
             'plan',
+            'billingStatus',
             ]
 
 class StartupSmallSerializer(serializers.ModelSerializer):
@@ -288,8 +362,7 @@ class CreateStartupSerializer(serializers.Serializer):
     websiteUrl = serializers.CharField(max_length=max_length_url, allow_blank=True, required = False)
     
     def validate_location(self, value):
-        pattern = r'^[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-Z\s]+$'
-        if not re.match(pattern, value):
+        if not StartupLocation.LOCATION_PATTERN.match(value):
             raise serializers.ValidationError("The location must be in the 'City, State, Country' format.")
         return value
     
@@ -310,8 +383,7 @@ class EditStartupLocationSerializer(serializers.Serializer):
     location  = serializers.CharField(max_length = max_length_location, allow_blank= False, required = True)
     
     def validate_location(self, value):
-        pattern = r'^[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-Z\s]+$'
-        if not re.match(pattern, value):
+        if not StartupLocation.LOCATION_PATTERN.match(value):
             raise serializers.ValidationError("The location must be in the 'City, State, Country' format.")
         return value
 
@@ -340,8 +412,7 @@ class EditStartupSerializer(serializers.Serializer):
     websiteUrl = serializers.URLField(max_length=max_length_url,required=False, allow_blank=True)
     
     def validate_location(self, value):
-        pattern = r'^[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-ZÀ-ÿ\s-]+,\s[a-zA-Z\s]+$'
-        if not re.match(pattern, value):
+        if not StartupLocation.LOCATION_PATTERN.match(value):
             raise serializers.ValidationError("The location must be in the 'City, State, Country' format.")
         return value
     
@@ -356,6 +427,60 @@ class EditStartupSerializer(serializers.Serializer):
         return value
 
 
+class PatchStartupSerializer(serializers.Serializer):
+    """Any subset of the editable startup profile fields."""
+    FIELD_COLUMNS = {
+        'name': 'name',
+        'description': 'description',
+        'industry': 'industry_category_id',
+        'techSector': 'tech_sector_id',
+        'foundationDate': 'foundation_date',
+        'employeeCount': 'employee_count',
+        'stage': 'stage',
+        'websiteUrl': 'website_url',
+        'isPrivacy': 'is_public',
+    }
+
+    name = serializers.CharField(max_length=max_length_name, required=False, allow_blank=False)
+    description = serializers.CharField(max_length=max_length_description, required=False, allow_blank=False)
+    location = serializers.CharField(max_length=max_length_location, required=False, allow_blank=False)
+    industry = serializers.CharField(max_length=max_length_industry, required=False, allow_blank=False)
+    techSector = serializers.CharField(max_length=max_length_industry, required=False, allow_blank=False)
+    foundationDate = serializers.DateField(required=False)
+    employeeCount = serializers.ChoiceField(choices=Startup.EMPLOYEE_COUNT_CHOICE, required=False)
+    stage = serializers.ChoiceField(choices=Startup.STAGE_CHOICE, required=False)
+    websiteUrl = serializers.URLField(max_length=max_length_url, required=False, allow_blank=False)
+    isPrivacy = serializers.BooleanField(required=False)
+
+    def validate_location(self, value):
+        if not StartupLocation.LOCATION_PATTERN.match(value):
+            raise serializers.ValidationError("The location must be in the 'City, State, Country' format.")
+        return value
+
+    def validate_industry(self, value):
+        if not StartupSubcategory.objects.filter(id=value):
+            raise serializers.ValidationError("Invalid industry")
+        return value
+
+    def validate_techSector(self, value):
+        if not StartupTechSector.objects.filter(id=value):
+            raise serializers.ValidationError("Invalid Tech Sector")
+        return value
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("At least one field must be provided")
+        return data
+
+    def get_columns(self):
+        """Maps the validated fields to Startup column names."""
+        return {
+            self.FIELD_COLUMNS[field]: value
+            for field, value in self.validated_data.items()
+            if field in self.FIELD_COLUMNS
+        }
+
+
 class EditStartupWebsiteSerializer(serializers.Serializer):
     websiteUrl = serializers.URLField(max_length=max_length_url, required=True, allow_blank=False)
 
@@ -419,12 +544,14 @@ class DetailedOutsiderStartupViewerSerializer(serializers.ModelSerializer):
     mainFunder = serializers.SerializerMethodField(method_name="get_mainFunder")
     videoUrl = serializers.SerializerMethodField(method_name="get_videoUrl")
     imageUrl = serializers.SerializerMethodField(method_name="get_imageUrl")
+    imageUrls = serializers.SerializerMethodField(method_name="get_imageUrls")
     businessTractions = serializers.SerializerMethodField(method_name="get_businessTractions")
     founders = serializers.SerializerMethodField(method_name="get_founders")
     websiteUrl = serializers.URLField(source="website_url")
     employeeCount = serializers.URLField(source="employee_count")
     foundationDate = serializers.DateField(source="foundation_date")
     pitchDeckUrl = serializers.SerializerMethodField(method_name="get_pitchDeckUrl")
+    pitchDeckManifest = serializers.SerializerMethodField(method_name="get_pitchDeckManifest")
     InvestmentRounds = serializers.SerializerMethodField(method_name="get_list_investment_rounds")
     location = serializers.SerializerMethodField(method_name="get_location")
     industry = serializers.SerializerMethodField(method_name="get_industry")
@@ -458,6 +585,10 @@ class DetailedOutsiderStartupViewerSerializer(serializers.ModelSerializer):
             return image[0].url
         else:
             return None
+
+    def get_imageUrls(self, obj):
+        image = StartupImage.objects.filter(startup=obj, is_active=True).first()
+        return image.variants if image else {}
     
     def get_businessTractions(self, obj):
         business_traction = StartupBusinessTraction.objects.filter(startup=obj)
@@ -476,11 +607,14 @@ class DetailedOutsiderStartupViewerSerializer(serializers.ModelSerializer):
             return pitch_deck[0].url
         else:
             return None
+
+    def get_pitchDeckManifest(self, obj):
+        return _pitch_deck_manifest(StartupSlidedeck.objects.filter(startup=obj, is_active=True).first())
     
     def get_location(self, obj):
-        location = StartupLocation.objects.get(startup=obj)
+        location = list(obj.location.all())
         if location:
-            return location.full_name
+            return location[0].full_name
     
     def get_industry(self, obj):
         if obj.industry_category:
@@ -511,7 +645,9 @@ class DetailedOutsiderStartupViewerSerializer(serializers.ModelSerializer):
             'websiteUrl',
             'videoUrl',
             'imageUrl',
+            'imageUrls',
             'pitchDeckUrl',
+            'pitchDeckManifest',
             'InvestmentRounds',
             'location',
             'techSector'
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from investors.models import InvestmentRound, InvestorUser
+from payment.models import Subscription
+from users.models import Experience
+
+from .cache import TAXONOMY, bump_version
+from .models import (
+    Startup,
+    StartupCategory,
+    StartupSubcategory,
+    StartupTechSector,
+    StartupImage,
+    StartupVideo,
+    StartupSlidedeck,
+    StartupLocation,
+    StartupBusinessTraction,
+    StartupTopCustomer,
+    Founder
+)
+from .snapshots import schedule_profile_snapshot, schedule_user_profile_snapshots
+
+STARTUP_PROFILE_MODELS = (
+    StartupImage,
+    StartupVideo,
+    StartupSlidedeck,
+    StartupLocation,
+    StartupBusinessTraction,
+    StartupTopCustomer,
+    Founder,
+    InvestmentRound,
+    Subscription,
+)
+
+
+@receiver(post_save, sender=Startup)
+def startup_saved(sender, instance, **kwargs):
+    schedule_profile_snapshot(instance.id)
+
+
+def startup_profile_changed(sender, instance, **kwargs):
+    schedule_profile_snapshot(instance.startup_id)
+
+
+for model in STARTUP_PROFILE_MODELS:
+    post_save.connect(startup_profile_changed, sender=model)
+    post_delete.connect(startup_profile_changed, sender=model)
+
+
+@receiver([post_save, post_delete], sender=InvestorUser)
+def investor_changed(sender, instance, **kwargs):
+    schedule_profile_snapshot(instance.round.startup_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    schedule_user_profile_snapshots(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Experience)
+def experience_changed(sender, instance, **kwargs):
+    schedule_user_profile_snapshots(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=StartupCategory)
+@receiver([post_save, post_delete], sender=StartupSubcategory)
+@receiver([post_save, post_delete], sender=StartupTechSector)
+def taxonomy_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(TAXONOMY))
@@ -0,0 +1,81 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+
+from .cache import OUTSIDER_PROFILE, bump_profile_version, get_cached_profile
+from .models import Startup, StartupProfileSnapshot
+from .serializers import DetailedOutsiderStartupViewerSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def build_profile_snapshot(startup):
+    """Renders the outsider view of a startup and stores it as its snapshot."""
+    data = DetailedOutsiderStartupViewerSerializer(startup).data
+    StartupProfileSnapshot.objects.update_or_create(startup=startup, defaults={'data': data})
+    return data
+
+
+def rebuild_profile_snapshot(startup_id):
+    try:
+        startup = Startup.objects.select_related(
+            'main_founder', 'industry_category', 'tech_sector'
+        ).get(id=startup_id)
+        build_profile_snapshot(startup)
+    except Startup.DoesNotExist:
+        pass
+    except Exception as e:
+        logger.error('Error rebuilding profile snapshot for startup %s: %s', startup_id, e)
+        # Readers build it again instead of caching the outdated one
+        StartupProfileSnapshot.objects.filter(startup_id=startup_id).delete()
+
+
+def refresh_profile(startup_id):
+    """
+    Rebuilds the snapshot, then moves the cached profiles to a new
+    version. A reader missing the new version finds the new snapshot,
+    while until the bump readers keep getting the previous version.
+    """
+    rebuild_profile_snapshot(startup_id)
+    bump_profile_version(startup_id)
+
+
+def schedule_profile_snapshot(startup_id):
+    """
+    Invalidates the cached profiles and rebuilds the snapshot of a startup
+    once the current transaction commits.
+    """
+    if startup_id is None:
+        return
+    transaction.on_commit(lambda: refresh_profile(startup_id))
+
+
+def schedule_user_profile_snapshots(user_id):
+    """Rebuilds the snapshots of every startup the user is a founder of."""
+    startup_ids = Startup.objects.filter(
+        Q(main_founder_id=user_id) | Q(founders__user_id=user_id)
+    ).values_list('id', flat=True).distinct()
+    for startup_id in startup_ids:
+        schedule_profile_snapshot(startup_id)
+
+
+def load_profile_snapshot(startup):
+    """Returns the stored snapshot of a startup, building it when missing."""
+    snapshot = StartupProfileSnapshot.objects.filter(startup=startup).first()
+    if snapshot:
+        return snapshot.data
+    return build_profile_snapshot(startup)
+
+
+def get_profile_snapshot(startup_id, **filters):
+    """
+    Returns the startup and its rendered outsider view.
+    The filters are applied to the startup and the view is served from the
+    cache, falling back to the stored snapshot.
+    Raises:
+        - Startup.DoesNotExist if no startup matches the filters
+    """
+    startup = Startup.objects.get(id=startup_id, **filters)
+    data = get_cached_profile(startup.id, OUTSIDER_PROFILE, lambda: load_profile_snapshot(startup))
+    return startup, data
@@ -0,0 +1,61 @@
+import pytest
+
+from rest_framework.test import APIRequestFactory
+
+from startups.access import StartupAccessMixin, startup_access_queryset
+from startups.models import Startup
+
+from users.tests.fixtures import common_user_token
+from .fixtures import common_startup, common_secondary_startup, common_third_startup
+
+main_user_token = common_user_token
+main_startup = common_startup
+secondary_startup = common_secondary_startup
+third_startup = common_third_startup
+
+
+def _view_for(user):
+    request = APIRequestFactory().get("/")
+    request.user = user
+    view = StartupAccessMixin()
+    view.request = request
+    return view
+
+
+@pytest.mark.django_db
+def test_access_resolved_in_a_single_query(main_user_token, third_startup, django_assert_num_queries):
+    user = main_user_token.get("user")
+    view = _view_for(user)
+
+    with django_assert_num_queries(1):
+        startup = view.get_startup(third_startup.id, is_active=True)
+        assert startup.user_has_access(user)
+        assert view.get_startup(third_startup.id, is_active=True) is startup
+
+
+@pytest.mark.django_db
+def test_access_denied_to_non_founders(main_user_token, secondary_startup, django_assert_num_queries):
+    user = main_user_token.get("user")
+
+    with django_assert_num_queries(1):
+        startup = _view_for(user).get_startup(secondary_startup.id, is_active=True)
+        assert not startup.user_has_access(user)
+
+
+@pytest.mark.django_db
+def test_access_for_main_founder(main_user_token, secondary_startup):
+    user = main_user_token.get("secondary_user")
+    startup = startup_access_queryset(user).get(id=secondary_startup.id)
+
+    assert startup.user_has_access(user)
+    assert not startup.user_has_access(main_user_token.get("user"))
+
+
+@pytest.mark.django_db
+def test_missing_startup_raises(main_user_token, main_startup):
+    view = _view_for(main_user_token.get("user"))
+    main_startup.is_active = False
+    main_startup.save()
+
+    with pytest.raises(Startup.DoesNotExist):
+        view.get_startup(main_startup.id, is_active=True)
@@ -0,0 +1,129 @@
+import pytest
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from users.tests.fixtures import common_user_token
+from .fixtures import common_startup
+
+from startups.cache import (
+    FOUNDER_PROFILE,
+    bump_profile_version,
+    get_cached_profile,
+    get_profile_version,
+)
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_cached_profile_built_once():
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"name": "Cached"}
+
+    assert get_cached_profile("startup", FOUNDER_PROFILE, build) == {"name": "Cached"}
+    assert get_cached_profile("startup", FOUNDER_PROFILE, build) == {"name": "Cached"}
+    assert len(calls) == 1
+
+
+def test_bump_version_invalidates_cached_profile():
+    get_cached_profile("startup", FOUNDER_PROFILE, lambda: {"name": "Old"})
+    version = get_profile_version("startup")
+
+    assert bump_profile_version("startup") == version + 1
+    assert get_cached_profile("startup", FOUNDER_PROFILE, lambda: {"name": "New"}) == {"name": "New"}
+
+
+def test_bump_version_without_counter():
+    assert bump_profile_version("startup") == get_profile_version("startup")
+
+
+def test_waits_for_profile_being_rebuilt(mocker):
+    version = get_profile_version("startup")
+    key = f"startup_profile_{FOUNDER_PROFILE}_startup_v{version}"
+    cache.add(f"{key}_lock", 1)
+
+    def other_builder_finishes(seconds):
+        cache.set(key, {"name": "Built by other request"})
+
+    mocker.patch("startups.cache.time.sleep", side_effect=other_builder_finishes)
+    build = mocker.Mock(return_value={"name": "Built twice"})
+
+    assert get_cached_profile("startup", FOUNDER_PROFILE, build) == {"name": "Built by other request"}
+    build.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_startup_view_served_from_cache(main_user_token, main_startup, django_assert_max_num_queries):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    url = reverse("startup")
+
+    first_response = client.get(url)
+    with django_assert_max_num_queries(4):
+        second_response = client.get(url)
+
+    assert second_response.status_code == status.HTTP_200_OK
+    assert second_response.json() == first_response.json()
+
+
+@pytest.mark.django_db
+def test_edit_invalidates_cached_profile(main_user_token, main_startup, django_capture_on_commit_callbacks):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    client.get(reverse("startup"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        url = reverse("startup-edit-name", kwargs={"startupId": main_startup.id})
+        response = client.put(url, data={"name": "Renamed Startup"})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(reverse("startup"))
+    assert response.json()["name"] == "Renamed Startup"
+
+
+@pytest.mark.django_db
+def test_startup_view_not_modified(main_user_token, main_startup, django_capture_on_commit_callbacks):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    url = reverse("startup")
+
+    etag = client.get(url)["ETag"]
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        main_startup.name = "Renamed Startup"
+        main_startup.save()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_category_view_long_lived_and_not_modified(main_user_token, main_startup):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    url = reverse("startup-categories")
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert "max-age=86400" in response["Cache-Control"]
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
@@ -0,0 +1,61 @@
+import pytest
+
+from django.contrib.auth import get_user_model
+
+from startups.models import Startup, StartupImage, Founder
+from startups.serializers import StartupSerializer
+from payment.models import Subscription
+
+from users.tests.fixtures import common_user_token
+from .fixtures import common_startup
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+STARTUP_PROFILE_QUERIES = 8
+
+
+def _add_founders(startup, quantity):
+    User = get_user_model()
+    for i in range(quantity):
+        user = User.objects.create(
+            email=f"cofounder{i}@example.com",
+            username=f"cofounder{i}",
+            phone_number="+15555555550",
+            first_name=f"Cofounder{i}",
+            is_registered=True
+        )
+        Founder.objects.create(user=user, startup=startup, is_confirmed=True)
+
+
+@pytest.mark.django_db
+def test_startup_serializer_eager_loading_matches_plain_output(main_startup):
+    plain_data = StartupSerializer(Startup.objects.get(id=main_startup.id)).data
+
+    startup = StartupSerializer.setup_eager_loading(Startup.objects).get(id=main_startup.id)
+    eager_data = StartupSerializer(startup).data
+
+    assert eager_data == plain_data
+
+
+@pytest.mark.django_db
+def test_startup_serializer_constant_number_of_queries(main_startup, django_assert_num_queries):
+    with django_assert_num_queries(STARTUP_PROFILE_QUERIES):
+        startup = StartupSerializer.setup_eager_loading(Startup.objects).get(id=main_startup.id)
+        StartupSerializer(startup).data
+
+    _add_founders(main_startup, 5)
+    StartupImage.objects.create(startup=main_startup, url="https://example.com/old.jpg", is_active=False)
+    Subscription.objects.create(
+        startup=main_startup,
+        stripe_subscription_status=Subscription.PRO,
+        stripe_trial_end_date="2030-01-01T00:00:00Z"
+    )
+
+    with django_assert_num_queries(STARTUP_PROFILE_QUERIES):
+        startup = StartupSerializer.setup_eager_loading(Startup.objects).get(id=main_startup.id)
+        data = StartupSerializer(startup).data
+
+    assert len(data["founders"]) == 7
+    assert data["plan"] == Subscription.PRO
+    assert data["isAbleToShare"] is True
@@ -0,0 +1,110 @@
+import pytest
+import uuid
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.urls import reverse
+
+from users.tests.fixtures import common_user_token
+from users.models import Experience
+from .fixtures import common_startup
+
+from startups.models import Startup, StartupProfileSnapshot, StartupImage, PublicVisitor
+from startups.snapshots import build_profile_snapshot, get_profile_snapshot
+from investors.models import InvestmentRound
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.mark.django_db
+def test_snapshot_built_on_first_read(main_startup):
+    assert not StartupProfileSnapshot.objects.filter(startup=main_startup).exists()
+
+    startup, profile = get_profile_snapshot(main_startup.id, is_active=True)
+
+    assert startup == main_startup
+    assert profile["name"] == main_startup.name
+    assert StartupProfileSnapshot.objects.get(startup=main_startup).data == profile
+
+
+@pytest.mark.django_db
+def test_snapshot_read_is_a_single_query(main_startup, django_assert_num_queries):
+    get_profile_snapshot(main_startup.id, is_active=True)
+
+    with django_assert_num_queries(1):
+        startup, profile = get_profile_snapshot(main_startup.id, is_active=True)
+
+    assert profile["imageUrl"] == StartupImage.objects.get(startup=main_startup, is_active=True).url
+
+
+@pytest.mark.django_db
+def test_snapshot_respects_startup_filters(main_startup):
+    get_profile_snapshot(main_startup.id, is_active=True)
+
+    with pytest.raises(Startup.DoesNotExist):
+        get_profile_snapshot(main_startup.id, is_active=True, is_public=True)
+
+
+@pytest.mark.django_db
+def test_snapshot_rebuilt_on_startup_change(main_startup, django_capture_on_commit_callbacks):
+    get_profile_snapshot(main_startup.id, is_active=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        main_startup.name = "Renamed Startup"
+        main_startup.save()
+
+    assert StartupProfileSnapshot.objects.get(startup=main_startup).data["name"] == "Renamed Startup"
+
+
+@pytest.mark.django_db
+def test_profile_version_bumped_after_rebuild(main_startup, mocker, django_capture_on_commit_callbacks):
+    get_profile_snapshot(main_startup.id, is_active=True)
+    names = []
+    mocker.patch(
+        "startups.snapshots.bump_profile_version",
+        side_effect=lambda startup_id: names.append(StartupProfileSnapshot.objects.get(startup_id=startup_id).data["name"])
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        main_startup.name = "Renamed Startup"
+        main_startup.save()
+
+    assert names == ["Renamed Startup"]
+
+
+@pytest.mark.django_db
+def test_snapshot_rebuilt_on_related_changes(main_user_token, main_startup, django_capture_on_commit_callbacks):
+    get_profile_snapshot(main_startup.id, is_active=True)
+    user = main_user_token.get("user")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        StartupImage.objects.filter(startup=main_startup, is_active=True).update(is_active=False)
+        StartupImage.objects.create(startup=main_startup, url="https://example.com/new.jpg", is_active=True)
+        InvestmentRound.objects.create(startup=main_startup, round_type="Seed", amount=1000, raised_amount=500)
+        Experience.objects.create(user=user, title="CEO", company="PomJuice")
+
+    data = StartupProfileSnapshot.objects.get(startup=main_startup).data
+    assert data["imageUrl"] == "https://example.com/new.jpg"
+    assert len(data["InvestmentRounds"]) == 1
+    main_founder = next(founder for founder in data["founders"] if founder.get("email") == user.email)
+    assert main_founder["experiences"][0]["title"] == "CEO"
+
+
+@pytest.mark.django_db
+def test_public_view_served_from_snapshot(main_startup):
+    main_startup.is_public = True
+    main_startup.save()
+    build_profile_snapshot(main_startup)
+    StartupProfileSnapshot.objects.filter(startup=main_startup).update(data={"name": "From Snapshot"})
+
+    device_id = uuid.uuid4().int
+    PublicVisitor.objects.create(device_id=device_id, startup=main_startup)
+
+    client = APIClient()
+    url = reverse("check-public-visitor", kwargs={"startupId": main_startup.id})
+    response = client.get(url, HTTP_X_DEVICE_ID=device_id)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"name": "From Snapshot"}
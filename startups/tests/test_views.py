@@ -10,6 +10,8 @@ from unittest.mock import MagicMock,patch
 
 from pjbackend.constants import INDUSTRIES_CATEGORIES, INDUSTRIES_SUBCATEGORIES
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from users.tests.fixtures import (
@@ -2579,6 +2581,83 @@ def test_edit_startup_privacy_anonymous_user(main_startup):
     response = client.put(url, data = payload)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+# ========================================================
+# ================= PATCH STARTUP PROFILE ================
+# ========================================================
+
+@pytest.mark.django_db
+def test_patch_startup_profile_success(main_user_token, main_startup):
+    token = main_user_token.get("token")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + token)
+
+    payload = {
+        "name": TEST_STARTUP_DATA["startup_name"],
+        "stage": TEST_STARTUP_DATA["startup_new_stage"],
+        "isPrivacy": True,
+        "location": TEST_STARTUP_DATA["startup_new_location"],
+    }
+    url = reverse("startup-edit", kwargs={"startupId": main_startup.id})
+    with CaptureQueriesContext(connection) as queries:
+        response = client.patch(url, data=payload, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    updates = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+    assert len(updates) == 2
+    assert "description" not in updates[0]
+
+    startup = Startup.objects.get(id=main_startup.id)
+    assert startup.name == TEST_STARTUP_DATA["startup_name"]
+    assert startup.stage == TEST_STARTUP_DATA["startup_new_stage"]
+    assert startup.is_public is True
+    assert startup.description == main_startup.description
+    location = StartupLocation.objects.get(startup=main_startup)
+    assert location.full_name == TEST_STARTUP_DATA["startup_new_location"]
+    assert location.city_name == "Hoover"
+
+@pytest.mark.django_db
+def test_patch_startup_profile_empty_payload(main_user_token, main_startup):
+    token = main_user_token.get("token")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + token)
+
+    url = reverse("startup-edit", kwargs={"startupId": main_startup.id})
+    response = client.patch(url, data={}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_patch_startup_profile_location_with_other_whitespace(main_user_token, main_startup):
+    token = main_user_token.get("token")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + token)
+
+    url = reverse("startup-edit", kwargs={"startupId": main_startup.id})
+    response = client.patch(url, data={"location": "Hoover,\tAlabama,\tUnited States"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+
+    location = StartupLocation.objects.get(startup=main_startup)
+    assert (location.city_name, location.state_name, location.country_name) == ("Hoover", "Alabama", "United States")
+
+@pytest.mark.django_db
+def test_patch_startup_profile_invalid_location(main_user_token, main_startup):
+    token = main_user_token.get("token")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + token)
+
+    url = reverse("startup-edit", kwargs={"startupId": main_startup.id})
+    response = client.patch(url, data={"location": "Hoover"}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_patch_startup_profile_without_access(main_user_token, second_startup):
+    token = main_user_token.get("token")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + token)
+
+    url = reverse("startup-edit", kwargs={"startupId": second_startup.id})
+    response = client.patch(url, data={"name": TEST_STARTUP_DATA["startup_name"]}, format="json")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
 # ========================================================
 # ============ GET CATEGORY INDUSTRIE LIST ===============
 # ========================================================
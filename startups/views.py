@@ -1,8 +1,11 @@
 import logging
 
+from django.conf import settings
 from django.db import transaction
 from django.urls import reverse
 from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from dotenv import load_dotenv
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -25,7 +28,6 @@ from .models import (
 )
 from payment.models import Subscription
 from .serializers import (
-    DetailedOutsiderStartupViewerSerializer,
     StartupSerializer,
     StartupTechSectorSerializer,
     StartupSubcategorySerializer,
@@ -37,6 +39,7 @@ from .serializers import (
     EditStartupLocationSerializer,
     EditStartupNameSerializer,
     EditStartupSerializer,
+    PatchStartupSerializer,
     EditStartupStageSerializer,
     EditStartupWebsiteSerializer,
     EditStartupFoundationDateSerializer,
@@ -53,21 +56,43 @@ from .serializers import (
     StartupBusinessTractionCreateSerializer,
     StartupBusinessTractionEditSerializer
 )
+from .access import StartupAccessMixin
+from .cache import FOUNDER_PROFILE, get_cached_profile, profile_etag, taxonomy_etag
+from .snapshots import get_profile_snapshot, schedule_profile_snapshot
 
 from users.permissions import IsRegistered
 from users.models import CustomUser
+from users.tokens import get_request_startup_id
+from uploads.derivatives import schedule_image_derivatives
+from uploads.models import Upload
 
 logger = logging.getLogger(__name__)
 load_dotenv()
 
+
+def _render_founder_profile(startup_id):
+    startup = StartupSerializer.setup_eager_loading(Startup.objects.filter(id=startup_id)).get()
+    return StartupSerializer(startup).data
+
+
+def _not_modified(request, etag):
+    return etag in parse_etags(request.headers.get('If-None-Match', ''))
+
+
 class StartupCategoryView(generics.GenericAPIView):
     permission_classes = [IsRegistered]
     
     def get(self, request):
         try:
-            categories = StartupSubcategory.objects.all()
-            serializer = StartupSubcategorySerializer(categories, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            etag = taxonomy_etag()
+            if _not_modified(request, etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            else:
+                categories = StartupSubcategory.objects.all()
+                serializer = StartupSubcategorySerializer(categories, many=True)
+                response = Response(serializer.data, status=status.HTTP_200_OK, headers={"ETag": etag})
+            patch_cache_control(response, private=True, max_age=settings.TAXONOMY_CACHE_MAX_AGE)
+            return response
         except Exception as e:
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -78,9 +103,15 @@ class StartupCategoryTechSectorView(generics.GenericAPIView):
     
     def get(self, request):
         try:
-            categories = StartupTechSector.objects.all()
-            serializer = StartupTechSectorSerializer(categories, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            etag = taxonomy_etag()
+            if _not_modified(request, etag):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            else:
+                categories = StartupTechSector.objects.all()
+                serializer = StartupTechSectorSerializer(categories, many=True)
+                response = Response(serializer.data, status=status.HTTP_200_OK, headers={"ETag": etag})
+            patch_cache_control(response, private=True, max_age=settings.TAXONOMY_CACHE_MAX_AGE)
+            return response
         except Exception as e:
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -90,13 +121,15 @@ class StartupView(generics.GenericAPIView):
     permission_classes = [IsRegistered]
 
     def get(self, request):
-        user = request.user
         try:
-            startup = user.get_startup()
-            if not startup:
+            startup_id = get_request_startup_id(request)
+            if not startup_id:
                 return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
-            serializer = StartupSerializer(startup)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            etag = profile_etag(startup_id, FOUNDER_PROFILE)
+            if _not_modified(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            profile = get_cached_profile(startup_id, FOUNDER_PROFILE, lambda: _render_founder_profile(startup_id))
+            return Response(profile, status=status.HTTP_200_OK, headers={"ETag": etag})
         except Exception as e:
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -131,17 +164,20 @@ class StartupView(generics.GenericAPIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)  
         
 
-class StarupDetailView(generics.GenericAPIView):
+class StarupDetailView(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
     
     def get(self, request, startupId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId,is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
-            serializer = StartupSerializer(startup)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            etag = profile_etag(startup.id, FOUNDER_PROFILE)
+            if _not_modified(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            profile = get_cached_profile(startup.id, FOUNDER_PROFILE, lambda: _render_founder_profile(startup.id))
+            return Response(profile, status=status.HTTP_200_OK, headers={"ETag": etag})
         except Startup.DoesNotExist:
             return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -164,11 +200,10 @@ class StartupPublicView(generics.GenericAPIView):
                 
                 if not serializer.validated_data["isTermsAcepted"]:
                     return Response({"error": "Terms and conditions must be accepted"}, status=status.HTTP_400_BAD_REQUEST)
-                startup = Startup.objects.get(id=startupId,is_active=True, is_public=True)
-                startup_serializer = DetailedOutsiderStartupViewerSerializer(startup)
+                startup, profile = get_profile_snapshot(startupId, is_active=True, is_public=True)
                 email =  serializer.validated_data["email"]
                 if PublicVisitor.objects.filter(email=email,startup=startup).exists():
-                    return Response(startup_serializer.data, status=status.HTTP_200_OK)
+                    return Response(profile, status=status.HTTP_200_OK)
                 else:
                     PublicVisitor.objects.create(
                         email = email,
@@ -176,14 +211,14 @@ class StartupPublicView(generics.GenericAPIView):
                         device_id = device_id,
                         is_terms_acepted = True
                     )              
-                    return Response(data=startup_serializer.data, status=status.HTTP_200_OK)
+                    return Response(data=profile, status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditStage(generics.GenericAPIView):
+class StartupEditStage(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
     serializer_class = EditStartupStageSerializer
      
@@ -191,14 +226,14 @@ class StartupEditStage(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.stage = serializer.validated_data["stage"]
-                startup.save()
+                startup.save(update_fields=["stage"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
@@ -206,7 +241,7 @@ class StartupEditStage(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditName(generics.GenericAPIView):
+class StartupEditName(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupNameSerializer
     permission_classes = [IsRegistered]
     
@@ -214,14 +249,14 @@ class StartupEditName(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.name = serializer.validated_data["name"]
-                startup.save()
+                startup.save(update_fields=["name"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error: Startup does not exist"}, status = status.HTTP_404_NOT_FOUND)
@@ -230,7 +265,7 @@ class StartupEditName(generics.GenericAPIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
 
-class StartupEditLocation(generics.GenericAPIView):
+class StartupEditLocation(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupLocationSerializer
     permission_classes = [IsRegistered]
     
@@ -238,7 +273,7 @@ class StartupEditLocation(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
@@ -247,11 +282,8 @@ class StartupEditLocation(generics.GenericAPIView):
                 
                 location = serializer.validated_data["location"]
                 startup_location = StartupLocation.objects.get(startup_id=startupId)
-                city, state, country = location.split(", ")
-                startup_location.full_name = location
-                startup_location.city_name = city
-                startup_location.state_name = state
-                startup_location.country_name = country
+                for column, value in StartupLocation.parse_location(location).items():
+                    setattr(startup_location, column, value)
                 startup_location.save()
             return Response("Location updated successfully",status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
@@ -260,7 +292,7 @@ class StartupEditLocation(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditIndustry(generics.GenericAPIView):
+class StartupEditIndustry(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupIndustrySerializer
     permission_classes = [IsRegistered]
 
@@ -268,14 +300,14 @@ class StartupEditIndustry(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.industry_category_id = serializer.validated_data["industry"]
-                startup.save()
+                startup.save(update_fields=["industry_category_id"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error: Startup does not exist"}, status = status.HTTP_404_NOT_FOUND)
@@ -283,15 +315,20 @@ class StartupEditIndustry(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)    
 
-class StartupEditView(generics.GenericAPIView):
+class StartupEditView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupSerializer
     permission_classes = [IsRegistered]
 
+    def get_serializer_class(self):
+        if self.request.method == 'PATCH':
+            return PatchStartupSerializer
+        return super().get_serializer_class()
+
     def put(self, request, startupId):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
@@ -312,11 +349,8 @@ class StartupEditView(generics.GenericAPIView):
                 
                 if location:
                     startup_location = StartupLocation.objects.get(startup_id=startupId)
-                    city, state, country = location.split(", ")
-                    startup_location.full_name = location
-                    startup_location.city_name = city
-                    startup_location.state_name = state
-                    startup_location.country_name = country
+                    for column, value in StartupLocation.parse_location(location).items():
+                        setattr(startup_location, column, value)
                     startup_location.save()
                 
             return Response({"startupId": startup.id}, status=status.HTTP_200_OK)
@@ -325,8 +359,45 @@ class StartupEditView(generics.GenericAPIView):
         except Exception as e:
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)  
+
+    def patch(self, request, startupId):
+        """
+        Updates any subset of the profile fields, writing only the changed
+        columns of the startup and its location.
+        """
+        try:
+            with transaction.atomic():
+                user = request.user
+                startup = self.get_startup(startupId, is_active=True)
+                if not startup.user_has_access(user):
+                    return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
+                serializer = self.get_serializer(data=request.data)
+                if not serializer.is_valid():
+                    return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+                columns = serializer.get_columns()
+                if columns:
+                    for column, value in columns.items():
+                        setattr(startup, column, value)
+                    startup.save(update_fields=list(columns))
+
+                location = serializer.validated_data.get("location")
+                if location:
+                    location_fields = StartupLocation.parse_location(location)
+                    if not StartupLocation.objects.filter(startup=startup).update(**location_fields):
+                        StartupLocation.objects.create(startup=startup, **location_fields)
+                    elif not columns:
+                        # Queryset updates skip the signals that refresh the cached profile
+                        schedule_profile_snapshot(startup.id)
+
+            return Response({"startupId": startup.id}, status=status.HTTP_200_OK)
+        except Startup.DoesNotExist:
+            return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error('Server error: %s', e)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-class StartupEditWebsite(generics.GenericAPIView):
+class StartupEditWebsite(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupWebsiteSerializer
     permission_classes = [IsRegistered]
 
@@ -334,14 +405,14 @@ class StartupEditWebsite(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data = request.data)
                 if not serializer.is_valid():
                     return Response({"error": serializer.errors}, status = status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.website_url = serializer.validated_data["websiteUrl"]
-                startup.save()
+                startup.save(update_fields=["website_url"])
                 return Response(status = status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error":"Startup Does not Exist"}, status = status.HTTP_404_NOT_FOUND )
@@ -349,14 +420,14 @@ class StartupEditWebsite(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status= status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class FoundersView(generics.GenericAPIView):
+class FoundersView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = FounderCreateSerializer
     permission_classes = [IsRegistered]
     
     def get(self, request, startupId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             founders = Founder.objects.filter(startup=startup)
@@ -366,6 +437,7 @@ class FoundersView(generics.GenericAPIView):
                 'firstName':startup.main_founder.first_name,
                 'lastName':startup.main_founder.last_name,
                 'pictureUrl':startup.main_founder.picture_url,
+                'pictureUrls':startup.main_founder.picture_variants,
                 })
             return Response(data, status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
@@ -508,14 +580,14 @@ class FounderConfirmView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return HttpResponse(f"<h1>Error</h1><p>Server error: {str(e)}</p>", status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class FounderEditView(generics.GenericAPIView):
+class FounderEditView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = FounderEditSerializer
     permission_classes = [IsRegistered]
     
     def put(self, request, startupId, founderId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             founder = Founder.objects.get(id=founderId,startup=startup)
@@ -556,14 +628,14 @@ class FounderEditView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class FounderDeleteView(generics.GenericAPIView):
+class FounderDeleteView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = None
     permission_classes = [IsRegistered]
     
     def delete(self, request, startupId, founderId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             founder = Founder.objects.get(id=founderId,startup=startup)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
@@ -582,7 +654,7 @@ class FounderDeleteView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
        
-class StartupImageEdit(generics.GenericAPIView):
+class StartupImageEdit(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupImageSerializer
     permission_classes = [IsRegistered]
     
@@ -592,7 +664,7 @@ class StartupImageEdit(generics.GenericAPIView):
                 user = request.user
                 serializer = self.get_serializer(data=request.data)
                 serializer.is_valid(raise_exception=True)
-                startup = Startup.objects.get(id=startupId, is_active=True) 
+                startup = self.get_startup(startupId, is_active=True)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
@@ -606,11 +678,12 @@ class StartupImageEdit(generics.GenericAPIView):
                     logging.error("Failed to upload image to S3")
                     return Response({"error": "Failed to upload image to S3"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 StartupImage.objects.filter(startup=startup, is_active=True).update(is_active=False)
-                StartupImage.objects.create( 
+                image = StartupImage.objects.create( 
                     startup=startup,
                     url=file_url,
                     is_active=True
                 )
+                schedule_image_derivatives(Upload.STARTUP_IMAGE, image.id, file_url)
                 return Response({"message": "Startup image updated successfully"}, status=status.HTTP_200_OK)
         
         except Startup.DoesNotExist:
@@ -620,7 +693,7 @@ class StartupImageEdit(generics.GenericAPIView):
             logging.error('Unexpected error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)     
                                         
-class StartupPrivacyView(generics.GenericAPIView):
+class StartupPrivacyView(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditPrivacySerializer
     permission_classes = [IsRegistered]
     
@@ -628,14 +701,14 @@ class StartupPrivacyView(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.is_public = serializer.validated_data["isPrivacy"]
-                startup.save()
+                startup.save(update_fields=["is_public"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
@@ -643,7 +716,7 @@ class StartupPrivacyView(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditVideo(generics.GenericAPIView):
+class StartupEditVideo(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupVideoSerializer
     permission_classes = [IsRegistered]
 
@@ -651,7 +724,7 @@ class StartupEditVideo(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
@@ -684,7 +757,7 @@ class StartupEditVideo(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 video = StartupVideo.objects.filter(startup=startup, is_active = True).first()
@@ -700,7 +773,7 @@ class StartupEditVideo(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditDescription(generics.GenericAPIView):
+class StartupEditDescription(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupDescriptionSerializer
     permission_classes = [IsRegistered]
 
@@ -708,14 +781,14 @@ class StartupEditDescription(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.description = serializer.validated_data["description"]
-                startup.save()
+                startup.save(update_fields=["description"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error: Startup does not exist"}, status = status.HTTP_404_NOT_FOUND)
@@ -723,7 +796,7 @@ class StartupEditDescription(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditFoundationDate(generics.GenericAPIView):
+class StartupEditFoundationDate(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = EditStartupFoundationDateSerializer
     permission_classes = [IsRegistered]
 
@@ -731,14 +804,14 @@ class StartupEditFoundationDate(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 startup.foundation_date = serializer.validated_data["foundationDate"]
-                startup.save()
+                startup.save(update_fields=["foundation_date"])
                 return Response(status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error: Startup does not exist"}, status = status.HTTP_404_NOT_FOUND)
@@ -746,7 +819,7 @@ class StartupEditFoundationDate(generics.GenericAPIView):
             logger.error('Server error: %s', e)
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class StartupEditPitchDeckUpload(generics.GenericAPIView):
+class StartupEditPitchDeckUpload(StartupAccessMixin, generics.GenericAPIView):
     serializer_class = StartupCreatePitchDeckSerializer  
     permission_classes = [IsRegistered]
 
@@ -754,7 +827,7 @@ class StartupEditPitchDeckUpload(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 serializer = self.get_serializer(data=request.data)
                 if not serializer.is_valid():
                     return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
@@ -770,11 +843,12 @@ class StartupEditPitchDeckUpload(generics.GenericAPIView):
                     logging.error("Failed to upload image to S3")
                     return Response({"error": "Failed to upload pitchDeck to S3"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 StartupSlidedeck.objects.filter(startup=startup,is_active= True).update(is_active=False)
-                StartupSlidedeck.objects.create(
+                slidedeck = StartupSlidedeck.objects.create(
                     startup=startup,
                     url=file_url,
                     is_active=True
                 )
+                schedule_image_derivatives(Upload.PITCH_DECK, slidedeck.id, file_url)
                 return Response({"message": "Startup Pitch Deck updated successfully"}, status=status.HTTP_200_OK)
 
         except Startup.DoesNotExist:
@@ -785,13 +859,13 @@ class StartupEditPitchDeckUpload(generics.GenericAPIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)    
                      
            
-class BusinessTractionView(generics.GenericAPIView):
+class BusinessTractionView(StartupAccessMixin, generics.GenericAPIView):
     permission_classes = [IsRegistered]
     
     def get(self, request, startupId):
         try:
             user = request.user
-            startup = Startup.objects.get(id=startupId, is_active=True)
+            startup = self.get_startup(startupId, is_active=True)
             if not startup.user_has_access(user):
                 return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
             business_traction = StartupBusinessTraction.objects.get(startup=startup)
@@ -808,7 +882,7 @@ class BusinessTractionView(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId,is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 if not startup.user_has_access(user):
                     return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
                 if StartupBusinessTraction.objects.filter(startup=startup).exists():
@@ -851,7 +925,7 @@ class BusinessTractionView(generics.GenericAPIView):
         try:
             with transaction.atomic():
                 user = request.user
-                startup = Startup.objects.get(id=startupId, is_active=True)
+                startup = self.get_startup(startupId, is_active=True)
                 business_traction = StartupBusinessTraction.objects.get(startup=startup)
                 serializer = StartupBusinessTractionEditSerializer(data=request.data)
                 if not serializer.is_valid():
@@ -941,11 +1015,10 @@ class CheckoutPublicVisitorView(generics.GenericAPIView):
             device_id = request.META.get('HTTP_X_DEVICE_ID')
             if not device_id:
                 return Response({"error": "Device id not found"}, status=status.HTTP_400_BAD_REQUEST)
-            startup = Startup.objects.get(id=startupId, is_active=True, is_public=True)
+            startup, profile = get_profile_snapshot(startupId, is_active=True, is_public=True)
             
             if PublicVisitor.objects.filter(device_id=device_id, startup=startup).exists():
-                serializer = DetailedOutsiderStartupViewerSerializer(startup)
-                return Response(data=serializer.data, status=status.HTTP_200_OK)
+                return Response(data=profile, status=status.HTTP_200_OK)
             else:
                 return Response(data={"new_visitor": True}, status=status.HTTP_200_OK)
             
@@ -964,10 +1037,9 @@ class CheckoutPrivateVisitorView(generics.GenericAPIView):
             device_id = request.META.get('HTTP_X_DEVICE_ID')
             if not device_id:
                 return Response({"error": "Device id not found"}, status=status.HTTP_400_BAD_REQUEST)
-            startup = Startup.objects.get(id=startupId, is_active=True, is_public=False)
+            startup, profile = get_profile_snapshot(startupId, is_active=True, is_public=False)
             if PrivateVisitor.objects.filter(device_id=device_id,email=email,unique_token=token,startup=startup).exists():
-                serializer = DetailedOutsiderStartupViewerSerializer(startup)
-                return Response(data=serializer.data, status=status.HTTP_200_OK)
+                return Response(data=profile, status=status.HTTP_200_OK)
             else:
                 return Response(data={"new_visitor": True}, status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
@@ -992,8 +1064,7 @@ class StartupPrivateView(generics.GenericAPIView):
                 
                 if not serializer.validated_data["isTermsAcepted"]:
                     return Response({"error": "Terms and conditions must be accepted"}, status=status.HTTP_400_BAD_REQUEST)
-                startup = Startup.objects.get(id=startupId,is_active=True, is_public=False)
-                startup_serializer = DetailedOutsiderStartupViewerSerializer(startup)
+                startup, profile = get_profile_snapshot(startupId, is_active=True, is_public=False)
                 
                 visitor = PrivateVisitor.objects.get(
                     email = email,
@@ -1005,7 +1076,7 @@ class StartupPrivateView(generics.GenericAPIView):
                 visitor.is_terms_acepted = serializer.validated_data["isTermsAcepted"]
                 visitor.save()
                 
-                return Response(data=startup_serializer.data, status=status.HTTP_200_OK)
+                return Response(data=profile, status=status.HTTP_200_OK)
         except Startup.DoesNotExist:
             return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
         except PrivateVisitor.DoesNotExist:
@@ -0,0 +1,29 @@
+from django.contrib import admin
+from .models import MixpanelSync, TrackEvent, TrackEventRollup
+
+
+class TrackEventAdmin(admin.ModelAdmin):
+    list_display = ('event', 'startup_id', 'email', 'distinct_id', 'time')
+    list_filter = ('event',)
+    search_fields = ['startup_id', 'email', 'distinct_id']
+    date_hierarchy = 'time'
+
+
+admin.site.register(TrackEvent, TrackEventAdmin)
+
+
+class TrackEventRollupAdmin(admin.ModelAdmin):
+    list_display = ('event', 'startup_id', 'day', 'count')
+    list_filter = ('event',)
+    search_fields = ['startup_id']
+
+
+admin.site.register(TrackEventRollup, TrackEventRollupAdmin)
+
+
+class MixpanelSyncAdmin(admin.ModelAdmin):
+    list_display = ('startup', 'synced_through', 'last_synced_at', 'next_sync_at', 'attempts')
+    search_fields = ['startup__name']
+
+
+admin.site.register(MixpanelSync, MixpanelSyncAdmin)
@@ -0,0 +1,293 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from .rollups import TRACKED_EVENTS
+
+TRACKED_CODES = {event: code for code, event in enumerate(TRACKED_EVENTS)}
+VISIT = "Visit_Startup_Page"
+SHARES = "Total_Shares"
+LATEST_EVENTS = (
+    VISIT,
+    "Click_Pitch_Deck",
+    "Click_Video",
+    "Deck_Download",
+    "Click_Pass_Startup_Button",
+    "Click_Connect_Startup_Button",
+)
+
+
+def _numeric(value):
+    """The amount a time spent or share count property adds, and whether it is a float."""
+    if isinstance(value, (int, float)):
+        return value, isinstance(value, float)
+    if isinstance(value, str) and value.isdigit():
+        return int(value), False
+    return 0, False
+
+
+class Visitor:
+    __slots__ = ('id', 'email', 'last_time', 'latest')
+
+    def __init__(self, id, email, time):
+        self.id = id
+        self.email = email
+        self.last_time = time
+        self.latest = {}
+
+
+class DashboardAggregator:
+    """
+    Computes every section of the tracking dashboard in one pass over the
+    events. Each event is reduced to a few columns (time, tracked event
+    code, visitor id, numeric property), and every `chunk_size` events
+    NumPy adds them to the bucketed counts, so memory does not grow with
+    the number of events. The output matches the per-section methods of
+    InitialTackDashBoardView.
+    """
+
+    def __init__(self, now=None, chunk_size=65536):
+        self.now = now or datetime.now()
+        self.chunk_size = chunk_size
+        self.visitors = {}
+        self._clear_chunk()
+
+        tracked = len(TRACKED_CODES)
+        self._totals = np.zeros(tracked, dtype=np.int64)
+        self._last_24_hours = np.zeros(tracked, dtype=np.int64)
+        self._since_24_hours = (self.now - timedelta(days=1)).timestamp()
+        self._series_specs = {
+            'by_day': self._days_spec(7),
+            'by_month': self._days_spec(30),
+            'by_six_month': self._months_spec(6, self.now - relativedelta(months=6)),
+            'by_year': self._months_spec(12, self.now - relativedelta(years=1)),
+        }
+        self._series_counts = {
+            name: np.zeros((tracked, len(spec['labels'])), dtype=np.int64)
+            for name, spec in self._series_specs.items()
+        }
+        self._visits = np.zeros(0, dtype=np.int64)
+        self._visitor_sums = {
+            name: (np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64)) for name in (VISIT, SHARES)
+        }
+
+    def _days_spec(self, number):
+        days = [(self.now - timedelta(days=i)).date() for i in reversed(range(number))]
+        days.append(days[-1] + timedelta(days=1))
+        return {
+            'key': "days",
+            'labels': [day.strftime("%Y-%m-%d") for day in days[:-1]],
+            'boundaries': np.array([datetime.combine(day, datetime.min.time()).timestamp() for day in days]),
+            'after': (self.now - timedelta(days=number)).timestamp(),
+            'inclusive': False,
+        }
+
+    def _months_spec(self, number, start):
+        months = [(self.now - relativedelta(months=i)).replace(day=1) for i in reversed(range(number))]
+        months.append(months[-1] + relativedelta(months=1))
+        return {
+            'key': "months",
+            'labels': [month.strftime("%Y-%m") for month in months[:-1]],
+            'boundaries': np.array([datetime.combine(month.date(), datetime.min.time()).timestamp() for month in months]),
+            'after': start.timestamp(),
+            'inclusive': True,
+        }
+
+    def _clear_chunk(self):
+        self._times = []
+        self._codes = []
+        self._visitor_ids = []
+        self._values = []
+        self._float_values = []
+
+    @classmethod
+    def from_events(cls, events, **kwargs):
+        aggregator = cls(**kwargs)
+        for event in events:
+            aggregator.add(event)
+        aggregator.flush()
+        return aggregator
+
+    def add(self, event):
+        props = event['properties']
+        name = event['event']
+        time = props['time']
+        self._times.append(time)
+        self._codes.append(TRACKED_CODES.get(name, -1))
+
+        email = props.get('email_as_user_id')
+        if not email:
+            self._visitor_ids.append(-1)
+            self._values.append(0)
+            self._float_values.append(False)
+        else:
+            visitor = self.visitors.get(email)
+            if visitor is None:
+                visitor = self.visitors[email] = Visitor(len(self.visitors), email, time)
+            self._visitor_ids.append(visitor.id)
+            if name == VISIT:
+                value, is_float = _numeric(props.get("time_spent_on_page"))
+            elif name == SHARES:
+                value, is_float = _numeric(props.get("count", 1))
+            else:
+                value, is_float = 0, False
+            self._values.append(value)
+            self._float_values.append(is_float)
+
+            if time >= visitor.last_time:
+                if name in LATEST_EVENTS:
+                    visitor.latest[name] = props
+                visitor.last_time = time
+
+        if len(self._times) >= self.chunk_size:
+            self.flush()
+
+    @staticmethod
+    def _grow(counts, size):
+        return np.pad(counts, (0, size - len(counts))) if len(counts) < size else counts
+
+    def flush(self):
+        """Adds the buffered events to the counts."""
+        if not self._times:
+            return
+        times = np.array(self._times, dtype=np.float64)
+        codes = np.array(self._codes, dtype=np.int8)
+        visitor_ids = np.array(self._visitor_ids, dtype=np.int64)
+        values = np.array(self._values, dtype=np.float64)
+        float_values = np.array(self._float_values, dtype=np.int64)
+        self._clear_chunk()
+
+        tracked = codes >= 0
+        tracked_times, tracked_codes = times[tracked], codes[tracked]
+        self._totals += np.bincount(tracked_codes, minlength=len(TRACKED_CODES))
+        self._last_24_hours += np.bincount(
+            tracked_codes[tracked_times > self._since_24_hours], minlength=len(TRACKED_CODES)
+        )
+        for name, spec in self._series_specs.items():
+            if spec['inclusive']:
+                recent = tracked_times >= spec['after']
+            else:
+                recent = tracked_times > spec['after']
+            self._series_counts[name] += self._bucket(tracked_times[recent], tracked_codes[recent], spec['boundaries'])
+
+        size = len(self.visitors)
+        identified = visitor_ids >= 0
+        self._visits = self._grow(self._visits, size) + np.bincount(visitor_ids[identified], minlength=size)
+        for name, (sums, floats) in self._visitor_sums.items():
+            selected = identified & (codes == TRACKED_CODES[name])
+            self._visitor_sums[name] = (
+                self._grow(sums, size) + np.bincount(visitor_ids[selected], weights=values[selected], minlength=size),
+                self._grow(floats, size) + np.bincount(visitor_ids[selected], weights=float_values[selected], minlength=size).astype(np.int64),
+            )
+
+    @staticmethod
+    def _bucket(times, codes, boundaries):
+        """Counts per tracked event of the times in each [boundaries[i], boundaries[i + 1])."""
+        slots = len(boundaries) - 1
+        index = np.searchsorted(boundaries, times, side='right') - 1
+        inside = (index >= 0) & (index < slots)
+        return np.bincount(
+            codes[inside].astype(np.int64) * slots + index[inside],
+            minlength=len(TRACKED_CODES) * slots
+        ).reshape(len(TRACKED_CODES), slots)
+
+    def counts(self):
+        """Main values and the weekly, monthly, six-monthly and yearly series."""
+        self.flush()
+        result = {
+            'main_values': {
+                event: {"total": int(self._totals[code]), "last_24_hours": int(self._last_24_hours[code])}
+                for event, code in TRACKED_CODES.items()
+            }
+        }
+        for name, spec in self._series_specs.items():
+            counts = self._series_counts[name]
+            result[name] = {
+                event: {
+                    "total": int(self._totals[code]),
+                    spec['key']: [{"date": label, "qty": int(qty)} for label, qty in zip(spec['labels'], counts[code])]
+                } for event, code in TRACKED_CODES.items()
+            }
+        return result
+
+    def _visitor_totals(self, name):
+        """Sum of the numeric property of `name` events per visitor, as int when no value was a float."""
+        self.flush()
+        sums, floats = self._visitor_sums[name]
+        sums, floats = self._grow(sums, len(self.visitors)), self._grow(floats, len(self.visitors))
+        return [float(total) if has_float else int(total) for total, has_float in zip(sums, floats)]
+
+    def _visit_counts(self):
+        self.flush()
+        return self._grow(self._visits, len(self.visitors))
+
+    def _last_visit(self, visitor):
+        return (self.now - datetime.fromtimestamp(visitor.last_time)).total_seconds()
+
+    def recent_activity(self, review_map):
+        visits = self._visit_counts()
+        email_list = []
+        for visitor in self.visitors.values():
+            review = review_map.get(visitor.email)
+            email_list.append({
+                "email": 'anonymous' if review and review.is_anonymous else visitor.email,
+                "totalVisits": int(visits[visitor.id]),
+                "lastVisit": self._last_visit(visitor)
+            })
+        return sorted(email_list, key=lambda x: x["lastVisit"])[:4]
+
+    def visitor_details(self, number_slides):
+        """
+        Per visitor totals and latest events, as (email, details) pairs in
+        order of first visit.
+        """
+        visits = self._visit_counts()
+        time_on_pages = self._visitor_totals(VISIT)
+        shares = self._visitor_totals(SHARES)
+        details = []
+        for visitor in self.visitors.values():
+            latest = visitor.latest
+            visit = latest.get(VISIT, {})
+            pitch_deck = latest.get("Click_Pitch_Deck")
+            video = latest.get("Click_Video")
+            deck_download = latest.get("Deck_Download")
+            pass_button = latest.get("Click_Pass_Startup_Button")
+            connect_button = latest.get("Click_Connect_Startup_Button")
+            details.append((visitor.email, {
+                "totalVisits": int(visits[visitor.id]),
+                "totalTimeSpentOnPages": time_on_pages[visitor.id],
+                "userBrowser": visit.get("user_browser"),
+                "userDeviceType": visit.get("user_device_type"),
+                "userOs": visit.get("user_os"),
+                "latestPitchDeck": {
+                    "numberSlides": number_slides,
+                    "numberSlidesViewed": pitch_deck.get("number_slides_viewed"),
+                    "timeSpentPerSlide": [
+                        {"slide": int(slide), "time": time}
+                        for slide, time in pitch_deck.get("time_spent_per_slide", {}).items()
+                    ],
+                    "totalTime": pitch_deck.get("total_time", 0)
+                } if pitch_deck is not None else {
+                    "numberSlides": number_slides,
+                    "numberSlidesViewed": None,
+                    "timeSpentPerSlide": None,
+                    "totalTime": None
+                },
+                "latestVideo": {
+                    "totalTimeSpentOnVideo": video.get("total_time_spent_on_video") if video is not None else None,
+                    "finishedVideo": video.get("finished_video") if video is not None else None
+                },
+                "latestDeckDownload": {
+                    "deckDownloadYes": deck_download.get("deck_download_yes") if deck_download is not None else None
+                },
+                "latestPassButton": {
+                    "passYes": pass_button.get("pass_yes") if pass_button is not None else None
+                },
+                "latestConnectButton": {
+                    "connectYes": connect_button.get("connect_yes") if connect_button is not None else None
+                },
+                "totalShares": shares[visitor.id],
+                "lastVisit": self._last_visit(visitor)
+            }))
+        return details
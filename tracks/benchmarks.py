@@ -0,0 +1,458 @@
+import json
+import random
+import resource
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+
+from dateutil.relativedelta import relativedelta
+
+from reviews.serializers import ReviewListSerializer
+from .aggregation import DashboardAggregator
+from .sync import DASHBOARD_EVENTS, parse_export
+from .views import InitialTackDashBoardView
+
+
+def iter_synthetic_events(count, visitors=500, seed=0):
+    """Yields events spread over the last year, oldest first, shaped like the Mixpanel export."""
+    generator = random.Random(seed)
+    start = datetime.now().timestamp() - 365 * 86400
+    step = 365 * 86400 / max(count, 1)
+    emails = [f"visitor{number}@example.com" for number in range(visitors)]
+    for index in range(count):
+        name = generator.choice(DASHBOARD_EVENTS)
+        properties = {"time": int(start + index * step)}
+        if generator.random() < 0.7:
+            properties["email_as_user_id"] = generator.choice(emails)
+        if name == "Visit_Startup_Page":
+            properties.update({
+                "time_spent_on_page": generator.choice([generator.randint(1, 600), str(generator.randint(1, 600)), 2.5, None]),
+                "user_browser": generator.choice(["Chrome", "Firefox", "Safari"]),
+                "user_device_type": generator.choice(["desktop", "mobile"]),
+                "user_os": generator.choice(["macOS", "Windows", "iOS"]),
+            })
+        elif name == "Click_Pitch_Deck":
+            properties.update({
+                "number_slides_viewed": generator.randint(1, 12),
+                "time_spent_per_slide": {str(slide): generator.randint(1, 60) for slide in range(1, 4)},
+                "total_time": generator.randint(10, 300),
+            })
+        elif name == "Click_Video":
+            properties.update({"total_time_spent_on_video": generator.randint(1, 120), "finished_video": generator.random() < 0.5})
+        elif name == "Total_Shares" and generator.random() < 0.5:
+            properties["count"] = generator.choice([1, 2, "3"])
+        yield {"event": name, "properties": properties}
+
+
+def synthetic_events(count, visitors=500, seed=0):
+    return list(iter_synthetic_events(count, visitors=visitors, seed=seed))
+
+
+class SyntheticExportResponse:
+    """
+    Stands in for the streamed response of the Mixpanel export API,
+    generating its JSON lines as they are read.
+    """
+    status_code = 200
+
+    def __init__(self, count, visitors=500):
+        self.count = count
+        self.visitors = visitors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_lines(self, chunk_size=512):
+        for event in iter_synthetic_events(self.count, visitors=self.visitors):
+            yield json.dumps(event).encode()
+
+    def iter_content(self, chunk_size=1):
+        for line in self.iter_lines():
+            yield line + b"\n"
+
+    def raise_for_status(self):
+        pass
+
+    @property
+    def text(self):
+        return "\n".join(line.decode() for line in self.iter_lines())
+
+
+class ReferenceDashboard:
+    """
+    The per-section dashboard implementation InitialTackDashBoardView used
+    before DashboardAggregator, which the aggregator is checked and
+    benchmarked against. Every section is computed against `now`, a naive
+    local datetime, and reviews are looked up in `review_map`.
+    """
+
+    def __init__(self, now=None):
+        self.now = now or datetime.now()
+
+    def main_values(self, events):
+        now = self.now
+        last_24_hours = now - timedelta(days=1)
+
+        counts = {event: {"total": 0, "last_24_hours": 0} for event in ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]}
+
+        for event in events:
+            event_name = event['event']
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            if event_name in counts:
+                counts[event_name]["total"] += 1
+                if event_time > last_24_hours:
+                    counts[event_name]["last_24_hours"] += 1
+
+        return counts
+
+    def recent_activity(self, events, review_map):
+        email_counts = {}
+        now = self.now
+
+        for event in events:
+            properties = event.get('properties', {})
+            email = properties.get('email_as_user_id')
+            event_time = datetime.fromtimestamp(properties['time'])
+            
+            if email:
+                if email not in email_counts:
+                    email_counts[email] = {"count": 0, "last_event_time": event_time}
+                
+                email_counts[email]["count"] += 1
+                if event_time > email_counts[email]["last_event_time"]:
+                    email_counts[email]["last_event_time"] = event_time
+
+        email_list = []
+
+        for email, info in email_counts.items():
+            time_since_last_event = (now - info["last_event_time"]).total_seconds()
+            email_value = email
+            
+            review = review_map.get(email)
+            if review and review.is_anonymous:
+                email_value = 'anonymous'
+            
+            email_list.append({
+                "email": email_value,
+                "totalVisits": info["count"],
+                "lastVisit": time_since_last_event
+            })
+        
+        
+        email_list_sorted = sorted(email_list, key=lambda x: x["lastVisit"])
+        
+        return email_list_sorted[:4]
+
+    def event_counts_by_day(self, events):
+        now = self.now
+        last_7_days = now - timedelta(days=7)
+
+        counts_total = {event: 0 for event in ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]}
+        counts_by_day = {event: defaultdict(int) for event in ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]}
+
+        for event in events:
+            event_name = event['event']
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            event_day = event_time.strftime("%Y-%m-%d")
+
+            if event_name in counts_total:
+                counts_total[event_name] += 1
+                if event_time > last_7_days:
+                    counts_by_day[event_name][event_day] += 1
+        
+        days = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+        days.reverse()
+        result = {
+            event: {
+                "total": counts_total[event],
+                "days":[{"date": day, "qty": counts_by_day[event].get(day, 0)} for day in days]
+            } for event in counts_total
+        }
+
+        return result
+    
+    def event_counts_by_month(self, events):
+        now = self.now
+        last_30_days = now - timedelta(days=30)
+
+        tracked_events = ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]
+        
+        counts_total = {event: 0 for event in tracked_events}
+        counts_by_day = {event: defaultdict(int) for event in tracked_events}
+
+        for event in events:
+            event_name = event['event']
+            if event_name not in tracked_events:
+                continue
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            event_day = event_time.strftime("%Y-%m-%d")
+
+            counts_total[event_name] += 1
+            if event_time > last_30_days:
+                counts_by_day[event_name][event_day] += 1
+        
+        days = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(30)]
+        days.reverse()
+        result = {
+            event: {
+                "total": counts_total[event],
+                "days": [{"date": day, "qty": counts_by_day[event].get(day, 0)} for day in days]
+            } for event in counts_total
+        }
+
+        return result
+        
+    def event_counts_by_six_month(self, events):
+        now = self.now
+        start_date = now - relativedelta(months=6)
+
+        tracked_events = ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]
+
+        counts_total = {event: 0 for event in tracked_events}
+        counts_by_month = {event: defaultdict(int) for event in tracked_events}
+
+        for event in events:
+            event_name = event['event']
+            if event_name not in tracked_events:
+                continue  
+
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            event_month = event_time.strftime("%Y-%m")
+
+            counts_total[event_name] += 1
+            if event_time >= start_date:
+                counts_by_month[event_name][event_month] += 1
+        
+        
+        months = [(now - relativedelta(months=i)).strftime("%Y-%m") for i in range(6)]
+        months.reverse()
+
+        result = {
+            event: {
+                "total": counts_total[event],
+                "months": [{"date": month, "qty": counts_by_month[event].get(month, 0)} for month in months]
+            } for event in counts_total
+        }
+
+        return result
+    
+    def event_counts_by_year(self, events):
+        now = self.now
+        start_date = now - relativedelta(years=1)
+
+        tracked_events = ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]
+
+        counts_total = {event: 0 for event in tracked_events}
+        counts_by_month = {event: defaultdict(int) for event in tracked_events}
+
+        for event in events:
+            event_name = event['event']
+            if event_name not in tracked_events:
+                continue 
+
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            event_month = event_time.strftime("%Y-%m")
+
+            counts_total[event_name] += 1
+            if event_time >= start_date:
+                counts_by_month[event_name][event_month] += 1
+
+    
+        months = [(now - relativedelta(months=i)).strftime("%Y-%m") for i in range(12)]
+        months.reverse()
+
+        result = {
+            event: {
+                "total": counts_total[event],
+                "months": [{"date": month, "qty": counts_by_month[event].get(month, 0)} for month in months]
+            } for event in counts_total
+        }
+
+        return result
+    
+    def visitors(self, events, review_map, number_slides):
+        email_counts = {}
+
+        for event in events:
+            email = event['properties'].get('email_as_user_id')
+            event_name = event['event']
+            event_time = datetime.fromtimestamp(event['properties']['time'])
+            props = event['properties']
+
+            if email:
+                if email not in email_counts:
+                    email_counts[email] = {
+                        "totalVisits": 0,
+                        "totalTimeSpentOnPages": 0,
+                        "lastEventTime": event_time,
+                        "userBrowser": None,
+                        "userDeviceType": None,
+                        "userOs": None,
+                        "latestPitchDeck": {
+                            "numberSlides": number_slides,
+                            "numberSlidesViewed": None,
+                            "timeSpentPerSlide": None,
+                            "totalTime": None
+                        },
+                        "latestVideo": {
+                            "totalTimeSpentOnVideo": None,
+                            "finishedVideo": None
+                        },
+                        "latestDeckDownload": {
+                            "deckDownloadYes": None
+                        },
+                        "latestPassButton": {
+                            "passYes": None
+                        },
+                        "latestConnectButton": {
+                            "connectYes": None
+                        },
+                        "totalShares": 0
+                    }
+
+                email_counts[email]["totalVisits"] += 1
+
+                if event_name == "Visit_Startup_Page":
+                    time_spent_on_page = props.get("time_spent_on_page")
+                    if isinstance(time_spent_on_page, (int, float)):
+                        email_counts[email]["totalTimeSpentOnPages"] += time_spent_on_page
+                    elif isinstance(time_spent_on_page, str) and time_spent_on_page.isdigit():
+                        email_counts[email]["totalTimeSpentOnPages"] += int(time_spent_on_page)
+                    
+                    if event_time >= email_counts[email]["lastEventTime"]:
+                        email_counts[email]["userBrowser"] = props.get("user_browser")
+                        email_counts[email]["userDeviceType"] = props.get("user_device_type")
+                        email_counts[email]["userOs"] = props.get("user_os")
+
+                if event_name == "Click_Pitch_Deck" and event_time >= email_counts[email]["lastEventTime"]:
+                    raw_time_spent = props.get("time_spent_per_slide", {})
+                    formatted_time_spent = [{"slide": int(slide), "time": time} for slide, time in raw_time_spent.items()]
+                    totalTime = props.get("total_time", 0)
+                    email_counts[email]["latestPitchDeck"] = {
+                        "numberSlides": number_slides,
+                        "numberSlidesViewed": props.get("number_slides_viewed"),
+                        "timeSpentPerSlide": formatted_time_spent,
+                        "totalTime": totalTime
+                    }
+
+                if event_name == "Click_Video" and event_time >= email_counts[email]["lastEventTime"]:
+                    email_counts[email]["latestVideo"] = {
+                        "totalTimeSpentOnVideo": props.get("total_time_spent_on_video"),
+                        "finishedVideo": props.get("finished_video")
+                    }
+
+                if event_name == "Deck_Download" and event_time >= email_counts[email]["lastEventTime"]:
+                    email_counts[email]["latestDeckDownload"] = {
+                        "deckDownloadYes": props.get("deck_download_yes")
+                    }
+
+                if event_name == "Click_Pass_Startup_Button" and event_time >= email_counts[email]["lastEventTime"]:
+                    email_counts[email]["latestPassButton"] = {
+                        "passYes": props.get("pass_yes")
+                    }
+
+                if event_name == "Click_Connect_Startup_Button" and event_time >= email_counts[email]["lastEventTime"]:
+                    email_counts[email]["latestConnectButton"] = {
+                        "connectYes": props.get("connect_yes")
+                    }
+
+                if event_name == "Total_Shares":
+                    total_shares = props.get("count", 1) 
+                    if isinstance(total_shares, (int, float)):
+                        email_counts[email]["totalShares"] += total_shares
+                    elif isinstance(total_shares, str) and total_shares.isdigit():
+                        email_counts[email]["totalShares"] += int(total_shares)
+
+                if event_time > email_counts[email]["lastEventTime"]:
+                    email_counts[email]["lastEventTime"] = event_time
+
+        now = self.now
+        email_list = []
+
+        for email, info in email_counts.items():
+            time_since_last_event = (now - info.pop("lastEventTime")).total_seconds()
+            info["lastVisit"] = time_since_last_event
+            review = review_map.get(email)
+            deview_data = ReviewListSerializer(review).data
+            email_value = email
+            if review and review.is_anonymous:
+                email_value = 'anonymous'
+            email_list.append({"email": email_value,"review":deview_data ,**info})
+
+        return email_list
+
+
+def compare_dashboard_aggregation(events, startup_id=None):
+    """
+    Runs the reference per-section implementation and DashboardAggregator
+    on the same events, against the same instant, and returns their
+    timings in seconds and whether their output matches.
+    """
+    startup_id = startup_id or uuid.uuid4()
+    now = datetime.fromtimestamp(time.time())
+    reference_dashboard = ReferenceDashboard(now)
+
+    started = time.perf_counter()
+    reference = {
+        'main_values': reference_dashboard.main_values(events),
+        'by_day': reference_dashboard.event_counts_by_day(events),
+        'by_month': reference_dashboard.event_counts_by_month(events),
+        'by_six_month': reference_dashboard.event_counts_by_six_month(events),
+        'by_year': reference_dashboard.event_counts_by_year(events),
+        'recent_activity': reference_dashboard.recent_activity(events, {}),
+        'visitors': reference_dashboard.visitors(events, {}, None),
+    }
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    aggregator = DashboardAggregator.from_events(events, now=now)
+    result = aggregator.counts()
+    result['recent_activity'] = aggregator.recent_activity({})
+    result['visitors'] = InitialTackDashBoardView()._get_visitors(aggregator, startup_id, [])
+    aggregator_seconds = time.perf_counter() - started
+
+    return {
+        'reference_seconds': reference_seconds,
+        'aggregator_seconds': aggregator_seconds,
+        'matches': reference == result,
+    }
+
+
+def _dashboard_from_export(mode, count, visitors, connection):
+    started = time.perf_counter()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    response = SyntheticExportResponse(count, visitors=visitors)
+    if mode == 'buffered':
+        events = [json.loads(line) for line in response.text.strip().split('\n')]
+    else:
+        events = parse_export(response)
+    aggregator = DashboardAggregator.from_events(events)
+    aggregator.counts()
+    aggregator.recent_activity({})
+    aggregator.visitor_details(number_slides=None)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    connection.send((time.perf_counter() - started, (peak - baseline) * 1024))
+    connection.close()
+
+
+def benchmark_export_parsing(count, visitors=500):
+    """
+    Builds the dashboard from a synthetic export of `count` events, once
+    reading the whole body into a list of events as the view used to and
+    once streaming it line by line. Each mode runs in its own process and
+    is reported as (seconds, peak RSS growth in bytes).
+    """
+    context = get_context('fork')
+    results = {}
+    for mode in ('buffered', 'streamed'):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_dashboard_from_export, args=(mode, count, visitors, sender))
+        process.start()
+        results[mode] = receiver.recv()
+        process.join()
+    return results
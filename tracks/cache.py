@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_LOCK_TIMEOUT = 300
+DASHBOARD_LOCK_WAIT = 0.1
+DASHBOARD_WAIT_TIMEOUT = 60
+DASHBOARD_REFRESH_THREADS = 4
+
+_refresh_slots = threading.BoundedSemaphore(DASHBOARD_REFRESH_THREADS)
+
+
+class DashboardBusy(Exception):
+    """The dashboard is being built by another request and was not ready in time."""
+
+
+def _dashboard_key(startup_id):
+    return f'tracking_dashboard_{startup_id}'
+
+
+def _store(key, data):
+    cache.set(key, {'data': data, 'built_at': time.time()}, timeout=settings.TRACK_DASHBOARD_CACHE_TIMEOUT)
+
+
+def run_in_background(target):
+    """
+    Runs target in a thread, closing the database connections it opened.
+    At most DASHBOARD_REFRESH_THREADS run at once per process; returns
+    False without running target when they are all busy.
+    """
+    slots = _refresh_slots
+    if not slots.acquire(blocking=False):
+        return False
+
+    def run():
+        close_old_connections()
+        try:
+            target()
+        finally:
+            connections.close_all()
+            slots.release()
+    threading.Thread(target=run, daemon=True).start()
+    return True
+
+
+def _refresh(key, lock_key, build):
+    try:
+        _store(key, build())
+    except Exception as e:
+        logger.error('Error refreshing %s: %s', key, e)
+    finally:
+        cache.delete(lock_key)
+
+
+def get_cached_dashboard(startup_id, build):
+    """
+    Returns the tracking dashboard of a startup. An entry older than
+    TRACK_DASHBOARD_FRESH_FOR is still returned right away, while a single
+    background refresh rebuilds it. Only a missing entry is built in the
+    request, and concurrent requests wait for that build instead of
+    starting their own. The lock is held in the cache, so it is shared by
+    every worker. When the cache is unavailable the dashboard is built
+    without it.
+    """
+    key = _dashboard_key(startup_id)
+    lock_key = f'{key}_lock'
+    entry = cache.get(key)
+    if entry is not None:
+        if time.time() - entry['built_at'] > settings.TRACK_DASHBOARD_FRESH_FOR:
+            if cache.add(lock_key, 1, timeout=DASHBOARD_LOCK_TIMEOUT):
+                if not run_in_background(lambda: _refresh(key, lock_key, build)):
+                    cache.delete(lock_key)
+        return entry['data']
+
+    deadline = time.monotonic() + DASHBOARD_WAIT_TIMEOUT
+    while True:
+        locked = cache.add(lock_key, 1, timeout=DASHBOARD_LOCK_TIMEOUT)
+        if locked is None:
+            # django-redis returns None instead of raising when Redis is down
+            return build()
+        if locked:
+            break
+        time.sleep(DASHBOARD_LOCK_WAIT)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['data']
+        if time.monotonic() > deadline:
+            raise DashboardBusy("The dashboard is being computed, try again shortly")
+
+    try:
+        data = build()
+        _store(key, data)
+    finally:
+        cache.delete(lock_key)
+    return data
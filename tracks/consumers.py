@@ -0,0 +1,132 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from mixpanel import Consumer, MixpanelException
+
+logger = logging.getLogger(__name__)
+
+# Most messages Mixpanel accepts in one request per endpoint
+BATCH_LIMITS = {
+    'events': 50,
+    'people': 50,
+    'groups': 50,
+    'imports': 2000,
+}
+
+
+class InMemoryConsumer:
+    """
+    Mixpanel consumer that keeps what it is sent instead of posting it, as
+    (endpoint, message) pairs. Stands in for Mixpanel in tests.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def send(self, endpoint, json_message, api_key=None, api_secret=None):
+        self.messages.append((endpoint, json.loads(json_message)))
+
+    def flush(self):
+        pass
+
+    def clear(self):
+        self.messages = []
+
+
+class BackgroundConsumer:
+    """
+    Mixpanel consumer that buffers messages and posts them from a
+    background thread, in batches of up to BATCH_LIMITS messages, every
+    `interval` seconds or as soon as an endpoint has a full batch. Sending
+    a message never waits on Mixpanel. Messages Mixpanel fails to take are
+    retried on the next flushes, up to `max_attempts` times and while fewer
+    than `max_buffered` are waiting, and logged when they are dropped.
+    """
+
+    def __init__(self, consumer=None, interval=None, max_buffered=None, max_attempts=None):
+        self.consumer = consumer or Consumer()
+        self.interval = interval or settings.MIXPANEL_FLUSH_INTERVAL
+        self.max_buffered = max_buffered or settings.MIXPANEL_MAX_BUFFERED
+        self.max_attempts = max_attempts or settings.MIXPANEL_MAX_ATTEMPTS
+        # (message, failed attempts) pairs per (endpoint, api_key, api_secret)
+        self._buffers = defaultdict(list)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush, requeue=False)
+
+    def send(self, endpoint, json_message, api_key=None, api_secret=None):
+        if endpoint not in BATCH_LIMITS:
+            raise MixpanelException(f'No such endpoint "{endpoint}"')
+        key = (endpoint, api_key, api_secret)
+        with self._lock:
+            buffer = self._buffers[key]
+            buffer.append((json_message, 0))
+            # Messages put back by a failed flush don't trigger a flush on every send
+            full = len(buffer) % BATCH_LIMITS[endpoint] == 0
+        self._start()
+        if full:
+            self._wake.set()
+
+    def _start(self):
+        # The thread does not survive a fork, so each worker process starts its own
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self, requeue=True):
+        """Posts every buffered message."""
+        with self._lock:
+            buffers, self._buffers = self._buffers, defaultdict(list)
+        for key, entries in buffers.items():
+            endpoint, api_key, api_secret = key
+            limit = BATCH_LIMITS[endpoint]
+            retries = []
+            dropped = []
+            for start in range(0, len(entries), limit):
+                batch = entries[start:start + limit]
+                try:
+                    message = '[' + ','.join(message for message, _ in batch) + ']'
+                    self.consumer.send(endpoint, message, api_key=api_key, api_secret=api_secret)
+                except MixpanelException as e:
+                    logger.error('Error sending %s Mixpanel messages to %s: %s', len(batch), endpoint, e)
+                    for message, attempts in batch:
+                        if requeue and attempts + 1 < self.max_attempts:
+                            retries.append((message, attempts + 1))
+                        else:
+                            dropped.append(message)
+            if retries and not self._requeue(key, retries):
+                dropped.extend(message for message, _ in retries)
+            if dropped:
+                logger.error('Dropping %s Mixpanel messages to %s:\n%s', len(dropped), endpoint, '\n'.join(dropped))
+
+    def _requeue(self, key, entries):
+        """Puts messages back ahead of the ones buffered since, unless the buffer is full."""
+        with self._lock:
+            buffer = self._buffers[key]
+            if len(buffer) + len(entries) > self.max_buffered:
+                return False
+            buffer[:0] = entries
+        return True
+
+
+def get_consumer():
+    """Builds the Mixpanel consumer named by MIXPANEL_CONSUMER."""
+    return import_string(settings.MIXPANEL_CONSUMER)()
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from tracks.benchmarks import benchmark_export_parsing, compare_dashboard_aggregation, synthetic_events
+
+
+class Command(BaseCommand):
+    help = 'Time the tracking dashboard aggregation on synthetic events against the per-section implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=1000000)
+        parser.add_argument('--visitors', type=int, default=500)
+        parser.add_argument('--export', action='store_true', help='Compare reading the whole export against streaming it, with peak RSS')
+
+    def handle(self, *args, **options):
+        if options['export']:
+            results = benchmark_export_parsing(options['events'], visitors=options['visitors'])
+            for mode, (seconds, rss) in results.items():
+                self.stdout.write(f"{mode}: {seconds:.2f}s, peak RSS +{rss / 2 ** 20:.0f} MB")
+            return
+
+        events = synthetic_events(options['events'], visitors=options['visitors'])
+        result = compare_dashboard_aggregation(events)
+        self.stdout.write(f"per-section methods: {result['reference_seconds']:.2f}s")
+        self.stdout.write(f"DashboardAggregator: {result['aggregator_seconds']:.2f}s")
+        if result['matches']:
+            self.stdout.write(self.style.SUCCESS('Outputs match'))
+        else:
+            self.stdout.write(self.style.ERROR('Outputs differ'))
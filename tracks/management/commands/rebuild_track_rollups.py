@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from tracks.rollups import ROLLUP_DAYS, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily tracking rollups from the stored events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ROLLUP_DAYS, help='Number of past days to recompute')
+
+    def handle(self, *args, **options):
+        since = timezone.localdate() - timedelta(days=options['days'])
+        rebuild_rollups(since)
+        self.stdout.write(self.style.SUCCESS(f'Rollups rebuilt since {since}'))
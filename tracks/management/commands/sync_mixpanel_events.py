@@ -0,0 +1,13 @@
+from pjbackend.workers import WorkerCommand
+from tracks.sync import sync_due_startups
+
+
+class Command(WorkerCommand):
+    help = 'Copy the new Mixpanel events of active startups into the local tracking store'
+    interval = 30
+    loop_help = 'Keep syncing startups as they become due'
+
+    def process_batch(self, batch_size):
+        synced = sync_due_startups(batch_size=batch_size)
+        if synced:
+            return f'{synced} startups synced'
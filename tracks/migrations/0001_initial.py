@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:21
+
+from django.db import migrations, models
+
+
+def create_time_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE INDEX tracks_trackevent_time_brin ON tracks_trackevent USING brin ("time")')
+
+
+def drop_time_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS tracks_trackevent_time_brin')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('startup_id', models.UUIDField(blank=True, null=True)),
+                ('event', models.CharField(max_length=255)),
+                ('distinct_id', models.CharField(max_length=255)),
+                ('email', models.CharField(blank=True, max_length=255, null=True)),
+                ('time', models.DateTimeField()),
+                ('insert_id', models.CharField(max_length=64, unique=True)),
+                ('properties', models.JSONField(default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['startup_id', 'event', 'time'], name='tracks_startup_event_time')],
+            },
+        ),
+        migrations.RunPython(create_time_brin_index, drop_time_brin_index),
+    ]
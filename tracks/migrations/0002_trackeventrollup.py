@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackEventRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('startup_id', models.UUIDField()),
+                ('event', models.CharField(max_length=255)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='trackeventrollup',
+            constraint=models.UniqueConstraint(fields=('startup_id', 'event', 'day'), name='tracks_rollup_startup_event_day'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('startups', '0011_startupslidedeck_manifest'),
+        ('tracks', '0002_trackeventrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MixpanelSync',
+            fields=[
+                ('startup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='mixpanel_sync', serialize=False, to='startups.startup')),
+                ('synced_through', models.DateField(blank=True, null=True)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('next_sync_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,191 @@
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from pjbackend.workers import retry_at
+
+# Larger timestamps are in milliseconds: in seconds they would be past the year 5000
+MILLISECOND_TIMESTAMPS = 1e11
+
+
+class TrackEvent(models.Model):
+    """
+    A tracking event as received by TrackEventView, kept alongside the copy
+    sent to Mixpanel. Rows are only ever appended, in roughly time order.
+    """
+    startup_id = models.UUIDField(blank=True, null=True)
+    event = models.CharField(max_length=255)
+    distinct_id = models.CharField(max_length=255)
+    email = models.CharField(max_length=255, blank=True, null=True)
+    time = models.DateTimeField()
+    insert_id = models.CharField(max_length=64, unique=True)
+    properties = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['startup_id', 'event', 'time'], name='tracks_startup_event_time'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.startup_id} {self.time}"
+
+    @staticmethod
+    def _parse_startup_id(value):
+        try:
+            return uuid.UUID(str(value))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def parse_time(value):
+        """
+        The time of a Mixpanel `time` property, a Unix timestamp in seconds
+        or milliseconds, or now when it is missing. Raises ValueError for
+        anything else.
+        """
+        if value is None:
+            return timezone.now()
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("time must be a Unix timestamp")
+        if abs(value) > MILLISECOND_TIMESTAMPS:
+            value = value / 1000
+        try:
+            return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+        except (OverflowError, OSError, ValueError):
+            raise ValueError("time is out of range")
+
+    @classmethod
+    def from_properties(cls, distinct_id, event_name, properties):
+        """Builds the row of an event, with the `$insert_id` Mixpanel dedupes it by."""
+        properties = dict(properties)
+        insert_id = str(properties.get('$insert_id') or uuid.uuid4().hex)
+        properties['$insert_id'] = insert_id
+        time = cls.parse_time(properties.get('time'))
+        properties['time'] = time.timestamp()
+        return cls(
+            startup_id=cls._parse_startup_id(properties.get('startup_id')),
+            event=event_name,
+            distinct_id=distinct_id,
+            email=properties.get('email_as_user_id') or None,
+            time=time,
+            insert_id=insert_id,
+            properties=properties
+        )
+
+    @classmethod
+    def record(cls, distinct_id, event_name, properties):
+        """Stores the event and counts it in its daily rollup."""
+        return cls.record_many([(distinct_id, event_name, properties)])[0]
+
+    @classmethod
+    def record_many(cls, events):
+        """
+        Stores a list of (distinct_id, event_name, properties) events in one
+        transaction and counts them in their daily rollups. Events whose
+        `$insert_id` is already stored, e.g. when a client retries a
+        batch, are neither stored nor counted again.
+        """
+        rows = [cls.from_properties(*event) for event in events]
+        new_rows = {row.insert_id: row for row in rows}
+        with transaction.atomic():
+            for insert_id in cls.objects.filter(insert_id__in=list(new_rows)).values_list('insert_id', flat=True):
+                del new_rows[insert_id]
+            cls.objects.bulk_create(new_rows.values(), ignore_conflicts=True)
+            counts = Counter(
+                (row.startup_id, row.event, timezone.localdate(row.time))
+                for row in new_rows.values() if row.startup_id is not None
+            )
+            for (startup_id, event, day), count in counts.items():
+                TrackEventRollup.add(startup_id, event, day, count)
+        return rows
+
+    @classmethod
+    def export_events(cls, startup_id, event_names, since, with_email=False):
+        """
+        Yields the startup's events since `since` shaped like the lines of
+        the Mixpanel export API, oldest first. `with_email` skips events of
+        anonymous visitors.
+        """
+        rows = cls.objects.filter(
+            startup_id=startup_id,
+            event__in=event_names,
+            time__gte=since
+        )
+        if with_email:
+            rows = rows.filter(email__isnull=False)
+        rows = rows.order_by('time').values_list('event', 'properties')
+        for event, properties in rows.iterator(chunk_size=2000):
+            yield {'event': event, 'properties': properties}
+
+
+class TrackEventRollup(models.Model):
+    """
+    Number of events per startup, event and day (in TIME_ZONE), kept up
+    to date as events are recorded.
+    """
+    startup_id = models.UUIDField()
+    event = models.CharField(max_length=255)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['startup_id', 'event', 'day'], name='tracks_rollup_startup_event_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.event} {self.startup_id} {self.day}: {self.count}"
+
+    @classmethod
+    def add(cls, startup_id, event, day, count=1):
+        """
+        Adds `count` events to the row of the day with a single UPDATE,
+        creating it on the first event of the day. Rows are never locked
+        beyond that statement, so concurrent events don't queue on them.
+        """
+        rows = cls.objects.filter(startup_id=startup_id, event=event, day=day)
+        if rows.update(count=F('count') + count):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(startup_id=startup_id, event=event, day=day, count=count)
+        except IntegrityError:
+            # Another event created the row first
+            rows.update(count=F('count') + count)
+
+
+class MixpanelSync(models.Model):
+    """
+    How far a startup's Mixpanel events have been copied into TrackEvent:
+    every day before `synced_through` is complete, and the next sync
+    pulls from that day on.
+    """
+    startup = models.OneToOneField('startups.Startup', on_delete=models.CASCADE, primary_key=True, related_name='mixpanel_sync')
+    synced_through = models.DateField(blank=True, null=True)
+    last_synced_at = models.DateTimeField(blank=True, null=True)
+    next_sync_at = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.startup_id} through {self.synced_through}"
+
+    def mark_synced(self, through):
+        self.synced_through = through
+        self.last_synced_at = timezone.now()
+        self.next_sync_at = self.last_synced_at + timedelta(seconds=settings.MIXPANEL_SYNC_INTERVAL)
+        self.attempts = 0
+        self.last_error = None
+        self.save(update_fields=['synced_through', 'last_synced_at', 'next_sync_at', 'attempts', 'last_error'])
+
+    def mark_failed(self, error):
+        """Retries with exponential backoff, never waiting longer than a regular sync."""
+        self.attempts += 1
+        self.last_error = str(error)
+        self.next_sync_at = retry_at(self.attempts, settings.MIXPANEL_SYNC_RETRY_DELAY, settings.MIXPANEL_SYNC_INTERVAL)
+        self.save(update_fields=['attempts', 'last_error', 'next_sync_at'])
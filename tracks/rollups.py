@@ -0,0 +1,91 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import TrackEvent, TrackEventRollup
+
+TRACKED_EVENTS = ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Total_Shares"]
+ROLLUP_DAYS = 365
+
+
+def rebuild_rollups(since, startup_id=None):
+    """
+    Recomputes the rollups of every day from `since` on from the stored
+    events, of one startup or all of them, e.g. for events recorded
+    before rollups existed or copied from Mixpanel.
+    """
+    events = TrackEvent.objects.filter(
+        startup_id__isnull=False,
+        time__gte=timezone.make_aware(datetime.combine(since, datetime.min.time()))
+    )
+    rollups = TrackEventRollup.objects.filter(day__gte=since)
+    if startup_id is not None:
+        events = events.filter(startup_id=startup_id)
+        rollups = rollups.filter(startup_id=startup_id)
+    rows = events.annotate(day=TruncDate('time')).values('startup_id', 'event', 'day').annotate(
+        count=Count('id')
+    ).order_by()
+    with transaction.atomic():
+        list(rollups.select_for_update())
+        rollups.delete()
+        TrackEventRollup.objects.bulk_create([TrackEventRollup(**row) for row in rows.iterator()], batch_size=1000)
+
+
+def _series(totals, counts, labels, key):
+    return {
+        event: {
+            "total": totals[event],
+            key: [{"date": label, "qty": counts[event].get(label, 0)} for label in labels]
+        } for event in TRACKED_EVENTS
+    }
+
+
+def dashboard_counts(startup_id, now=None):
+    """
+    Builds the main values and the weekly, monthly, six-monthly and
+    yearly series of the tracking dashboard from the rollups of the last
+    year, in the shape InitialTackDashBoardView computes them from raw
+    events.
+    """
+    now = timezone.localtime(now)
+    today = now.date()
+    rows = TrackEventRollup.objects.filter(
+        startup_id=startup_id,
+        event__in=TRACKED_EVENTS,
+        day__gte=today - timedelta(days=ROLLUP_DAYS)
+    ).values_list('event', 'day', 'count')
+
+    totals = {event: 0 for event in TRACKED_EVENTS}
+    by_day = {event: defaultdict(int) for event in TRACKED_EVENTS}
+    by_month = {event: defaultdict(int) for event in TRACKED_EVENTS}
+    for event, day, count in rows:
+        totals[event] += count
+        by_day[event][day.strftime("%Y-%m-%d")] += count
+        by_month[event][day.strftime("%Y-%m")] += count
+
+    last_24_hours = dict(TrackEvent.objects.filter(
+        startup_id=startup_id,
+        event__in=TRACKED_EVENTS,
+        time__gt=now - timedelta(days=1)
+    ).values('event').annotate(count=Count('id')).values_list('event', 'count').order_by())
+
+    def days(number):
+        return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in reversed(range(number))]
+
+    def months(number):
+        return [(now - relativedelta(months=i)).strftime("%Y-%m") for i in reversed(range(number))]
+
+    return {
+        'main_values': {
+            event: {"total": totals[event], "last_24_hours": last_24_hours.get(event, 0)} for event in TRACKED_EVENTS
+        },
+        'by_day': _series(totals, by_day, days(7), "days"),
+        'by_month': _series(totals, by_day, days(30), "days"),
+        'by_six_month': _series(totals, by_month, months(6), "months"),
+        'by_year': _series(totals, by_month, months(12), "months"),
+    }
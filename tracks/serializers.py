@@ -1,6 +1,19 @@
 from rest_framework import serializers
 
+from .models import TrackEvent
+
+
 class TrackEventSerializer(serializers.Serializer):
     event_name = serializers.CharField(max_length=255)
     distinct_id = serializers.CharField(max_length=255, default='anonymous')
-    properties = serializers.DictField(required=False)
\ No newline at end of file
+    properties = serializers.DictField(required=False)
+
+    def validate_properties(self, value):
+        insert_id = value.get('$insert_id')
+        if insert_id is not None and len(str(insert_id)) > 64:
+            raise serializers.ValidationError("$insert_id can't be longer than 64 characters")
+        try:
+            TrackEvent.parse_time(value.get('time'))
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
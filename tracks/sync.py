@@ -0,0 +1,185 @@
+import base64
+import hashlib
+import json
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from pjbackend.workers import lease_due
+from startups.models import Startup
+from .models import MixpanelSync, TrackEvent
+from .rollups import rebuild_rollups
+
+logger = logging.getLogger(__name__)
+
+EXPORT_URL = 'https://data.mixpanel.com/api/2.0/export/'
+EXPORT_CHUNK_SIZE = 65536
+EXPORT_TIMEOUT = (10, 300)
+EXPORT_SPOOL_SIZE = 2 ** 20
+DASHBOARD_EVENTS = ["Visit_Startup_Page", "Click_Pitch_Deck", "Click_Video", "Deck_Download", "Click_Pass_Startup_Button", "Click_Connect_Startup_Button", "Total_Shares"]
+
+
+def request_export(startup_id, from_date, to_date):
+    """Starts a streamed export of the startup's dashboard events, both dates included."""
+    params = {
+        'from_date': from_date.strftime("%Y-%m-%d"),
+        'to_date': to_date.strftime("%Y-%m-%d"),
+        'event': json.dumps(DASHBOARD_EVENTS),
+        'where': f'properties["startup_id"] == "{startup_id}"'
+    }
+    headers = {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Authorization": "Basic " + base64.b64encode(f"{settings.MIXPANEL_API_SECRET}:".encode()).decode(),
+    }
+    return requests.get(EXPORT_URL, params=params, headers=headers, stream=True, timeout=EXPORT_TIMEOUT)
+
+
+def parse_export(response):
+    """
+    Yields the events of an export response one JSON line at a time, as
+    the body streams in. A failed export yields nothing.
+    """
+    with response:
+        if response.status_code != 200:
+            return
+        for line in response.iter_lines(chunk_size=EXPORT_CHUNK_SIZE):
+            if line.strip():
+                yield json.loads(line)
+
+
+def export_shards(from_date, to_date):
+    """Splits a date range, both ends included, into calendar months."""
+    shards = []
+    start = from_date
+    while start <= to_date:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        end = min(next_month - timedelta(days=1), to_date)
+        shards.append((start, end))
+        start = end + timedelta(days=1)
+    return shards
+
+
+def _download_shard(startup_id, from_date, to_date):
+    """
+    Downloads the export of one shard to a temporary file, which stays in
+    memory while small, retrying the shard alone when it fails.
+    """
+    attempts = settings.MIXPANEL_EXPORT_SHARD_ATTEMPTS
+    for attempt in range(1, attempts + 1):
+        buffer = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        try:
+            with request_export(startup_id, from_date, to_date) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=EXPORT_CHUNK_SIZE):
+                    buffer.write(chunk)
+            buffer.seek(0)
+            return buffer
+        except requests.RequestException as e:
+            buffer.close()
+            if attempt == attempts:
+                raise
+            logger.warning('Retrying Mixpanel export of %s from %s to %s: %s', startup_id, from_date, to_date, e)
+            time.sleep(settings.MIXPANEL_EXPORT_RETRY_DELAY * 2 ** (attempt - 1))
+
+
+def fetch_export(startup_id, from_date, to_date):
+    """
+    Yields the startup's dashboard events between the two dates, both
+    included. The range is fetched as monthly shards on a bounded thread
+    pool, and the shards are read back in date order so events keep the
+    order of a single export.
+    """
+    with ThreadPoolExecutor(max_workers=settings.MIXPANEL_EXPORT_WORKERS) as pool:
+        futures = [
+            pool.submit(_download_shard, startup_id, start, end)
+            for start, end in export_shards(from_date, to_date)
+        ]
+        try:
+            for future in futures:
+                with future.result() as buffer:
+                    for line in buffer:
+                        if line.strip():
+                            yield json.loads(line)
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _exported_event(event):
+    properties = dict(event['properties'])
+    if not properties.get('$insert_id'):
+        # Events tracked without one get an id derived from their content,
+        # so pulling the same day again does not duplicate them.
+        properties['$insert_id'] = hashlib.sha1(json.dumps(event, sort_keys=True).encode()).hexdigest()
+    return TrackEvent.from_properties(properties.get('distinct_id', 'anonymous'), event['event'], properties)
+
+
+def store_exported_events(events, batch_size=1000):
+    """
+    Adds exported events to TrackEvent, skipping the ones already stored
+    by TrackEventView or an earlier sync, and returns how many were read.
+    """
+    batch = []
+    count = 0
+    for event in events:
+        batch.append(_exported_event(event))
+        count += 1
+        if len(batch) >= batch_size:
+            TrackEvent.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    TrackEvent.objects.bulk_create(batch, ignore_conflicts=True)
+    return count
+
+
+def sync_startup(sync):
+    """
+    Pulls the days since the startup's watermark from the Mixpanel export,
+    refreshes their rollups and moves the watermark to today. The day of
+    the watermark is pulled again, since it may have been synced while
+    still in progress. Events are stored as they stream in, outside any
+    transaction, since storing them twice is harmless; only the rollups
+    and the watermark are committed together.
+    """
+    today = timezone.now().date()
+    from_date = sync.synced_through or today - timedelta(days=settings.MIXPANEL_SYNC_HISTORY_DAYS)
+    events = fetch_export(sync.startup_id, from_date, today)
+    count = store_exported_events(events)
+    with transaction.atomic():
+        rebuild_rollups(from_date - timedelta(days=1), startup_id=sync.startup_id)
+        sync.mark_synced(today)
+    return count
+
+
+def schedule_active_startups():
+    """Creates the sync state of active startups that have none yet."""
+    MixpanelSync.objects.bulk_create([
+        MixpanelSync(startup_id=startup_id)
+        for startup_id in Startup.objects.filter(is_active=True, mixpanel_sync__isnull=True).values_list('id', flat=True)
+    ], ignore_conflicts=True)
+
+
+def sync_due_startups(batch_size=None):
+    """Syncs one batch of active startups whose sync is due and returns its size."""
+    if not settings.MIXPANEL_API_SECRET:
+        return 0
+    schedule_active_startups()
+    syncs = lease_due(
+        MixpanelSync.objects.filter(startup__is_active=True).order_by('next_sync_at'),
+        'next_sync_at',
+        batch_size or settings.MIXPANEL_SYNC_BATCH_SIZE,
+        settings.MIXPANEL_SYNC_LEASE_TIMEOUT
+    )
+    for sync in syncs:
+        try:
+            sync_startup(sync)
+        except Exception as e:
+            logger.error('Error syncing Mixpanel events of %s: %s', sync.startup_id, e)
+            sync.mark_failed(e)
+    return len(syncs)
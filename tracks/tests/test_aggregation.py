@@ -0,0 +1,80 @@
+import pytest
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from startups.tests.fixtures import common_startup
+from tracks.aggregation import DashboardAggregator
+from tracks.benchmarks import SyntheticExportResponse, compare_dashboard_aggregation, synthetic_events
+from tracks.sync import parse_export
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_aggregator_matches_per_section_methods(main_startup):
+    events = synthetic_events(3000, visitors=25, seed=7)
+
+    assert compare_dashboard_aggregation(events, main_startup.id)["matches"]
+
+
+@pytest.mark.django_db
+def test_latest_event_follows_stream_order(main_startup):
+    events = [
+        {"event": "Click_Video", "properties": {"time": 200, "email_as_user_id": "a@example.com", "finished_video": True}},
+        {"event": "Click_Pitch_Deck", "properties": {"time": 100, "email_as_user_id": "a@example.com", "total_time": 5}},
+        {"event": "Total_Shares", "properties": {"time": 300, "email_as_user_id": "a@example.com", "count": 2.5}},
+        {"event": "Visit_Startup_Page", "properties": {"time": 300, "email_as_user_id": "a@example.com", "time_spent_on_page": "12"}},
+    ]
+
+    assert compare_dashboard_aggregation(events, main_startup.id)["matches"]
+    (email, details), = DashboardAggregator.from_events(events).visitor_details(number_slides=None)
+    assert details["latestPitchDeck"]["totalTime"] is None
+    assert details["latestVideo"]["finishedVideo"] is True
+    assert details["totalShares"] == 2.5
+    assert details["totalTimeSpentOnPages"] == 12
+
+
+def test_chunked_aggregation_matches_single_chunk():
+    events = synthetic_events(2000, visitors=40, seed=3)
+    aggregator = DashboardAggregator.from_events(events)
+    chunked = DashboardAggregator.from_events(iter(events), now=aggregator.now, chunk_size=97)
+
+    assert chunked.counts() == aggregator.counts()
+    assert chunked.recent_activity({}) == aggregator.recent_activity({})
+    assert chunked.visitor_details(number_slides=4) == aggregator.visitor_details(number_slides=4)
+
+
+def test_export_parsed_as_it_streams():
+    response = SyntheticExportResponse(5)
+    response.iter_lines = lambda chunk_size: iter([b'{"event": "Click_Video", "properties": {"time": 1}}', b"", b"   "])
+
+    events = parse_export(response)
+
+    assert next(events) == {"event": "Click_Video", "properties": {"time": 1}}
+    assert list(events) == []
+
+
+@pytest.mark.django_db
+def test_dashboard_streams_mixpanel_export(main_user_token, main_startup, mocker):
+    export = mocker.patch("tracks.sync.requests.get", return_value=SyntheticExportResponse(300, visitors=10))
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+
+    response = client.get(reverse("initial-dashboard"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert export.call_args.kwargs["stream"] is True
+    assert len(response.json()["reviewsDashBoard"]) == 10
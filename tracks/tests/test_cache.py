@@ -0,0 +1,139 @@
+import threading
+
+import pytest
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from startups.tests.fixtures import common_startup
+from tracks import cache as dashboard_cache
+from tracks.cache import DashboardBusy, get_cached_dashboard
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def background(mocker):
+    """Collects background refreshes instead of starting threads."""
+    targets = []
+    mocker.patch("tracks.cache.run_in_background", side_effect=lambda target: targets.append(target) or True)
+    return targets
+
+
+def _make_stale(settings):
+    settings.TRACK_DASHBOARD_FRESH_FOR = -1
+
+
+def test_fresh_dashboard_built_once(background, mocker):
+    build = mocker.Mock(return_value={"visits": 1})
+
+    assert get_cached_dashboard("startup", build) == {"visits": 1}
+    assert get_cached_dashboard("startup", build) == {"visits": 1}
+    build.assert_called_once()
+    assert background == []
+
+
+def test_stale_dashboard_served_while_one_refresh_runs(background, settings):
+    get_cached_dashboard("startup", lambda: {"visits": 1})
+    _make_stale(settings)
+
+    assert get_cached_dashboard("startup", lambda: {"visits": 2}) == {"visits": 1}
+    assert get_cached_dashboard("startup", lambda: {"visits": 3}) == {"visits": 1}
+    assert len(background) == 1
+
+    background[0]()
+    settings.TRACK_DASHBOARD_FRESH_FOR = 600
+    assert get_cached_dashboard("startup", lambda: {"visits": 4}) == {"visits": 2}
+
+
+def test_failed_refresh_releases_lock(background, settings):
+    get_cached_dashboard("startup", lambda: {"visits": 1})
+    _make_stale(settings)
+
+    def failing_build():
+        raise ValueError("export failed")
+
+    get_cached_dashboard("startup", failing_build)
+    background[0]()
+    assert get_cached_dashboard("startup", lambda: {"visits": 2}) == {"visits": 1}
+    assert len(background) == 2
+
+
+def test_waits_for_dashboard_being_built(mocker):
+    cache.add("tracking_dashboard_startup_lock", 1)
+
+    def other_builder_finishes(seconds):
+        dashboard_cache._store("tracking_dashboard_startup", {"visits": 5})
+
+    mocker.patch("tracks.cache.time.sleep", side_effect=other_builder_finishes)
+    build = mocker.Mock(return_value={"visits": 6})
+
+    assert get_cached_dashboard("startup", build) == {"visits": 5}
+    build.assert_not_called()
+
+
+def test_waiter_gives_up_without_building(mocker):
+    cache.add("tracking_dashboard_startup_lock", 1)
+    mocker.patch("tracks.cache.time.sleep")
+    mocker.patch("tracks.cache.DASHBOARD_WAIT_TIMEOUT", -1)
+    build = mocker.Mock()
+
+    with pytest.raises(DashboardBusy):
+        get_cached_dashboard("startup", build)
+    build.assert_not_called()
+
+
+def test_dashboard_built_without_cache_when_unavailable(mocker):
+    mocker.patch("tracks.cache.cache.get", return_value=None)
+    mocker.patch("tracks.cache.cache.add", return_value=None)
+    sleep = mocker.patch("tracks.cache.time.sleep")
+
+    assert get_cached_dashboard("startup", lambda: {"visits": 1}) == {"visits": 1}
+    sleep.assert_not_called()
+
+
+def test_stale_dashboard_served_when_refresh_threads_busy(mocker, settings):
+    get_cached_dashboard("startup", lambda: {"visits": 1})
+    _make_stale(settings)
+    mocker.patch("tracks.cache.run_in_background", return_value=False)
+
+    assert get_cached_dashboard("startup", lambda: {"visits": 2}) == {"visits": 1}
+    assert cache.get("tracking_dashboard_startup_lock") is None
+
+
+def test_background_refresh_threads_bounded(mocker):
+    slots = threading.BoundedSemaphore(1)
+    mocker.patch("tracks.cache._refresh_slots", slots)
+    release = threading.Event()
+
+    assert dashboard_cache.run_in_background(release.wait)
+    assert not dashboard_cache.run_in_background(release.wait)
+    release.set()
+
+    # The finished thread hands its slot back to the semaphore it took it from
+    assert slots.acquire(timeout=5)
+
+
+@pytest.mark.django_db
+def test_dashboard_view_exports_once(main_user_token, main_startup, mocker, background):
+    build = mocker.patch("tracks.views.InitialTackDashBoardView._build_dashboard", return_value={"reviewsDashBoard": []})
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+
+    assert client.get(reverse("initial-dashboard")).status_code == status.HTTP_200_OK
+    response = client.get(reverse("initial-dashboard"))
+
+    assert response.json() == {"reviewsDashBoard": []}
+    build.assert_called_once()
@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+from mixpanel import MixpanelException
+
+from tracks.consumers import BackgroundConsumer, InMemoryConsumer
+
+
+def _message(number):
+    return json.dumps({"event": "Visit_Startup_Page", "properties": {"number": number}})
+
+
+def test_flush_batches_up_to_endpoint_limit():
+    sink = InMemoryConsumer()
+    consumer = BackgroundConsumer(consumer=sink, interval=3600)
+    consumer._start = lambda: None
+    for number in range(120):
+        consumer.send("events", _message(number))
+    consumer.send("imports", _message(120), api_key="key", api_secret="secret")
+
+    consumer.flush()
+
+    assert [(endpoint, len(batch)) for endpoint, batch in sink.messages] == [("events", 50), ("events", 50), ("events", 20), ("imports", 1)]
+    assert [message["properties"]["number"] for _, batch in sink.messages for message in batch] == list(range(121))
+    consumer.flush()
+    assert len(sink.messages) == 4
+
+
+class FailingConsumer(InMemoryConsumer):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def send(self, *args, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise MixpanelException("Mixpanel is down")
+        super().send(*args, **kwargs)
+
+
+def test_failed_batch_retried_on_next_flush():
+    sink = FailingConsumer(failures=2)
+    consumer = BackgroundConsumer(consumer=sink, interval=3600)
+    consumer._start = lambda: None
+    for number in range(60):
+        consumer.send("events", _message(number))
+
+    consumer.flush()
+    assert sink.messages == []
+    consumer.send("events", _message(60))
+    consumer.flush()
+
+    assert [message["properties"]["number"] for _, batch in sink.messages for message in batch] == list(range(61))
+
+
+def test_failed_batch_dropped_and_logged_when_buffer_full(caplog):
+    sink = FailingConsumer(failures=1)
+    consumer = BackgroundConsumer(consumer=sink, interval=3600, max_buffered=10)
+    consumer._start = lambda: None
+    for number in range(20):
+        consumer.send("events", _message(number))
+
+    consumer.flush()
+    consumer.flush()
+
+    assert sink.messages == []
+    assert "Dropping 20 Mixpanel messages" in caplog.text
+    assert _message(19) in caplog.text
+
+
+def test_always_failing_batch_dropped_after_max_attempts(caplog):
+    sink = FailingConsumer(failures=10 ** 6)
+    consumer = BackgroundConsumer(consumer=sink, interval=3600, max_attempts=3)
+    consumer._start = lambda: None
+    for number in range(5):
+        consumer.send("events", _message(number))
+
+    consumer.flush()
+    consumer.flush()
+    assert "Dropping" not in caplog.text
+
+    consumer.flush()
+
+    assert "Dropping 5 Mixpanel messages" in caplog.text
+    assert _message(4) in caplog.text
+    assert consumer._buffers[("events", None, None)] == []
+    consumer.flush()
+    assert caplog.text.count("Dropping") == 1
+
+
+def test_full_batch_flushed_in_background():
+    sent = threading.Event()
+
+    class Sink(InMemoryConsumer):
+        def send(self, *args, **kwargs):
+            super().send(*args, **kwargs)
+            sent.set()
+
+    sink = Sink()
+    consumer = BackgroundConsumer(consumer=sink, interval=3600)
+    for number in range(49):
+        consumer.send("events", _message(number))
+    assert sink.messages == []
+
+    consumer.send("events", _message(49))
+
+    assert sent.wait(5)
+    assert len(sink.messages[0][1]) == 50
+
+
+def test_unknown_endpoint_rejected():
+    with pytest.raises(MixpanelException):
+        BackgroundConsumer(consumer=InMemoryConsumer()).send("nowhere", _message(0))
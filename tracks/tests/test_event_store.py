@@ -0,0 +1,235 @@
+import pytest
+
+from datetime import timedelta
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from startups.tests.fixtures import common_startup
+from tracks.models import MixpanelSync, TrackEvent, TrackEventRollup
+from tracks.rollups import TRACKED_EVENTS, dashboard_counts, rebuild_rollups
+from tracks import views
+from tracks.benchmarks import ReferenceDashboard
+from tracks.views import DASHBOARD_EVENTS
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def mp(mocker):
+    return mocker.patch("tracks.views.mp")
+
+
+@pytest.mark.django_db
+def test_track_event_stored_and_forwarded(mp, main_startup):
+    response = APIClient().post(reverse("track-event"), {
+        "event_name": "Visit_Startup_Page",
+        "distinct_id": "investor@example.com",
+        "properties": {"startup_id": str(main_startup.id), "email_as_user_id": "investor@example.com"}
+    }, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    event = TrackEvent.objects.get()
+    assert event.startup_id == main_startup.id
+    assert event.email == "investor@example.com"
+    distinct_id, event_name, properties = mp.track.call_args.args
+    assert (distinct_id, event_name) == ("investor@example.com", "Visit_Startup_Page")
+    assert properties["$insert_id"] == event.insert_id
+    assert properties["time"] == event.time.timestamp()
+
+
+@pytest.mark.django_db
+def test_track_event_accepts_batches(main_startup):
+    consumer = views.mp._consumer
+    consumer.clear()
+    events = [{
+        "event_name": name,
+        "distinct_id": "investor@example.com",
+        "properties": {"startup_id": str(main_startup.id)}
+    } for name in ("Visit_Startup_Page", "Click_Video", "Click_Pitch_Deck")]
+
+    response = APIClient().post(reverse("track-event"), events, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert TrackEvent.objects.count() == 3
+    assert [message["event"] for _, message in consumer.messages] == ["Visit_Startup_Page", "Click_Video", "Click_Pitch_Deck"]
+
+
+@pytest.mark.django_db
+def test_retried_batch_stored_once(mp, main_startup):
+    events = [{
+        "event_name": "Click_Video",
+        "properties": {"startup_id": str(main_startup.id), "$insert_id": f"retry-{number}"}
+    } for number in range(3)]
+    client = APIClient()
+
+    client.post(reverse("track-event"), events[:2], format="json")
+    response = client.post(reverse("track-event"), events, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert TrackEvent.objects.count() == 3
+    assert TrackEventRollup.objects.get(startup_id=main_startup.id, event="Click_Video").count == 3
+    assert mp.track.call_count == 5
+
+
+@pytest.mark.django_db
+def test_failed_batch_stores_nothing(mp, main_startup, mocker):
+    mocker.patch("tracks.models.TrackEventRollup.add", side_effect=[None, DatabaseError("rollup failed")])
+    events = [{
+        "event_name": name,
+        "properties": {"startup_id": str(main_startup.id)}
+    } for name in ("Click_Video", "Visit_Startup_Page")]
+
+    response = APIClient().post(reverse("track-event"), events, format="json")
+
+    assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert TrackEvent.objects.count() == 0
+    mp.track.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_track_event_accepts_millisecond_time(mp, main_startup):
+    response = APIClient().post(reverse("track-event"), {
+        "event_name": "Click_Video",
+        "properties": {"startup_id": str(main_startup.id), "time": 1760000000123}
+    }, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    event = TrackEvent.objects.get()
+    assert event.time.timestamp() == 1760000000.123
+    assert mp.track.call_args.args[2]["time"] == 1760000000.123
+
+
+@pytest.mark.django_db
+def test_track_event_rejects_non_numeric_time(mp):
+    client = APIClient()
+
+    text = client.post(reverse("track-event"), {"event_name": "Click_Video", "properties": {"time": "yesterday"}}, format="json")
+    boolean = client.post(reverse("track-event"), {"event_name": "Click_Video", "properties": {"time": True}}, format="json")
+
+    assert text.status_code == status.HTTP_400_BAD_REQUEST
+    assert boolean.status_code == status.HTTP_400_BAD_REQUEST
+    assert TrackEvent.objects.count() == 0
+    mp.track.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_track_event_rejects_out_of_range_time(mp):
+    response = APIClient().post(reverse("track-event"), {
+        "event_name": "Click_Video",
+        "properties": {"time": 10 ** 20}
+    }, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert TrackEvent.objects.count() == 0
+    mp.track.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_track_event_rejects_invalid_batches(settings):
+    settings.TRACK_EVENT_BATCH_LIMIT = 2
+    client = APIClient()
+
+    invalid = client.post(reverse("track-event"), [{"event_name": "Click_Video"}, {"properties": {}}], format="json")
+    too_many = client.post(reverse("track-event"), [{"event_name": "Click_Video"}] * 3, format="json")
+
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+    assert too_many.status_code == status.HTTP_400_BAD_REQUEST
+    assert TrackEvent.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_local_store(mp, main_user_token, main_startup, settings, mocker):
+    settings.TRACK_DASHBOARD_SOURCE = "local"
+    export = mocker.patch("tracks.sync.requests.get")
+    now = timezone.now()
+    for days_ago in (0, 2, 400):
+        TrackEvent.record("anonymous", "Visit_Startup_Page", {
+            "startup_id": str(main_startup.id),
+            "time": (now - timedelta(days=days_ago)).timestamp()
+        })
+    TrackEvent.record("anonymous", "Visit_Startup_Page", {"startup_id": "not-a-startup"})
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    response = client.get(reverse("initial-dashboard"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["initialDashBoard"]["totalVisitor"] == {"total": 2, "last_24_hours": 1}
+    export.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_local_store_once_synced(mp, main_user_token, main_startup, mocker):
+    export = mocker.patch("tracks.sync.requests.get")
+    MixpanelSync.objects.create(startup=main_startup, synced_through=timezone.now().date())
+    TrackEvent.record("anonymous", "Click_Video", {"startup_id": str(main_startup.id)})
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    response = client.get(reverse("initial-dashboard"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["initialDashBoard"]["videoViews"] == {"total": 1, "last_24_hours": 1}
+    export.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_rollup_counts_events(main_startup):
+    for email in ("a@example.com", "a@example.com", "b@example.com", None):
+        TrackEvent.record("anonymous", "Click_Video", {"startup_id": str(main_startup.id), "email_as_user_id": email})
+
+    rollup = TrackEventRollup.objects.get(startup_id=main_startup.id, event="Click_Video")
+    assert rollup.count == 4
+
+    TrackEventRollup.objects.all().delete()
+    rebuild_rollups(timezone.localdate() - timedelta(days=1))
+    rollup = TrackEventRollup.objects.get(startup_id=main_startup.id, event="Click_Video")
+    assert rollup.count == 4
+
+
+@pytest.mark.django_db
+def test_record_updates_rollup_without_locking(main_startup):
+    properties = {"startup_id": str(main_startup.id)}
+    TrackEvent.record("anonymous", "Click_Video", properties)
+
+    with CaptureQueriesContext(connection) as context:
+        TrackEvent.record("anonymous", "Click_Video", properties)
+
+    statements = [query["sql"].split()[0] for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]
+    assert statements == ["SELECT", "INSERT", "UPDATE"]
+    assert TrackEventRollup.objects.get(startup_id=main_startup.id, event="Click_Video").count == 2
+
+
+@pytest.mark.django_db
+def test_rollup_series_match_raw_event_series(main_startup):
+    now = timezone.now()
+    for index, days_ago in enumerate((0, 0, 1, 3, 6, 12, 29, 45, 100, 200, 300, 364)):
+        TrackEvent.record("anonymous", TRACKED_EVENTS[index % 4], {
+            "startup_id": str(main_startup.id),
+            "time": (now - timedelta(days=days_ago, hours=1)).timestamp()
+        })
+    reference = ReferenceDashboard()
+    events = list(TrackEvent.export_events(main_startup.id, DASHBOARD_EVENTS, now - timedelta(days=365)))
+
+    counts = dashboard_counts(main_startup.id)
+
+    assert counts["main_values"] == reference.main_values(events)
+    assert counts["by_day"] == reference.event_counts_by_day(events)
+    assert counts["by_month"] == reference.event_counts_by_month(events)
+    assert counts["by_six_month"] == reference.event_counts_by_six_month(events)
+    assert counts["by_year"] == reference.event_counts_by_year(events)
@@ -0,0 +1,172 @@
+import json
+import pytest
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from requests import HTTPError
+
+from django.utils import timezone
+
+from startups.tests.fixtures import common_startup
+from tracks.models import MixpanelSync, TrackEvent, TrackEventRollup
+from tracks.sync import export_shards, fetch_export, sync_due_startups, sync_startup
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+class ExportResponse:
+    def __init__(self, events, status_code=200):
+        self.lines = [json.dumps(event).encode() for event in events]
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_lines(self, chunk_size=512):
+        return iter(self.lines)
+
+    def iter_content(self, chunk_size=1):
+        return (line + b"\n" for line in self.lines)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError(f"{self.status_code} Server Error")
+
+
+def export_of(events):
+    """Answers each export request with the events of its date range."""
+    def get(url, params, **kwargs):
+        from_date = datetime.strptime(params["from_date"], "%Y-%m-%d").date()
+        to_date = datetime.strptime(params["to_date"], "%Y-%m-%d").date()
+        return ExportResponse([
+            event for event in events
+            if from_date <= datetime.fromtimestamp(event["properties"]["time"], dt_timezone.utc).date() <= to_date
+        ])
+    return get
+
+
+def _event(startup, name="Visit_Startup_Page", insert_id=None, days_ago=0):
+    properties = {
+        "distinct_id": "investor@example.com",
+        "startup_id": str(startup.id),
+        "email_as_user_id": "investor@example.com",
+        "time": int((timezone.now() - timedelta(days=days_ago)).timestamp()),
+    }
+    if insert_id:
+        properties["$insert_id"] = insert_id
+    return {"event": name, "properties": properties}
+
+
+@pytest.fixture(autouse=True)
+def mixpanel_secret(settings):
+    settings.MIXPANEL_API_SECRET = "secret"
+    settings.MIXPANEL_EXPORT_RETRY_DELAY = 0
+
+
+@pytest.mark.django_db
+def test_first_sync_backfills_history(main_startup, mocker):
+    tracked = TrackEvent.record("investor@example.com", "Visit_Startup_Page", {"startup_id": str(main_startup.id)})
+    export = mocker.patch("tracks.sync.requests.get", side_effect=export_of([
+        _event(main_startup, days_ago=200),
+        _event(main_startup, name="Click_Video", days_ago=3),
+        _event(main_startup, name="Click_Video", days_ago=3),
+        _event(main_startup, insert_id=tracked.insert_id),
+    ]))
+    sync = MixpanelSync.objects.create(startup=main_startup)
+
+    assert sync_startup(sync) == 4
+
+    today = timezone.now().date()
+    ranges = sorted((call.kwargs["params"]["from_date"], call.kwargs["params"]["to_date"]) for call in export.call_args_list)
+    assert ranges[0][0] == (today - timedelta(days=365)).strftime("%Y-%m-%d")
+    assert ranges[-1][1] == today.strftime("%Y-%m-%d")
+    assert TrackEvent.objects.count() == 3
+    videos = TrackEventRollup.objects.get(startup_id=main_startup.id, event="Click_Video")
+    assert videos.count == 1
+    assert TrackEventRollup.objects.filter(event="Visit_Startup_Page").count() == 2
+    sync.refresh_from_db()
+    assert sync.synced_through == today
+    assert sync.next_sync_at > timezone.now()
+
+
+@pytest.mark.django_db
+def test_later_sync_pulls_from_watermark(main_startup, mocker):
+    watermark = timezone.now().date() - timedelta(days=2)
+    sync = MixpanelSync.objects.create(startup=main_startup, synced_through=watermark)
+    export = mocker.patch("tracks.sync.requests.get", return_value=ExportResponse([]))
+
+    sync_startup(sync)
+
+    assert export.call_args.kwargs["params"]["from_date"] == watermark.strftime("%Y-%m-%d")
+
+
+@pytest.mark.django_db
+def test_failed_export_keeps_watermark(main_startup, mocker):
+    mocker.patch("tracks.sync.requests.get", return_value=ExportResponse([], status_code=503))
+
+    assert sync_due_startups() == 1
+
+    sync = MixpanelSync.objects.get(startup=main_startup)
+    assert sync.synced_through is None
+    assert sync.attempts == 1
+    assert sync.next_sync_at > timezone.now()
+    assert sync_due_startups() == 0
+
+
+@pytest.mark.django_db
+def test_due_syncs_leased_while_exporting(main_startup, mocker):
+    def export(startup_id, from_date, to_date):
+        # A second worker finds nothing due while this export runs
+        assert sync_due_startups() == 0
+        assert MixpanelSync.objects.get(startup=main_startup).next_sync_at > timezone.now()
+        return []
+    mocker.patch("tracks.sync.fetch_export", side_effect=export)
+
+    assert sync_due_startups() == 1
+
+    assert MixpanelSync.objects.get(startup=main_startup).synced_through == timezone.now().date()
+
+
+def test_export_shards_by_month():
+    assert export_shards(date(2024, 1, 30), date(2024, 3, 2)) == [
+        (date(2024, 1, 30), date(2024, 1, 31)),
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 3, 1), date(2024, 3, 2)),
+    ]
+    assert export_shards(date(2024, 5, 4), date(2024, 5, 4)) == [(date(2024, 5, 4), date(2024, 5, 4))]
+
+
+def test_fetch_export_keeps_shard_order(mocker):
+    events = [
+        {"event": "Visit_Startup_Page", "properties": {"time": int(datetime(2024, month, 10, tzinfo=dt_timezone.utc).timestamp())}}
+        for month in (1, 2, 3, 4)
+    ]
+    mocker.patch("tracks.sync.requests.get", side_effect=export_of(events))
+
+    assert list(fetch_export("startup", date(2024, 1, 1), date(2024, 4, 30))) == events
+
+
+def test_failed_shard_retried_alone(mocker, settings):
+    event = {"event": "Click_Video", "properties": {"time": int(datetime(2024, 2, 10, tzinfo=dt_timezone.utc).timestamp())}}
+    export = mocker.patch("tracks.sync.requests.get", side_effect=[
+        ExportResponse([]),
+        ExportResponse([], status_code=503),
+        ExportResponse([event]),
+    ])
+    settings.MIXPANEL_EXPORT_WORKERS = 1
+
+    assert list(fetch_export("startup", date(2024, 1, 1), date(2024, 2, 29))) == [event]
+    assert [call.kwargs["params"]["from_date"] for call in export.call_args_list] == ["2024-01-01", "2024-02-01", "2024-02-01"]
+
+
+@pytest.mark.django_db
+def test_sync_skipped_without_mixpanel(main_startup, settings, mocker):
+    settings.MIXPANEL_API_SECRET = None
+    export = mocker.patch("tracks.sync.requests.get")
+
+    assert sync_due_startups() == 0
+    export.assert_not_called()
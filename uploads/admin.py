@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import MediaObject, Upload
+
+
+class UploadAdmin(admin.ModelAdmin):
+    list_display = ('file_name', 'kind', 'user', 'startup', 'size', 'status', 'created_at', 'completed_at')
+    list_filter = ('kind', 'status')
+    search_fields = ['file_name', 'key']
+
+
+admin.site.register(Upload, UploadAdmin)
+
+
+class MediaObjectAdmin(admin.ModelAdmin):
+    list_display = ('key', 'digest', 'size', 'created_at', 'last_used_at')
+    search_fields = ['key', 'digest', 'url']
+
+
+admin.site.register(MediaObject, MediaObjectAdmin)
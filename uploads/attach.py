@@ -0,0 +1,68 @@
+from django.db import transaction
+
+from startups.models import StartupImage, StartupVideo, StartupSlidedeck
+from .backends import get_upload_backend
+from .chunked import assemble_chunked_upload
+from .derivatives import schedule_image_derivatives
+from .media import register_upload
+from .models import Upload
+
+STARTUP_MEDIA_MODELS = {
+    Upload.STARTUP_IMAGE: StartupImage,
+    Upload.STARTUP_VIDEO: StartupVideo,
+    Upload.PITCH_DECK: StartupSlidedeck,
+}
+
+
+class UploadNotReceived(Exception):
+    pass
+
+
+def _attach_startup_media(upload, url):
+    model = STARTUP_MEDIA_MODELS[upload.kind]
+    model.objects.filter(startup_id=upload.startup_id, is_active=True).update(is_active=False)
+    media = model.objects.create(startup_id=upload.startup_id, url=url, is_active=True)
+    if upload.kind in (Upload.STARTUP_IMAGE, Upload.PITCH_DECK):
+        schedule_image_derivatives(upload.kind, media.id, url)
+
+
+def _attach_profile_picture(upload, url):
+    user = upload.user
+    user.set_picture(url)
+    user.save(update_fields=['picture_url', 'picture_variants'])
+    schedule_image_derivatives(upload.kind, user.id, url)
+
+
+def complete_upload(upload, backend=None):
+    """
+    Checks that the client uploaded the file and makes it the active
+    image, video, pitch deck or profile picture. Chunked uploads are
+    assembled first, and content that was already stored is reused.
+    Completing twice is a no-op. Storage is checked before the upload is
+    locked, so slow storage calls don't hold the lock; the lock is only
+    taken to attach the file.
+    """
+    if upload.status == Upload.COMPLETED:
+        return upload.url
+    backend = backend or get_upload_backend()
+    size = backend.size(upload.key)
+    if upload.is_chunked and size is None:
+        assemble_chunked_upload(upload, backend)
+        size = backend.size(upload.key)
+    if not size:
+        raise UploadNotReceived("File was not uploaded")
+    if size != upload.size:
+        raise UploadNotReceived(f"Uploaded {size} bytes, expected {upload.size}")
+
+    with transaction.atomic():
+        if Upload.objects.select_for_update().get(id=upload.id).status == Upload.COMPLETED:
+            # Completed by a concurrent request meanwhile
+            upload.refresh_from_db()
+            return upload.url
+        url = register_upload(upload, backend.url(upload.key), backend)
+        if upload.kind == Upload.PROFILE_PICTURE:
+            _attach_profile_picture(upload, url)
+        else:
+            _attach_startup_media(upload, url)
+        upload.mark_completed(url)
+    return url
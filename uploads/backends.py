@@ -0,0 +1,139 @@
+import hashlib
+import os
+import posixpath
+import shutil
+import uuid
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+LOCAL_UPLOAD_SALT = 'uploads.local'
+
+
+class S3UploadBackend:
+    """
+    Presigns POSTs straight to the media bucket. The policy pins the key,
+    content type and maximum size, so the worker never sees the bytes.
+    """
+
+    def __init__(self):
+        self.storage = default_storage
+
+    @property
+    def client(self):
+        return self.storage.bucket.meta.client
+
+    def bucket_key(self, upload):
+        return posixpath.join(self.storage.location, upload.key)
+
+    def presign(self, upload):
+        response = self.client.generate_presigned_post(
+            Bucket=self.storage.bucket_name,
+            Key=self.bucket_key(upload),
+            Fields={'Content-Type': upload.content_type},
+            Conditions=[
+                {'Content-Type': upload.content_type},
+                ['content-length-range', 1, upload.size],
+            ],
+            ExpiresIn=settings.UPLOAD_URL_EXPIRES
+        )
+        return {'method': 'POST', 'url': response['url'], 'fields': response['fields'], 'headers': {}}
+
+    def start_multipart(self, upload):
+        """Starts the multipart upload that assembles a chunked upload and returns its id."""
+        response = self.client.create_multipart_upload(
+            Bucket=self.storage.bucket_name,
+            Key=self.bucket_key(upload),
+            ContentType=upload.content_type
+        )
+        return response['UploadId']
+
+    def upload_part(self, upload, number, data):
+        """Stores one chunk and returns its ETag."""
+        response = self.client.upload_part(
+            Bucket=self.storage.bucket_name,
+            Key=self.bucket_key(upload),
+            UploadId=upload.multipart_id,
+            PartNumber=number,
+            Body=data
+        )
+        return response['ETag']
+
+    def complete_multipart(self, upload, parts):
+        """Assembles the parts into the upload key, without downloading them."""
+        self.client.complete_multipart_upload(
+            Bucket=self.storage.bucket_name,
+            Key=self.bucket_key(upload),
+            UploadId=upload.multipart_id,
+            MultipartUpload={'Parts': [{'ETag': part.etag, 'PartNumber': part.number} for part in parts]}
+        )
+
+    def size(self, key):
+        """Size of the stored object, or None if it was not uploaded."""
+        try:
+            return self.storage.size(key)
+        except (ClientError, FileNotFoundError):
+            return None
+
+    def url(self, key):
+        return self.storage.url(key)
+
+
+class LocalUploadBackend(S3UploadBackend):
+    """
+    Stand-in for S3 that keeps files under UPLOAD_LOCAL_ROOT. The presigned
+    URL is a signed PUT endpoint of this app, so the flow can run offline.
+    """
+
+    def __init__(self):
+        self.storage = FileSystemStorage(location=settings.UPLOAD_LOCAL_ROOT, base_url=settings.MEDIA_URL or '/media/')
+
+    def presign(self, upload):
+        token = signing.dumps(str(upload.id), salt=LOCAL_UPLOAD_SALT)
+        return {
+            'method': 'PUT',
+            'url': reverse('upload-local-put', kwargs={'token': token}),
+            'fields': {},
+            'headers': {'Content-Type': upload.content_type}
+        }
+
+    @staticmethod
+    def unsign(token):
+        """Returns the upload id of a presigned token, raising signing.BadSignature."""
+        return signing.loads(token, salt=LOCAL_UPLOAD_SALT, max_age=settings.UPLOAD_URL_EXPIRES)
+
+    def _parts_dir(self, upload):
+        return os.path.join(settings.UPLOAD_LOCAL_ROOT, '.parts', upload.multipart_id)
+
+    def start_multipart(self, upload):
+        multipart_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(settings.UPLOAD_LOCAL_ROOT, '.parts', multipart_id))
+        return multipart_id
+
+    def upload_part(self, upload, number, data):
+        with open(os.path.join(self._parts_dir(upload), f'{number:05d}'), 'wb') as part_file:
+            part_file.write(data)
+        return hashlib.md5(data).hexdigest()
+
+    def complete_multipart(self, upload, parts):
+        parts_dir = self._parts_dir(upload)
+        path = self.storage.path(upload.key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as assembled:
+            for part in parts:
+                with open(os.path.join(parts_dir, f'{part.number:05d}'), 'rb') as part_file:
+                    shutil.copyfileobj(part_file, assembled)
+        shutil.rmtree(parts_dir)
+
+    def save(self, key, content):
+        if self.storage.exists(key):
+            self.storage.delete(key)
+        return self.storage.save(key, content)
+
+
+def get_upload_backend():
+    return import_string(settings.UPLOAD_STORAGE_BACKEND)()
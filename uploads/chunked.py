@@ -0,0 +1,78 @@
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Upload, UploadPart
+
+
+class InvalidChunk(Exception):
+    pass
+
+
+class OffsetMismatch(Exception):
+    """The chunk does not start where the upload left off; carries the resume offset."""
+
+    def __init__(self, offset):
+        super().__init__(f"Upload is at byte {offset}")
+        self.offset = offset
+
+
+def composite_checksum(checksums):
+    """
+    SHA-256 of the concatenated SHA-256 digests of the chunks, in order.
+    It identifies the content of a chunked upload without re-reading the file.
+    """
+    return hashlib.sha256(b''.join(bytes.fromhex(checksum) for checksum in checksums)).hexdigest()
+
+
+def receive_chunk(upload, start, data, checksum, backend):
+    """
+    Stores the chunk starting at byte `start` as the next part of the upload
+    and returns the new offset. The part is sent to storage without holding
+    a lock on the upload, which is only locked to record the part, once the
+    offset is checked again. A concurrent chunk for the same offset then
+    gets an OffsetMismatch.
+    """
+    if start != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    end = start + len(data)
+    if not data or end > upload.size:
+        raise InvalidChunk("Chunk is outside the declared file size")
+    if len(data) > settings.UPLOAD_CHUNK_SIZE:
+        raise InvalidChunk(f"Chunks can't exceed {settings.UPLOAD_CHUNK_SIZE} bytes")
+    if end < upload.size and len(data) < settings.UPLOAD_MIN_CHUNK_SIZE:
+        raise InvalidChunk(f"Only the last chunk can be smaller than {settings.UPLOAD_MIN_CHUNK_SIZE} bytes")
+    digest = hashlib.sha256(data).hexdigest()
+    if checksum and checksum.lower() != digest:
+        raise InvalidChunk("Chunk checksum does not match")
+
+    number = upload.parts.count() + 1
+    etag = backend.upload_part(upload, number, data)
+    with transaction.atomic():
+        locked = Upload.objects.select_for_update().get(id=upload.id, status=Upload.PENDING)
+        if locked.offset != start:
+            raise OffsetMismatch(locked.offset)
+        UploadPart.objects.create(upload=locked, number=number, size=len(data), etag=etag, checksum=digest)
+        locked.offset = end
+        locked.save(update_fields=['offset'])
+    upload.offset = end
+    return end
+
+
+def assemble_chunked_upload(upload, backend):
+    """
+    Verifies the received chunks, assembles them into the upload key and
+    records their composite checksum as the digest of the upload, so
+    chunked uploads of the same content, in the same chunks, share one
+    stored object.
+    """
+    if upload.offset != upload.size:
+        raise InvalidChunk(f"Received {upload.offset} of {upload.size} bytes")
+    parts = list(upload.parts.all())
+    digest = composite_checksum(part.checksum for part in parts)
+    if upload.checksum and digest != upload.checksum.lower():
+        raise InvalidChunk("File checksum does not match")
+    backend.complete_multipart(upload, parts)
+    upload.digest = digest
+    upload.save(update_fields=['digest'])
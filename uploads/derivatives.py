@@ -0,0 +1,177 @@
+import hashlib
+import io
+import json
+import logging
+from urllib.parse import unquote
+
+import pypdfium2 as pdfium
+import requests
+from PIL import Image, ImageOps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from pjbackend.workers import lease_due
+from startups.models import StartupImage, StartupSlidedeck
+from .backends import get_upload_backend
+from .models import ImageDerivativeJob, Upload
+
+try:
+    import pillow_avif  # noqa: F401 registers the AVIF encoder on Pillow releases without it
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_TIMEOUT = 30
+FORMATS = {
+    'avif': {'format': 'AVIF', 'quality': 60},
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+}
+
+
+def supported_formats():
+    Image.init()
+    return [name for name, options in FORMATS.items() if options['format'] in Image.SAVE]
+
+
+def schedule_image_derivatives(kind, object_id, source_url):
+    """Queues the variants of an image, or the slides of a pitch deck."""
+    if source_url:
+        ImageDerivativeJob.schedule(kind, object_id, source_url)
+
+
+def read_source(storage, url):
+    """Reads the original image, from the upload storage when it lives there."""
+    base_url = storage.url('')
+    if base_url and url.startswith(base_url):
+        with storage.open(unquote(url[len(base_url):])) as source:
+            return source.read()
+    response = requests.get(url, timeout=DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def generate_derivatives(data, storage, prefix):
+    """
+    Saves a resized copy of the image per size and format under `prefix`
+    and returns their URLs as {size: {format: url}}. Images are never
+    enlarged.
+    """
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    formats = supported_formats()
+    variants = {}
+    for label, width in settings.IMAGE_DERIVATIVE_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((width, width), Image.LANCZOS)
+        variants[label] = {}
+        for name in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, **FORMATS[name])
+            path = storage.save(f"{prefix}/{label}.{name}", ContentFile(buffer.getvalue()))
+            variants[label][name] = storage.url(path)
+    return variants
+
+
+def rasterize_pitch_deck(data, storage, prefix, source_url):
+    """
+    Renders each page of a PDF deck, up to PITCH_DECK_MAX_PAGES, to a WebP
+    slide under `prefix`, one page at a time, and saves a manifest.json
+    listing them. `pageCount` is the number of slides rendered and
+    `sourcePageCount` the pages of the PDF. Returns the manifest, or None
+    if the deck is not a PDF.
+    """
+    if not data.startswith(b'%PDF'):
+        return None
+    pdf = pdfium.PdfDocument(data)
+    try:
+        slides = []
+        for number in range(1, min(len(pdf), settings.PITCH_DECK_MAX_PAGES) + 1):
+            page = pdf[number - 1]
+            try:
+                scale = settings.PITCH_DECK_SLIDE_WIDTH / page.get_width()
+                slide = page.render(scale=scale).to_pil()
+            finally:
+                page.close()
+            buffer = io.BytesIO()
+            slide.save(buffer, **FORMATS['webp'])
+            path = storage.save(f"{prefix}/slide-{number:03d}.webp", ContentFile(buffer.getvalue()))
+            slides.append({'number': number, 'url': storage.url(path), 'width': slide.width, 'height': slide.height})
+        manifest = {'source': source_url, 'pageCount': len(slides), 'sourcePageCount': len(pdf), 'slides': slides}
+    finally:
+        pdf.close()
+    path = storage.save(f"{prefix}/manifest.json", ContentFile(json.dumps(manifest).encode()))
+    manifest['url'] = storage.url(path)
+    return manifest
+
+
+def _apply_manifest(job, manifest):
+    deck = StartupSlidedeck.objects.filter(id=job.object_id, url=job.source_url).first()
+    if deck and manifest:
+        deck.page_count = manifest['pageCount']
+        deck.manifest_url = manifest['url']
+        deck.save(update_fields=['page_count', 'manifest_url'])
+
+
+def _apply_variants(job, variants):
+    """Stores the variants unless the image was replaced meanwhile."""
+    if job.kind == Upload.PROFILE_PICTURE:
+        user = get_user_model().objects.filter(id=job.object_id, picture_url=job.source_url).first()
+        if user:
+            user.picture_variants = variants
+            user.save(update_fields=['picture_variants'])
+    else:
+        image = StartupImage.objects.filter(id=job.object_id, url=job.source_url).first()
+        if image:
+            image.variants = variants
+            image.save(update_fields=['variants'])
+
+
+def _still_current(job):
+    """
+    Locks the job and tells whether its source is still the one rendered,
+    since schedule() may have replaced it while the job was leased.
+    """
+    return ImageDerivativeJob.objects.select_for_update().filter(
+        id=job.id,
+        source_url=job.source_url
+    ).values_list('id', flat=True).first() is not None
+
+
+def process_derivative_job(job, storage):
+    try:
+        data = read_source(storage, job.source_url)
+        prefix = f"derivatives/{hashlib.sha1(job.source_url.encode()).hexdigest()}"
+        if job.kind == Upload.PITCH_DECK:
+            result, apply = rasterize_pitch_deck(data, storage, prefix, job.source_url), _apply_manifest
+        else:
+            result, apply = generate_derivatives(data, storage, prefix), _apply_variants
+        with transaction.atomic():
+            if _still_current(job):
+                apply(job, result)
+                job.mark_done()
+    except Exception as e:
+        logger.error('Error generating derivatives of %s: %s', job.source_url, e)
+        with transaction.atomic():
+            if _still_current(job):
+                job.mark_failed(e)
+
+
+def process_derivative_jobs(batch_size=None):
+    """
+    Processes one batch of due derivative jobs and returns its size. The
+    batch is leased in a short transaction, and each job is rendered
+    outside it and applied in its own.
+    """
+    storage = get_upload_backend().storage
+    jobs = lease_due(
+        ImageDerivativeJob.objects.filter(status=ImageDerivativeJob.PENDING).order_by('next_attempt_at', 'id'),
+        'next_attempt_at',
+        batch_size or settings.IMAGE_DERIVATIVE_BATCH_SIZE,
+        settings.IMAGE_DERIVATIVE_LEASE_TIMEOUT
+    )
+    for job in jobs:
+        process_derivative_job(job, storage)
+    return len(jobs)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from uploads.media import collect_orphan_media
+
+
+class Command(BaseCommand):
+    help = 'Delete stored media that no active startup image, video, pitch deck or profile picture references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--include-untracked', action='store_true', help='Also scan deactivated rows for files stored before deduplication')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+
+    def handle(self, *args, **options):
+        removed = collect_orphan_media(
+            batch_size=options['batch_size'],
+            include_untracked=options['include_untracked'],
+            dry_run=options['dry_run']
+        )
+        verb = 'would be removed' if options['dry_run'] else 'removed'
+        self.stdout.write(self.style.SUCCESS(f'{removed} orphan objects {verb}'))
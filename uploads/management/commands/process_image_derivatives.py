@@ -0,0 +1,12 @@
+from pjbackend.workers import WorkerCommand
+from uploads.derivatives import process_derivative_jobs
+
+
+class Command(WorkerCommand):
+    help = 'Generate resized variants of uploaded images and the slide images of pitch decks'
+    loop_help = 'Keep polling for pending images'
+
+    def process_batch(self, batch_size):
+        processed = process_derivative_jobs(batch_size=batch_size)
+        if processed:
+            return f'{processed} images processed'
@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import os
+import posixpath
+from datetime import timedelta
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from startups.models import StartupImage, StartupVideo, StartupSlidedeck
+from .backends import get_upload_backend
+from .models import MediaObject
+
+logger = logging.getLogger(__name__)
+
+STARTUP_MEDIA_MODELS = (StartupImage, StartupVideo, StartupSlidedeck)
+
+
+class HashingReader:
+    """File-like wrapper that hashes the bytes read through it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.sha256.update(data)
+        return data
+
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+
+def content_key(digest, file_name):
+    extension = os.path.splitext(file_name or '')[1].lower()
+    return f"content/{digest[:2]}/{digest}{extension}"
+
+
+def store_file(file):
+    """
+    Stores an uploaded file under the SHA-256 of its content and returns
+    its URL. Content that was already stored is not uploaded again.
+    """
+    storage = get_upload_backend().storage
+    sha256 = hashlib.sha256()
+    size = 0
+    for chunk in file.chunks():
+        sha256.update(chunk)
+        size += len(chunk)
+    digest = sha256.hexdigest()
+
+    existing = MediaObject.objects.filter(digest=digest).first()
+    if existing:
+        existing.touch()
+        return existing.url
+    file.seek(0)
+    key = content_key(digest, file.name)
+    if not storage.exists(key):
+        key = storage.save(key, file)
+    media, _ = MediaObject.objects.get_or_create(
+        digest=digest,
+        defaults={'key': key, 'url': storage.url(key), 'size': size}
+    )
+    return media.url
+
+
+def register_upload(upload, url, backend):
+    """
+    Tracks a direct upload and returns the URL to use for it: the existing
+    object when its content was already stored, in which case the
+    duplicate is deleted.
+    """
+    if upload.digest:
+        existing = MediaObject.objects.filter(digest=upload.digest).first()
+        if existing and existing.key != upload.key:
+            transaction.on_commit(lambda: backend.storage.delete(upload.key))
+            existing.touch()
+            return existing.url
+    try:
+        with transaction.atomic():
+            MediaObject.objects.get_or_create(
+                key=upload.key,
+                defaults={'digest': upload.digest, 'url': url, 'size': upload.size}
+            )
+    except IntegrityError:
+        return register_upload(upload, url, backend)
+    return url
+
+
+def _referenced(url_field):
+    """Exists() expressions for every row that keeps a stored URL alive."""
+    references = [
+        Exists(model.objects.filter(url=OuterRef(url_field), is_active=True))
+        for model in STARTUP_MEDIA_MODELS
+    ]
+    references.append(Exists(get_user_model().objects.filter(picture_url=OuterRef(url_field))))
+    return references
+
+
+def _delete_object(storage, key, url):
+    if storage.exists(key):
+        storage.delete(key)
+    prefix = f"derivatives/{hashlib.sha1(url.encode()).hexdigest()}"
+    try:
+        _, files = storage.listdir(prefix)
+    except FileNotFoundError:
+        files = []
+    for name in files:
+        storage.delete(posixpath.join(prefix, name))
+
+
+def _untracked_orphan_urls():
+    """URLs of deactivated startup media that nothing references and no MediaObject tracks."""
+    seen = set()
+    for model in STARTUP_MEDIA_MODELS:
+        queryset = model.objects.filter(is_active=False).exclude(url__in=MediaObject.objects.values('url'))
+        for reference in _referenced('url'):
+            queryset = queryset.filter(~reference)
+        for url in queryset.values_list('url', flat=True).distinct().iterator():
+            if url not in seen:
+                seen.add(url)
+                yield url
+
+
+def collect_orphan_media(batch_size=None, include_untracked=False, dry_run=False):
+    """
+    Deletes stored objects that no active startup image, video, pitch deck
+    or profile picture references any more, with their derivatives, and
+    returns how many were removed. Objects stored or reused within
+    MEDIA_GC_GRACE_PERIOD are kept, since their rows may not exist yet.
+    With include_untracked, files stored before MediaObject existed are
+    found through the deactivated rows, in a full scan.
+    """
+    storage = get_upload_backend().storage
+    batch_size = batch_size or settings.MEDIA_GC_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(seconds=settings.MEDIA_GC_GRACE_PERIOD)
+    orphans = MediaObject.objects.filter(last_used_at__lt=cutoff)
+    for reference in _referenced('url'):
+        orphans = orphans.filter(~reference)
+    orphans = list(orphans.order_by('last_used_at')[:batch_size])
+
+    removed = 0
+    for media in orphans:
+        logger.info('Removing orphan media %s', media.key)
+        if not dry_run:
+            _delete_object(storage, media.key, media.url)
+            media.delete()
+        removed += 1
+
+    if include_untracked:
+        base_url = storage.url('')
+        for url in _untracked_orphan_urls():
+            if not base_url or not url.startswith(base_url):
+                continue
+            key = unquote(url[len(base_url):])
+            if not storage.exists(key):
+                continue
+            logger.info('Removing untracked orphan media %s', key)
+            if not dry_run:
+                _delete_object(storage, key, url)
+            removed += 1
+    return removed
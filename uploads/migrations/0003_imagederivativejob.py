@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0002_resumable_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageDerivativeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('startup_image', 'startup image'), ('startup_video', 'startup video'), ('pitch_deck', 'pitch deck'), ('profile_picture', 'profile picture')], max_length=20)),
+                ('object_id', models.CharField(max_length=64)),
+                ('source_url', models.URLField(max_length=1000)),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('done', 'done'), ('failed', 'failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='uploads_ima_status_9f17a6_idx')],
+            },
+        ),
+    ]
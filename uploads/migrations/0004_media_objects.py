@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('uploads', '0003_imagederivativejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaObject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(blank=True, max_length=64, null=True, unique=True)),
+                ('key', models.CharField(max_length=500, unique=True)),
+                ('url', models.URLField(db_index=True, max_length=1000)),
+                ('size', models.PositiveBigIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='upload',
+            name='digest',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,185 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from pjbackend.workers import retry_at
+
+
+class Upload(models.Model):
+    """
+    A file uploaded straight to storage: created with a presigned request,
+    then attached to its startup or user once the client confirms it.
+    """
+    STARTUP_IMAGE = 'startup_image'
+    STARTUP_VIDEO = 'startup_video'
+    PITCH_DECK = 'pitch_deck'
+    PROFILE_PICTURE = 'profile_picture'
+    KIND_CHOICES = (
+        (STARTUP_IMAGE, 'startup image'),
+        (STARTUP_VIDEO, 'startup video'),
+        (PITCH_DECK, 'pitch deck'),
+        (PROFILE_PICTURE, 'profile picture')
+    )
+    STARTUP_KINDS = (STARTUP_IMAGE, STARTUP_VIDEO, PITCH_DECK)
+    CONTENT_TYPES = {
+        STARTUP_IMAGE: ('image/',),
+        PROFILE_PICTURE: ('image/',),
+        STARTUP_VIDEO: ('video/',),
+        PITCH_DECK: (
+            'application/pdf',
+            'application/vnd.ms-powerpoint',
+            'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+        ),
+    }
+    PENDING = 'pending'
+    COMPLETED = 'completed'
+    STATUS_CHOICES = (
+        (PENDING, 'pending'),
+        (COMPLETED, 'completed')
+    )
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    startup = models.ForeignKey('startups.Startup', on_delete=models.CASCADE, blank=True, null=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.CharField(max_length=500)
+    file_name = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    url = models.URLField(max_length=1000, blank=True, null=True)
+    multipart_id = models.CharField(max_length=1024, blank=True, null=True)
+    offset = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True, null=True)
+    digest = models.CharField(max_length=64, blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.file_name} ({self.status})"
+
+    @property
+    def is_chunked(self):
+        return bool(self.multipart_id)
+
+    @classmethod
+    def create_upload(cls, user, kind, file_name, content_type, size, startup=None, checksum=None):
+        upload = cls(
+            user=user,
+            startup=startup,
+            kind=kind,
+            file_name=file_name,
+            content_type=content_type,
+            size=size,
+            checksum=checksum
+        )
+        upload.key = f"uploads/{kind}/{upload.id}/{get_valid_filename(os.path.basename(file_name))}"
+        upload.save()
+        return upload
+
+    def mark_completed(self, url):
+        self.status = self.COMPLETED
+        self.url = url
+        self.completed_at = timezone.now()
+        self.save(update_fields=['status', 'url', 'completed_at'])
+
+
+class MediaObject(models.Model):
+    """
+    A stored file, addressed by the SHA-256 of its content when known, or
+    for resumable uploads by the SHA-256 of the SHA-256s of its chunks.
+    Rows that upload identical content share it; orphans are removed by
+    the collect_orphan_media job.
+    """
+    digest = models.CharField(max_length=64, unique=True, blank=True, null=True)
+    key = models.CharField(max_length=500, unique=True)
+    url = models.URLField(max_length=1000, db_index=True)
+    size = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.key
+
+    def touch(self):
+        """Marks the object as just reused, which protects it from collection."""
+        self.last_used_at = timezone.now()
+        self.save(update_fields=['last_used_at'])
+
+
+class UploadPart(models.Model):
+    """A chunk of a resumable upload, stored as a part of its multipart upload."""
+    upload = models.ForeignKey(Upload, on_delete=models.CASCADE, related_name='parts')
+    number = models.PositiveIntegerField()
+    size = models.PositiveBigIntegerField()
+    etag = models.CharField(max_length=255)
+    checksum = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ('upload', 'number')
+        ordering = ['number']
+
+    def __str__(self):
+        return f"{self.upload_id} part {self.number}"
+
+
+class ImageDerivativeJob(models.Model):
+    """
+    Generation of the resized WebP/AVIF variants of a startup image or a
+    profile picture, or of the slide images of a pitch deck, run by the
+    process_image_derivatives worker.
+    """
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'pending'),
+        (DONE, 'done'),
+        (FAILED, 'failed')
+    )
+    kind = models.CharField(max_length=20, choices=Upload.KIND_CHOICES)
+    object_id = models.CharField(max_length=64)
+    source_url = models.URLField(max_length=1000)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} ({self.status})"
+
+    @classmethod
+    def schedule(cls, kind, object_id, source_url):
+        """Queues a job, replacing the source of a pending one for the same image."""
+        updated = cls.objects.filter(kind=kind, object_id=str(object_id), status=cls.PENDING).update(
+            source_url=source_url,
+            attempts=0,
+            next_attempt_at=timezone.now()
+        )
+        if not updated:
+            cls.objects.create(kind=kind, object_id=str(object_id), source_url=source_url)
+
+    def mark_done(self):
+        self.status = self.DONE
+        self.attempts += 1
+        self.last_error = None
+        self.save(update_fields=['status', 'attempts', 'last_error'])
+
+    def mark_failed(self, error):
+        """Schedules a retry with exponential backoff, or gives up."""
+        self.attempts += 1
+        self.last_error = str(error)
+        if self.attempts >= settings.IMAGE_DERIVATIVE_MAX_ATTEMPTS:
+            self.status = self.FAILED
+        else:
+            self.next_attempt_at = retry_at(self.attempts, settings.IMAGE_DERIVATIVE_RETRY_DELAY)
+        self.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
@@ -0,0 +1,37 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import Upload
+
+
+class CreateUploadSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=Upload.KIND_CHOICES)
+    startupId = serializers.UUIDField(required=False)
+    fileName = serializers.CharField(max_length=255)
+    contentType = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+    def validate(self, data):
+        kind = data['kind']
+        if kind in Upload.STARTUP_KINDS and not data.get('startupId'):
+            raise serializers.ValidationError({"startupId": "This field is required."})
+        if not data['contentType'].startswith(Upload.CONTENT_TYPES[kind]):
+            raise serializers.ValidationError({"contentType": f"Unsupported content type for {kind}."})
+        max_size = settings.UPLOAD_MAX_SIZES[kind]
+        if data['size'] > max_size:
+            raise serializers.ValidationError({"size": f"File exceeds the maximum size of {max_size} bytes."})
+        return data
+
+
+class CreateUploadSessionSerializer(CreateUploadSerializer):
+    checksum = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False)
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    uploadId = serializers.UUIDField(source='id')
+    fileName = serializers.CharField(source='file_name')
+    contentType = serializers.CharField(source='content_type')
+
+    class Meta:
+        model = Upload
+        fields = ['uploadId', 'kind', 'fileName', 'contentType', 'size', 'offset', 'status', 'url']
@@ -0,0 +1,170 @@
+import hashlib
+import pytest
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from startups.models import StartupVideo
+from startups.tests.fixtures import common_startup
+from uploads.attach import complete_upload
+from uploads.backends import LocalUploadBackend
+from uploads.chunked import composite_checksum
+from uploads.models import MediaObject, Upload, UploadPart
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+CHUNK_SIZE = 64
+VIDEO_BYTES = bytes(range(256)) * 2 + b"tail"
+CHUNKS = [VIDEO_BYTES[i:i + CHUNK_SIZE] for i in range(0, len(VIDEO_BYTES), CHUNK_SIZE)]
+
+
+@pytest.fixture(autouse=True)
+def local_uploads(settings, tmp_path):
+    settings.UPLOAD_STORAGE_BACKEND = "uploads.backends.LocalUploadBackend"
+    settings.UPLOAD_LOCAL_ROOT = str(tmp_path)
+    settings.UPLOAD_CHUNK_SIZE = CHUNK_SIZE
+    settings.UPLOAD_MIN_CHUNK_SIZE = CHUNK_SIZE
+    return tmp_path
+
+
+@pytest.fixture
+def client(main_user_token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    return client
+
+
+def _start_session(client, startup):
+    response = client.post(reverse("upload-session-create"), data={
+        "kind": Upload.STARTUP_VIDEO,
+        "startupId": str(startup.id),
+        "fileName": "pitch.mp4",
+        "contentType": "video/mp4",
+        "size": len(VIDEO_BYTES),
+        "checksum": composite_checksum(hashlib.sha256(chunk).hexdigest() for chunk in CHUNKS)
+    }, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["chunkSize"] == CHUNK_SIZE
+    return response.json()["uploadId"]
+
+
+@pytest.fixture
+def session(client, main_startup):
+    return _start_session(client, main_startup)
+
+
+def _put_chunk(client, upload_id, offset, chunk, checksum=None):
+    return client.put(
+        reverse("upload-chunk", kwargs={"uploadId": upload_id}),
+        data=chunk,
+        content_type="application/octet-stream",
+        HTTP_UPLOAD_OFFSET=str(offset),
+        HTTP_CHUNK_CHECKSUM=checksum or hashlib.sha256(chunk).hexdigest()
+    )
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_creates_video(client, session, main_startup, local_uploads):
+    for index, chunk in enumerate(CHUNKS[:3]):
+        assert _put_chunk(client, session, index * CHUNK_SIZE, chunk).status_code == status.HTTP_200_OK
+
+    response = client.get(reverse("upload-detail", kwargs={"uploadId": session}))
+    offset = response.json()["offset"]
+    assert offset == 3 * CHUNK_SIZE
+
+    response = _put_chunk(client, session, 0, CHUNKS[0])
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["offset"] == offset
+
+    for index in range(3, len(CHUNKS)):
+        assert _put_chunk(client, session, index * CHUNK_SIZE, CHUNKS[index]).status_code == status.HTTP_200_OK
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": session}))
+    assert response.status_code == status.HTTP_200_OK
+
+    video = StartupVideo.objects.get(startup=main_startup, is_active=True)
+    assert video.url == response.json()["url"]
+    upload = Upload.objects.get(id=session)
+    assert (local_uploads / upload.key).read_bytes() == VIDEO_BYTES
+    assert not (local_uploads / ".parts" / upload.multipart_id).exists()
+
+
+@pytest.mark.django_db
+def test_concurrent_chunk_for_same_offset_rejected(client, session, mocker):
+    upload_part = LocalUploadBackend.upload_part
+
+    def other_chunk_recorded_meanwhile(backend, upload, number, data):
+        etag = upload_part(backend, upload, number, data)
+        Upload.objects.filter(id=upload.id).update(offset=CHUNK_SIZE)
+        return etag
+    mocker.patch.object(LocalUploadBackend, "upload_part", other_chunk_recorded_meanwhile)
+
+    response = _put_chunk(client, session, 0, CHUNKS[0])
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["offset"] == CHUNK_SIZE
+    assert not UploadPart.objects.filter(upload_id=session).exists()
+
+
+@pytest.mark.django_db
+def test_corrupted_chunk_rejected(client, session):
+    response = _put_chunk(client, session, 0, CHUNKS[0], checksum=hashlib.sha256(b"other").hexdigest())
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Upload.objects.get(id=session).offset == 0
+
+
+@pytest.mark.django_db
+def test_incomplete_upload_cannot_complete(client, session, main_startup):
+    _put_chunk(client, session, 0, CHUNKS[0])
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": session}))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not StartupVideo.objects.filter(startup=main_startup, is_active=True, url__contains="pitch").exists()
+
+
+@pytest.mark.django_db
+def test_checksum_mismatch_fails_completion(client, session):
+    Upload.objects.filter(id=session).update(checksum="0" * 64)
+    for index, chunk in enumerate(CHUNKS):
+        _put_chunk(client, session, index * CHUNK_SIZE, chunk)
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": session}))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "File checksum does not match"
+
+
+@pytest.mark.django_db
+def test_chunked_upload_reuses_stored_content(client, session, main_startup, local_uploads, django_capture_on_commit_callbacks):
+    first = _start_session(client, main_startup)
+    for upload_id in (first, session):
+        for index, chunk in enumerate(CHUNKS):
+            _put_chunk(client, upload_id, index * CHUNK_SIZE, chunk)
+    url = client.post(reverse("upload-complete", kwargs={"uploadId": first})).json()["url"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(reverse("upload-complete", kwargs={"uploadId": session}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["url"] == url
+    upload = Upload.objects.get(id=session)
+    assert upload.digest == composite_checksum(hashlib.sha256(chunk).hexdigest() for chunk in CHUNKS)
+    assert StartupVideo.objects.get(startup=main_startup, is_active=True).url == url
+    assert MediaObject.objects.count() == 1
+    assert not (local_uploads / upload.key).exists()
+
+
+@pytest.mark.django_db
+def test_upload_completed_meanwhile_attached_once(client, session, main_startup):
+    for index, chunk in enumerate(CHUNKS):
+        _put_chunk(client, session, index * CHUNK_SIZE, chunk)
+    stale = Upload.objects.get(id=session)
+    assert client.post(reverse("upload-complete", kwargs={"uploadId": session})).status_code == status.HTTP_200_OK
+
+    upload = Upload.objects.get(id=session)
+    assert complete_upload(stale) == upload.url
+    assert StartupVideo.objects.filter(startup=main_startup, url=upload.url).count() == 1
@@ -0,0 +1,195 @@
+import io
+import json
+import pytest
+import pypdfium2 as pdfium
+
+from PIL import Image
+from rest_framework.test import APIClient
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from startups.models import StartupImage, StartupSlidedeck
+from startups.serializers import StartupSerializer
+from startups.tests.fixtures import common_startup
+from uploads.backends import get_upload_backend
+from uploads.derivatives import process_derivative_jobs
+from uploads.models import ImageDerivativeJob, Upload
+from users.serializers import SmallUserSerializer
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+
+@pytest.fixture(autouse=True)
+def local_uploads(settings, tmp_path):
+    settings.UPLOAD_STORAGE_BACKEND = "uploads.backends.LocalUploadBackend"
+    settings.UPLOAD_LOCAL_ROOT = str(tmp_path)
+    settings.MEDIA_URL = "http://testserver/media/"
+    return tmp_path
+
+
+def _png(width=1600, height=900):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _pdf(pages):
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(pages):
+        pdf.new_page(960, 540)
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    return buffer.getvalue()
+
+
+def _stored_url(name, data):
+    storage = get_upload_backend().storage
+    return storage.url(storage.save(name, io.BytesIO(data)))
+
+
+@pytest.mark.django_db
+def test_startup_image_variants_generated(main_startup, local_uploads):
+    url = _stored_url("logo.png", _png())
+    image = StartupImage.objects.create(startup=main_startup, url=url, is_active=True)
+    ImageDerivativeJob.schedule(Upload.STARTUP_IMAGE, image.id, url)
+
+    assert process_derivative_jobs() == 1
+
+    image.refresh_from_db()
+    small = image.variants["small"]["webp"]
+    path = local_uploads / small[len("http://testserver/media/"):]
+    assert Image.open(path).size == (96, 54)
+    assert Image.open(local_uploads / image.variants["large"]["webp"][len("http://testserver/media/"):]).size == (1024, 576)
+    assert ImageDerivativeJob.objects.get().status == ImageDerivativeJob.DONE
+
+
+@pytest.mark.django_db
+def test_replaced_picture_keeps_new_variants(main_user_token):
+    user = main_user_token.get("user")
+    old_url = _stored_url("old.png", _png())
+    ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, old_url)
+    user.set_picture(_stored_url("new.png", _png(200, 200)))
+    user.save()
+
+    process_derivative_jobs()
+
+    user.refresh_from_db()
+    assert user.picture_variants == {}
+
+
+@pytest.mark.django_db
+def test_pending_job_coalesced(main_user_token):
+    user = main_user_token.get("user")
+    ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, "https://example.com/first.png")
+    ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, "https://example.com/second.png")
+
+    assert ImageDerivativeJob.objects.get().source_url == "https://example.com/second.png"
+
+
+@pytest.mark.django_db
+def test_unreadable_image_retried(main_user_token):
+    user = main_user_token.get("user")
+    ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, _stored_url("broken.png", b"not an image"))
+
+    process_derivative_jobs()
+
+    job = ImageDerivativeJob.objects.get()
+    assert job.status == ImageDerivativeJob.PENDING
+    assert job.attempts == 1
+
+
+@pytest.mark.django_db
+def test_profile_picture_upload_exposes_variants(main_user_token, mocker):
+    url = _stored_url("me.png", _png(400, 400))
+    mocker.patch("users.views.utils.upload_file_to_s3", return_value=url)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+
+    image = SimpleUploadedFile("me.png", _png(400, 400), content_type="image/png")
+    response = client.put(reverse("profile-image"), data={"image": image}, format="multipart")
+    assert response.status_code == 200
+    process_derivative_jobs()
+
+    user = main_user_token.get("user")
+    user.refresh_from_db()
+    assert set(SmallUserSerializer(user).data["pictureUrls"]) == {"small", "medium", "large"}
+
+
+@pytest.mark.django_db
+def test_startup_serializer_exposes_variants(main_startup):
+    StartupImage.objects.filter(startup=main_startup, is_active=True).update(
+        variants={"small": {"webp": "https://example.com/small.webp"}}
+    )
+
+    data = StartupSerializer(main_startup).data
+    assert data["imageUrls"]["small"]["webp"] == "https://example.com/small.webp"
+
+
+@pytest.mark.django_db
+def test_pitch_deck_rasterized_into_slides(main_startup, settings, local_uploads):
+    settings.PITCH_DECK_SLIDE_WIDTH = 320
+    url = _stored_url("deck.pdf", _pdf(3))
+    deck = StartupSlidedeck.objects.create(startup=main_startup, url=url, is_active=True)
+    ImageDerivativeJob.schedule(Upload.PITCH_DECK, deck.id, url)
+
+    process_derivative_jobs()
+
+    deck.refresh_from_db()
+    assert deck.page_count == 3
+    manifest = json.loads((local_uploads / deck.manifest_url[len("http://testserver/media/"):]).read_text())
+    assert manifest["pageCount"] == 3
+    assert [slide["number"] for slide in manifest["slides"]] == [1, 2, 3]
+    first_slide = local_uploads / manifest["slides"][0]["url"][len("http://testserver/media/"):]
+    assert Image.open(first_slide).size == (320, 180)
+
+    StartupSlidedeck.objects.filter(startup=main_startup).exclude(id=deck.id).update(is_active=False)
+    data = StartupSerializer(main_startup).data
+    assert data["pitchDeckManifest"] == {"pageCount": 3, "url": deck.manifest_url}
+
+
+@pytest.mark.django_db
+def test_non_pdf_deck_skipped(main_startup):
+    url = _stored_url("deck.pptx", b"PK\x03\x04 not a pdf")
+    deck = StartupSlidedeck.objects.create(startup=main_startup, url=url, is_active=True)
+    ImageDerivativeJob.schedule(Upload.PITCH_DECK, deck.id, url)
+
+    process_derivative_jobs()
+
+    deck.refresh_from_db()
+    assert deck.page_count is None
+    assert ImageDerivativeJob.objects.get().status == ImageDerivativeJob.DONE
+
+
+@pytest.mark.django_db
+def test_pitch_deck_page_count_is_rendered_slides(main_startup, settings, local_uploads):
+    settings.PITCH_DECK_SLIDE_WIDTH = 160
+    settings.PITCH_DECK_MAX_PAGES = 2
+    url = _stored_url("long-deck.pdf", _pdf(3))
+    deck = StartupSlidedeck.objects.create(startup=main_startup, url=url, is_active=True)
+    ImageDerivativeJob.schedule(Upload.PITCH_DECK, deck.id, url)
+
+    process_derivative_jobs()
+
+    deck.refresh_from_db()
+    assert deck.page_count == 2
+    manifest = json.loads((local_uploads / deck.manifest_url[len("http://testserver/media/"):]).read_text())
+    assert (manifest["pageCount"], manifest["sourcePageCount"], len(manifest["slides"])) == (2, 3, 2)
+
+
+@pytest.mark.django_db
+def test_job_replaced_while_leased_stays_pending(main_user_token, mocker):
+    user = main_user_token.get("user")
+    ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, "https://example.com/old.jpg")
+
+    def replace_source(storage, url):
+        ImageDerivativeJob.schedule(Upload.PROFILE_PICTURE, user.id, "https://example.com/new.jpg")
+        raise Exception("Source unavailable")
+
+    mocker.patch("uploads.derivatives.read_source", side_effect=replace_source)
+    process_derivative_jobs()
+
+    job = ImageDerivativeJob.objects.get()
+    assert (job.status, job.source_url, job.attempts) == (ImageDerivativeJob.PENDING, "https://example.com/new.jpg", 0)
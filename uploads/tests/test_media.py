@@ -0,0 +1,97 @@
+import pytest
+
+from datetime import timedelta
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from pjbackend import utils
+from startups.models import StartupImage
+from startups.tests.fixtures import common_startup
+from uploads.media import collect_orphan_media
+from uploads.models import MediaObject, Upload
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"1" * 120
+
+
+@pytest.fixture(autouse=True)
+def local_uploads(settings, tmp_path):
+    settings.UPLOAD_STORAGE_BACKEND = "uploads.backends.LocalUploadBackend"
+    settings.UPLOAD_LOCAL_ROOT = str(tmp_path)
+    settings.MEDIA_URL = "http://testserver/media/"
+    return tmp_path
+
+
+def _age(media, seconds=2 * 86400):
+    MediaObject.objects.filter(id=media.id).update(last_used_at=timezone.now() - timedelta(seconds=seconds))
+
+
+@pytest.mark.django_db
+def test_same_file_stored_once(local_uploads):
+    first = utils.upload_file_to_s3(SimpleUploadedFile("logo.png", PNG_BYTES))
+    second = utils.upload_file_to_s3(SimpleUploadedFile("other-name.png", PNG_BYTES))
+
+    assert first == second
+    media = MediaObject.objects.get()
+    assert media.size == len(PNG_BYTES)
+    assert (local_uploads / media.key).read_bytes() == PNG_BYTES
+
+
+@pytest.mark.django_db
+def test_direct_upload_reuses_stored_content(main_user_token, main_startup, local_uploads, django_capture_on_commit_callbacks):
+    url = utils.upload_file_to_s3(SimpleUploadedFile("logo.png", PNG_BYTES))
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    presigned = client.post(reverse("upload-create"), data={
+        "kind": Upload.STARTUP_IMAGE,
+        "startupId": str(main_startup.id),
+        "fileName": "logo.png",
+        "contentType": "image/png",
+        "size": len(PNG_BYTES)
+    }, format="json").json()
+    APIClient().put(presigned["url"], data=PNG_BYTES, content_type="image/png")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(reverse("upload-complete", kwargs={"uploadId": presigned["uploadId"]}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["url"] == url
+    assert StartupImage.objects.get(startup=main_startup, is_active=True).url == url
+    assert MediaObject.objects.count() == 1
+    assert not (local_uploads / Upload.objects.get(id=presigned["uploadId"]).key).exists()
+
+
+@pytest.mark.django_db
+def test_orphans_collected_and_referenced_kept(main_startup, local_uploads):
+    orphan_url = utils.upload_file_to_s3(SimpleUploadedFile("old.png", b"old logo"))
+    kept_url = utils.upload_file_to_s3(SimpleUploadedFile("new.png", b"new logo"))
+    StartupImage.objects.create(startup=main_startup, url=orphan_url, is_active=False)
+    StartupImage.objects.create(startup=main_startup, url=kept_url, is_active=True)
+    orphan = MediaObject.objects.get(url=orphan_url)
+    kept = MediaObject.objects.get(url=kept_url)
+    _age(orphan)
+    _age(kept)
+    (local_uploads / "derivatives").mkdir()
+
+    assert collect_orphan_media(dry_run=True) == 1
+    assert MediaObject.objects.count() == 2
+
+    assert collect_orphan_media() == 1
+    assert list(MediaObject.objects.all()) == [kept]
+    assert not (local_uploads / orphan.key).exists()
+    assert (local_uploads / kept.key).exists()
+
+
+@pytest.mark.django_db
+def test_recent_orphan_kept(local_uploads):
+    utils.upload_file_to_s3(SimpleUploadedFile("pending.png", PNG_BYTES))
+
+    assert collect_orphan_media() == 0
+    assert MediaObject.objects.count() == 1
@@ -0,0 +1,148 @@
+import pytest
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+
+from startups.models import StartupImage, StartupSlidedeck
+from startups.tests.fixtures import common_startup, common_secondary_startup
+from uploads.backends import S3UploadBackend
+from uploads.models import Upload
+from users.tests.fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+secondary_startup = common_secondary_startup
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"0" * 120
+
+
+@pytest.fixture(autouse=True)
+def local_uploads(settings, tmp_path):
+    settings.UPLOAD_STORAGE_BACKEND = "uploads.backends.LocalUploadBackend"
+    settings.UPLOAD_LOCAL_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def _client(main_user_token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + main_user_token.get("token"))
+    return client
+
+
+def _create(client, **data):
+    return client.post(reverse("upload-create"), data=data, format="json")
+
+
+@pytest.mark.django_db
+def test_direct_upload_sets_startup_image(main_user_token, main_startup, local_uploads):
+    client = _client(main_user_token)
+    response = _create(
+        client,
+        kind=Upload.STARTUP_IMAGE,
+        startupId=str(main_startup.id),
+        fileName="logo.png",
+        contentType="image/png",
+        size=len(PNG_BYTES)
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    presigned = response.json()
+    assert presigned["method"] == "PUT"
+
+    response = APIClient().put(presigned["url"], data=PNG_BYTES, content_type="image/png")
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": presigned["uploadId"]}))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == Upload.COMPLETED
+
+    image = StartupImage.objects.get(startup=main_startup, is_active=True)
+    assert image.url == response.json()["url"]
+    upload = Upload.objects.get(id=presigned["uploadId"])
+    assert (local_uploads / upload.key).read_bytes() == PNG_BYTES
+
+
+@pytest.mark.django_db
+def test_direct_upload_sets_profile_picture(main_user_token):
+    client = _client(main_user_token)
+    presigned = _create(
+        client,
+        kind=Upload.PROFILE_PICTURE,
+        fileName="me.png",
+        contentType="image/png",
+        size=len(PNG_BYTES)
+    ).json()
+    APIClient().put(presigned["url"], data=PNG_BYTES, content_type="image/png")
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": presigned["uploadId"]}))
+    assert response.status_code == status.HTTP_200_OK
+
+    user = main_user_token.get("user")
+    user.refresh_from_db()
+    assert user.picture_url == response.json()["url"]
+
+
+@pytest.mark.django_db
+def test_complete_without_file_fails(main_user_token, main_startup):
+    client = _client(main_user_token)
+    deck = StartupSlidedeck.objects.get(startup=main_startup, is_active=True)
+    presigned = _create(
+        client,
+        kind=Upload.PITCH_DECK,
+        startupId=str(main_startup.id),
+        fileName="deck.pdf",
+        contentType="application/pdf",
+        size=2048
+    ).json()
+
+    response = client.post(reverse("upload-complete", kwargs={"uploadId": presigned["uploadId"]}))
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert StartupSlidedeck.objects.get(startup=main_startup, is_active=True) == deck
+
+
+@pytest.mark.django_db
+def test_create_upload_validates_kind(main_user_token, main_startup, secondary_startup):
+    client = _client(main_user_token)
+
+    response = _create(client, kind=Upload.STARTUP_VIDEO, startupId=str(main_startup.id), fileName="deck.pdf", contentType="application/pdf", size=10)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = _create(client, kind=Upload.STARTUP_IMAGE, startupId=str(main_startup.id), fileName="big.png", contentType="image/png", size=50 * 1024 * 1024)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = _create(client, kind=Upload.STARTUP_IMAGE, startupId=str(secondary_startup.id), fileName="logo.png", contentType="image/png", size=10)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_local_put_rejects_tampered_token(main_user_token):
+    response = APIClient().put(
+        reverse("upload-local-put", kwargs={"token": "not-a-token"}),
+        data=PNG_BYTES,
+        content_type="image/png"
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_s3_backend_presigns_post(main_user_token, main_startup, mocker):
+    upload = Upload.create_upload(
+        user=main_user_token.get("user"),
+        kind=Upload.STARTUP_VIDEO,
+        file_name="pitch video.mp4",
+        content_type="video/mp4",
+        size=4096,
+        startup=main_startup
+    )
+    storage = mocker.Mock(location="media/public", bucket_name="pomjuice")
+    storage.bucket.meta.client.generate_presigned_post.return_value = {"url": "https://pomjuice.s3.amazonaws.com/", "fields": {"key": "k"}}
+    backend = S3UploadBackend()
+    backend.storage = storage
+
+    presigned = backend.presign(upload)
+
+    assert presigned["method"] == "POST"
+    kwargs = storage.bucket.meta.client.generate_presigned_post.call_args.kwargs
+    assert kwargs["Key"] == f"media/public/uploads/startup_video/{upload.id}/pitch_video.mp4"
+    assert ["content-length-range", 1, 4096] in kwargs["Conditions"]
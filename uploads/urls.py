@@ -0,0 +1,17 @@
+from django.urls import path
+from .views import (
+    CreateUploadView,
+    CreateUploadSessionView,
+    CompleteUploadView,
+    LocalUploadView,
+    UploadChunkView,
+    UploadDetailView
+)
+urlpatterns = [
+path('uploads/', CreateUploadView.as_view(), name='upload-create'),
+path('uploads/sessions/', CreateUploadSessionView.as_view(), name='upload-session-create'),
+path('uploads/<uuid:uploadId>/', UploadDetailView.as_view(), name='upload-detail'),
+path('uploads/<uuid:uploadId>/chunks/', UploadChunkView.as_view(), name='upload-chunk'),
+path('uploads/<uuid:uploadId>/complete/', CompleteUploadView.as_view(), name='upload-complete'),
+path('uploads/local/<str:token>/', LocalUploadView.as_view(), name='upload-local-put'),
+]
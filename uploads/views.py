@@ -0,0 +1,170 @@
+import logging
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from rest_framework import generics, status
+from rest_framework.response import Response
+
+from startups.access import StartupAccessMixin
+from startups.models import Startup
+from users.permissions import IsRegistered
+from .attach import UploadNotReceived, complete_upload
+from .backends import LocalUploadBackend, get_upload_backend
+from .chunked import InvalidChunk, OffsetMismatch, receive_chunk
+from .media import HashingReader
+from .models import Upload
+from .serializers import CreateUploadSerializer, CreateUploadSessionSerializer, UploadSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class CreateUploadView(StartupAccessMixin, generics.GenericAPIView):
+    """
+    First step of a direct upload: returns a presigned request the client
+    sends the file with, straight to storage.
+    """
+    serializer_class = CreateUploadSerializer
+    permission_classes = [IsRegistered]
+
+    def post(self, request):
+        try:
+            user = request.user
+            serializer = self.get_serializer(data=request.data)
+            if not serializer.is_valid():
+                return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+            data = serializer.validated_data
+            startup = None
+            if data['kind'] in Upload.STARTUP_KINDS:
+                startup = self.get_startup(data['startupId'], is_active=True)
+                if not startup.user_has_access(user):
+                    return Response({"error": "You don't have access"}, status=status.HTTP_404_NOT_FOUND)
+
+            upload = Upload.create_upload(
+                user=user,
+                kind=data['kind'],
+                file_name=data['fileName'],
+                content_type=data['contentType'],
+                size=data['size'],
+                startup=startup,
+                checksum=data.get('checksum')
+            )
+            return Response({"uploadId": upload.id, **self.start(upload)}, status=status.HTTP_201_CREATED)
+        except Startup.DoesNotExist:
+            return Response({"error": "Startup does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error('Server error: %s', e)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def start(self, upload):
+        return get_upload_backend().presign(upload)
+
+
+class CreateUploadSessionView(CreateUploadView):
+    """
+    Starts a resumable upload: the file is sent in chunks to UploadChunkView
+    and assembled in storage on completion.
+    """
+    serializer_class = CreateUploadSessionSerializer
+
+    def start(self, upload):
+        upload.multipart_id = get_upload_backend().start_multipart(upload)
+        upload.save(update_fields=['multipart_id'])
+        return {"chunkSize": settings.UPLOAD_CHUNK_SIZE, "offset": 0}
+
+
+class UploadDetailView(generics.GenericAPIView):
+    """Returns the upload, including the offset a resumable upload continues from."""
+    serializer_class = UploadSerializer
+    permission_classes = [IsRegistered]
+
+    def get(self, request, uploadId):
+        try:
+            upload = Upload.objects.get(id=uploadId, user_id=request.user.id)
+            return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+        except Upload.DoesNotExist:
+            return Response({"error": "Upload does not exist"}, status=status.HTTP_404_NOT_FOUND)
+
+
+class UploadChunkView(generics.GenericAPIView):
+    """
+    Receives the next chunk of a resumable upload. The body is the raw
+    chunk, `Upload-Offset` its first byte and `Chunk-Checksum` its
+    SHA-256. A chunk at the wrong offset gets a 409 with the offset to
+    resume from.
+    """
+    permission_classes = [IsRegistered]
+
+    def put(self, request, uploadId):
+        try:
+            start = int(request.META['HTTP_UPLOAD_OFFSET'])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset header is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            if length > settings.UPLOAD_CHUNK_SIZE:
+                return Response({"error": f"Chunks can't exceed {settings.UPLOAD_CHUNK_SIZE} bytes"}, status=status.HTTP_400_BAD_REQUEST)
+            data = request.stream.read(length) if length else b''
+            upload = Upload.objects.get(
+                id=uploadId,
+                user_id=request.user.id,
+                status=Upload.PENDING,
+                multipart_id__isnull=False
+            )
+            offset = receive_chunk(upload, start, data, request.META.get('HTTP_CHUNK_CHECKSUM'), get_upload_backend())
+            return Response({"offset": offset}, status=status.HTTP_200_OK)
+        except Upload.DoesNotExist:
+            return Response({"error": "Upload does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        except OffsetMismatch as e:
+            return Response({"error": str(e), "offset": e.offset}, status=status.HTTP_409_CONFLICT)
+        except InvalidChunk as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error('Server error: %s', e)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CompleteUploadView(generics.GenericAPIView):
+    """Second step of a direct upload: attaches the uploaded file."""
+    serializer_class = UploadSerializer
+    permission_classes = [IsRegistered]
+
+    def post(self, request, uploadId):
+        try:
+            upload = Upload.objects.get(id=uploadId, user_id=request.user.id)
+            complete_upload(upload)
+            return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
+        except Upload.DoesNotExist:
+            return Response({"error": "Upload does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        except (UploadNotReceived, InvalidChunk) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error('Server error: %s', e)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class LocalUploadView(generics.GenericAPIView):
+    """
+    Receives the PUT presigned by LocalUploadBackend. The signed token is
+    the credential, as with an S3 presigned URL.
+    """
+    permission_classes = ()
+    authentication_classes = ()
+
+    def put(self, request, token):
+        try:
+            upload = Upload.objects.get(id=LocalUploadBackend.unsign(token), status=Upload.PENDING)
+            if int(request.META.get('CONTENT_LENGTH') or 0) > upload.size:
+                return Response({"error": "File is larger than declared"}, status=status.HTTP_400_BAD_REQUEST)
+            stream = HashingReader(request.stream)
+            LocalUploadBackend().save(upload.key, File(stream, name=upload.key))
+            upload.digest = stream.hexdigest()
+            upload.save(update_fields=['digest'])
+            return Response(status=status.HTTP_200_OK)
+        except signing.BadSignature:
+            return Response({"error": "Invalid or expired upload URL"}, status=status.HTTP_403_FORBIDDEN)
+        except Upload.DoesNotExist:
+            return Response({"error": "Upload does not exist"}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error('Server error: %s', e)
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import IS_ACTIVE_CLAIM, IS_REGISTERED_CLAIM, STARTUP_CLAIMED_AT, user_claims_revoked
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    CustomUser built from token claims. The id and account flags are
+    answered from the claims; anything else loads the user row once.
+    """
+
+    def __init__(self, user_id):
+        self.__dict__['_claims'] = {
+            'id': user_id,
+            'pk': user_id,
+            IS_REGISTERED_CLAIM: True,
+            IS_ACTIVE_CLAIM: True,
+            'is_authenticated': True,
+            'is_anonymous': False,
+        }
+        super().__init__(lambda: get_user_model().objects.get(pk=user_id))
+
+    def __bool__(self):
+        return True
+
+    def __getattr__(self, name):
+        if self._wrapped is empty and name in self._claims:
+            return self._claims[name]
+        return super().__getattr__(name)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips the user query for registered, active
+    users. Tokens without those claims, or whose user was revoked, are
+    still checked against the database.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if (
+            user_id is None
+            or not validated_token.get(IS_REGISTERED_CLAIM)
+            or not validated_token.get(IS_ACTIVE_CLAIM)
+            or user_claims_revoked(user_id, validated_token.get(STARTUP_CLAIMED_AT))
+        ):
+            return super().get_user(validated_token)
+        return ClaimsUser(get_user_model()._meta.pk.to_python(user_id))
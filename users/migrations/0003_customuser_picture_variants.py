@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_customuser_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='picture_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
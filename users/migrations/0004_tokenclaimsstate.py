@@ -0,0 +1,22 @@
+# Generated by Django 4.2.11 on 2026-10-18 21:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_picture_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenClaimsState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='token_claims_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('startup_changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_tokenclaimsstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tokenclaimsstate',
+            name='claims_revoked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
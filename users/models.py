@@ -3,6 +3,7 @@ from datetime import timedelta
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.conf import settings
 from django.utils import timezone
 
@@ -28,6 +29,7 @@ class CustomUser(AbstractUser):
     calendly_url = models.URLField(blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     picture_url = models.URLField(blank=True, null=True)
+    picture_variants = models.JSONField(default=dict, blank=True)
     tag_line = models.CharField(max_length = max_length_tagline, blank=True, null=True, default = None)
     is_temporary_pass = models.BooleanField(default=False)
     is_registered = models.BooleanField(default=False)
@@ -42,18 +44,38 @@ class CustomUser(AbstractUser):
         return self.email
     
     def get_startup(self):
-        try:
-            startup = Startup.objects.get(main_founder=self, is_active=True)
-            return startup
-        except Startup.DoesNotExist:
-            pass
-        try:
-            startup = Startup.objects.get(founders__user=self, founders__is_confirmed=True, is_active=True)
-            return startup
-        except Startup.DoesNotExist:
-            pass
+        """
+        Returns the active startup of the user, or None, in a single query.
+        The main founder's startup wins over co-founded ones, and the result
+        is memoized on the instance, which lives for one request.
+        """
+        if not hasattr(self, '_startup'):
+            self._startup = Startup.objects.filter(
+                Q(main_founder=self) | Q(founders__user=self, founders__is_confirmed=True),
+                is_active=True
+            ).annotate(
+                is_main_founder=ExpressionWrapper(Q(main_founder=self), output_field=BooleanField())
+            ).order_by('-is_main_founder', 'created_at').first()
+        return self._startup
 
-        return None
+    def set_picture(self, url):
+        """Replaces the profile picture; its resized variants are generated in the background."""
+        self.picture_url = url
+        self.picture_variants = {}
+
+class TokenClaimsState(models.Model):
+    """
+    When the claims of the tokens issued to a user stopped being trusted.
+    The cache holds the same marker for reads; this row outlives evictions.
+    It is kept out of CustomUser so saving a user loaded earlier in a
+    request never rolls it back.
+    """
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True, related_name='token_claims_state')
+    startup_changed_at = models.DateTimeField(blank=True, null=True)
+    claims_revoked_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self) -> str:
+        return f"User ->{self.user_id}, Token claims state"
 
 class Experience(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.PROTECT)
@@ -118,6 +118,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     xUrl = serializers.URLField(source='x_url', allow_blank=True)
     websiteUrl = serializers.URLField(source='website_url', allow_blank=True)
     pictureUrl = serializers.URLField(source='picture_url', allow_blank=True)
+    pictureUrls = serializers.JSONField(source='picture_variants', read_only=True)
     calendlyUrl = serializers.URLField(source='calendly_url', allow_blank=True)
     experiences = serializers.SerializerMethodField(method_name="get_experiences")
     
@@ -138,6 +139,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'xUrl', 
             'websiteUrl', 
             'pictureUrl', 
+            'pictureUrls',
             'calendlyUrl', 
             'professionalExperience', 
             'tagLine',
@@ -212,7 +214,8 @@ class SmallUserSerializer(serializers.ModelSerializer):
     firstName = serializers.CharField(source='first_name')
     lastName = serializers.CharField(source='last_name')
     pictureUrl = serializers.URLField(source='picture_url')
+    pictureUrls = serializers.JSONField(source='picture_variants', read_only=True)
     
     class Meta:
         model = CustomUser
-        fields = ['id','firstName', 'lastName', 'pictureUrl']
\ No newline at end of file
+        fields = ['id','firstName', 'lastName', 'pictureUrl', 'pictureUrls']
\ No newline at end of file
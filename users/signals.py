@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from startups.models import Startup, Founder
+
+from .tokens import invalidate_startup_claim, revoke_user_claims
+
+
+def _invalidate(user_ids):
+    # Invalidated again after commit so tokens issued while the transaction
+    # is still open are not trusted either.
+    for user_id in user_ids:
+        if user_id is not None:
+            invalidate_startup_claim(user_id)
+            transaction.on_commit(lambda user_id=user_id: invalidate_startup_claim(user_id))
+
+
+@receiver(post_save, sender=Startup)
+def startup_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not {'is_active', 'main_founder'} & set(update_fields):
+        return
+    user_ids = [instance.main_founder_id]
+    if not created:
+        user_ids += list(instance.founders.values_list('user_id', flat=True))
+    _invalidate(user_ids)
+
+
+@receiver([post_save, post_delete], sender=Founder)
+def founder_changed(sender, instance, **kwargs):
+    _invalidate([instance.user_id])
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, **kwargs):
+    if not created and not (instance.is_active and instance.is_registered):
+        revoke_user_claims(instance.id)
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, instance, **kwargs):
+    revoke_user_claims(instance.id, persist=False)
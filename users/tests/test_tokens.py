@@ -0,0 +1,158 @@
+import pytest
+
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from django.core.cache import cache
+
+from startups.models import Founder
+from startups.tests.fixtures import common_startup, common_third_startup
+from users.authentication import ClaimsJWTAuthentication
+from users.permissions import IsRegistered
+from users.tokens import STARTUP_CLAIM, UserRefreshToken, get_request_startup_id
+from .fixtures import common_user_token
+
+main_user_token = common_user_token
+main_startup = common_startup
+third_startup = common_third_startup
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _authenticated_request(user):
+    token = UserRefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    request.user, request.auth = JWTAuthentication().authenticate(request)
+    return request
+
+
+@pytest.mark.django_db
+def test_get_startup_single_query_and_memoized(main_user_token, main_startup, django_assert_num_queries):
+    user = main_user_token.get("user")
+
+    with django_assert_num_queries(1):
+        assert user.get_startup() == main_startup
+        assert user.get_startup() == main_startup
+
+
+@pytest.mark.django_db
+def test_get_startup_prefers_main_founder(main_user_token, main_startup, third_startup):
+    assert main_user_token.get("user").get_startup() == main_startup
+
+
+@pytest.mark.django_db
+def test_get_startup_for_cofounder(main_user_token, third_startup):
+    assert main_user_token.get("user").get_startup() == third_startup
+
+
+@pytest.mark.django_db
+def test_startup_id_read_from_token(main_user_token, main_startup, django_assert_num_queries):
+    request = _authenticated_request(main_user_token.get("user"))
+    assert request.auth[STARTUP_CLAIM] == str(main_startup.id)
+
+    with django_assert_num_queries(0):
+        assert get_request_startup_id(request) == str(main_startup.id)
+
+
+@pytest.mark.django_db
+def test_startup_claim_invalidated_by_founder_change(main_user_token, main_startup, django_capture_on_commit_callbacks):
+    user = main_user_token.get("secondary_user")
+    request = _authenticated_request(user)
+    assert request.auth[STARTUP_CLAIM] == str(main_startup.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Founder.objects.filter(user=user, startup=main_startup).delete()
+
+    assert get_request_startup_id(request) is None
+
+
+@pytest.mark.django_db
+def test_startup_claim_invalidated_after_cache_eviction(main_user_token, main_startup, django_capture_on_commit_callbacks):
+    user = main_user_token.get("secondary_user")
+    request = _authenticated_request(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Founder.objects.filter(user=user, startup=main_startup).delete()
+    cache.clear()
+
+    assert get_request_startup_id(request) is None
+
+
+@pytest.mark.django_db
+def test_claims_user_skips_user_query(main_user_token, django_assert_num_queries):
+    user = main_user_token.get("user")
+    token = UserRefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    # The first request reads the revocation marker through the cache
+    ClaimsJWTAuthentication().authenticate(request)
+
+    with django_assert_num_queries(0):
+        request.user, request.auth = ClaimsJWTAuthentication().authenticate(request)
+        assert IsRegistered().has_permission(request, None)
+        assert request.user.id == user.id
+
+    with django_assert_num_queries(1):
+        assert request.user.email == user.email
+
+
+@pytest.mark.django_db
+def test_claims_user_revoked_when_deactivated(main_user_token):
+    user = main_user_token.get("user")
+    token = UserRefreshToken.for_user(user).access_token
+
+    user.is_active = False
+    user.save()
+
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_claims_user_revoked_after_cache_eviction(main_user_token):
+    user = main_user_token.get("user")
+    token = UserRefreshToken.for_user(user).access_token
+
+    user.is_active = False
+    user.save()
+    cache.clear()
+
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    with pytest.raises(AuthenticationFailed):
+        ClaimsJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+def test_claims_trusted_again_for_tokens_issued_after_revocation(main_user_token):
+    user = main_user_token.get("user")
+    user.is_active = False
+    user.save()
+    user.is_active = True
+    user.save()
+    cache.clear()
+
+    token = UserRefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    request.user, request.auth = ClaimsJWTAuthentication().authenticate(request)
+    assert type(request.user).__name__ == "ClaimsUser"
+
+
+@pytest.mark.django_db
+def test_unregistered_token_checked_against_database(main_user_token):
+    user = main_user_token.get("user")
+    user.is_registered = False
+    user.save()
+    token = UserRefreshToken.for_user(user).access_token
+
+    user.is_registered = True
+    user.save()
+
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    request.user, request.auth = ClaimsJWTAuthentication().authenticate(request)
+    assert IsRegistered().has_permission(request, None)
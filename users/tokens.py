@@ -0,0 +1,117 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenClaimsState
+
+STARTUP_CLAIM = 'startup_id'
+# When the claims, not only the startup id, were issued
+STARTUP_CLAIMED_AT = 'startup_claimed_at'
+IS_REGISTERED_CLAIM = 'is_registered'
+IS_ACTIVE_CLAIM = 'is_active'
+
+
+def _startup_changed_key(user_id):
+    return f'user_startup_changed_{user_id}'
+
+
+def _timestamp(value):
+    return value.timestamp() if value else 0
+
+
+def invalidate_startup_claim(user_id):
+    """Makes tokens issued so far fall back to the database for the user's startup."""
+    changed_at = timezone.now()
+    TokenClaimsState.objects.update_or_create(user_id=user_id, defaults={'startup_changed_at': changed_at})
+    timeout = settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+    cache.set(_startup_changed_key(user_id), changed_at.timestamp(), timeout=timeout)
+
+
+def _startup_changed_at(user_id):
+    """
+    Timestamp of the user's last startup change, or 0. The cache is only a
+    read-through copy of TokenClaimsState, so an evicted or unreachable
+    cache never makes an outdated claim trusted again.
+    """
+    key = _startup_changed_key(user_id)
+    changed_at = cache.get(key)
+    if changed_at is None:
+        changed_at = _timestamp(
+            TokenClaimsState.objects.filter(user_id=user_id).values_list('startup_changed_at', flat=True).first()
+        )
+        # add() never overwrites the marker of a change committed meanwhile
+        cache.add(key, changed_at, timeout=settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+    return changed_at
+
+
+def _revoked_key(user_id):
+    return f'user_claims_revoked_{user_id}'
+
+
+def revoke_user_claims(user_id, persist=True):
+    """
+    Stops trusting the claims of tokens already issued to the user, e.g.
+    once the account is deactivated. A deleted user has no row to persist
+    the marker in, and is caught by the database lookup instead.
+    """
+    revoked_at = timezone.now()
+    if persist:
+        TokenClaimsState.objects.update_or_create(user_id=user_id, defaults={'claims_revoked_at': revoked_at})
+    timeout = settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()
+    cache.set(_revoked_key(user_id), revoked_at.timestamp(), timeout=timeout)
+
+
+def user_claims_revoked(user_id, claimed_at):
+    """
+    Whether the claims of a token issued at `claimed_at` can't be trusted.
+    Like the startup marker, the cache is a read-through copy of
+    TokenClaimsState.
+    """
+    if claimed_at is None:
+        return True
+    key = _revoked_key(user_id)
+    revoked_at = cache.get(key)
+    if revoked_at is None:
+        rows = list(get_user_model().objects.filter(pk=user_id).values_list(
+            'token_claims_state__claims_revoked_at', flat=True
+        ))
+        if not rows:
+            return True
+        revoked_at = _timestamp(rows[0])
+        cache.add(key, revoked_at, timeout=settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds())
+    return revoked_at >= claimed_at
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token whose access tokens carry the user's account state and
+    startup id.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[IS_REGISTERED_CLAIM] = user.is_registered
+        token[IS_ACTIVE_CLAIM] = user.is_active
+        startup = user.get_startup()
+        token[STARTUP_CLAIM] = str(startup.id) if startup else None
+        token[STARTUP_CLAIMED_AT] = time.time()
+        return token
+
+
+def get_request_startup_id(request):
+    """
+    Returns the id of the request user's startup, or None.
+    The id is read from the access token when its claim is still fresh,
+    otherwise it is looked up through CustomUser.get_startup.
+    """
+    token = request.auth
+    if token is not None and STARTUP_CLAIMED_AT in token:
+        if _startup_changed_at(request.user.id) < token[STARTUP_CLAIMED_AT]:
+            return token[STARTUP_CLAIM]
+    startup = request.user.get_startup()
+    return str(startup.id) if startup else None
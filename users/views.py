@@ -9,12 +9,14 @@ from django.conf import settings
 from rest_framework import status
 from rest_framework import generics, permissions
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from pjbackend import utils
 
 from startups.models import Founder
+from startups.snapshots import schedule_user_profile_snapshots
 from payment.models import Subscription
+from uploads.derivatives import schedule_image_derivatives
+from uploads.models import Upload
 from .models import CustomUser, Experience, PhoneNumberVerification
 from .serializers import (
     ChangePasswordSerlializer,
@@ -35,6 +37,7 @@ from .serializers import (
     )
 
 from .permissions import IsRegistered
+from .tokens import UserRefreshToken
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +74,7 @@ class VerificateSignupCodeView(generics.GenericAPIView):
             if startup is not None:
                 is_onboarding = False
 
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             
             data = {
                 "token": str(refresh.access_token),
@@ -88,7 +91,7 @@ class VerificateSignupCodeView(generics.GenericAPIView):
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data={"message": "Unexpected error", "detail": str(e)})
         
     def _generate_tokens(self, user):
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         return {
             "token": str(refresh.access_token),
             "lifetime": utils.get_lifetime_token(),
@@ -199,7 +202,7 @@ class SignUpView(generics.CreateAPIView):
 
 
     def _generate_tokens(self, user):
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         return {
             "token": str(refresh.access_token),
             "lifetime": utils.get_lifetime_token(),
@@ -249,7 +252,7 @@ class LoginView(generics.GenericAPIView):
                 utils.send_sms(str(user.phone_number), message)
                 
                 # Generate tokens for the unregistered user
-                refresh = RefreshToken.for_user(user)
+                refresh = UserRefreshToken.for_user(user)
                 data = {
                     "token": str(refresh.access_token),
                     "lifetime": utils.get_lifetime_token(),
@@ -272,7 +275,7 @@ class LoginView(generics.GenericAPIView):
             if startup is not None:
                 is_onboarding = False
 
-            refresh = RefreshToken.for_user(user)
+            refresh = UserRefreshToken.for_user(user)
             
             data = {
                 "token": str(refresh.access_token),
@@ -300,7 +303,8 @@ class DeleteAccountView(generics.GenericAPIView):
             if startup:
                 subscription = Subscription.objects.filter(startup=startup).first()
                 if subscription:
-                    utils.cancel_stripe_subscription(subscription.stripe_subscription_id)
+                    if subscription.stripe_subscription_id:
+                        utils.cancel_stripe_subscription(subscription.stripe_subscription_id)
                     subscription.delete()
                 startup.is_active = False
                 startup.save()
@@ -315,7 +319,7 @@ class DeleteAccountView(generics.GenericAPIView):
             user.website_url = None
             user.calendly_url = None
             user.bio = None
-            user.picture_url = None
+            user.set_picture(None)
             user.tag_line = None
             user.is_temporary_pass = False
             user.is_registered = False
@@ -554,9 +558,11 @@ class UpdateUserProfileView(generics.GenericAPIView):
           image = user_media_data.get("image")
           if image:
               file_url = utils.upload_file_to_s3(image)
-              user.picture_url = file_url
+              user.set_picture(file_url)
     
           user.save()
+          if image:
+              schedule_image_derivatives(Upload.PROFILE_PICTURE, user.id, user.picture_url)
           
           experiences = user_media_data.get("experiences", [])
           
@@ -622,6 +628,7 @@ class UserProfileProfessionalHistoryView(generics.GenericAPIView):
                 # Create new experiences based on the validated data
                 new_experiences = [Experience(user=user, **data) for data in serializer.validated_data]
                 Experience.objects.bulk_create(new_experiences)
+                schedule_user_profile_snapshots(user.id)
 
                 return_serializer = self.get_serializer(new_experiences, many=True)
                 return Response(return_serializer.data, status=status.HTTP_201_CREATED)
@@ -641,8 +648,9 @@ class UserProfilePictureView(generics.GenericAPIView):
 
             image = serializer.validated_data.get("image")
             file_url = utils.upload_file_to_s3(image)
-            user.picture_url = file_url
+            user.set_picture(file_url)
             user.save()
+            schedule_image_derivatives(Upload.PROFILE_PICTURE, user.id, file_url)
             
             return Response(status=status.HTTP_200_OK)
         except Exception as e: